@@ -0,0 +1,517 @@
+import difflib
+import json
+import logging
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+import webbrowser
+
+logger = logging.getLogger(__name__)
+
+# Directory and files for the persisted index and user aliases/bookmarks
+DATA_DIR = os.path.join("data")
+INDEX_FILE = os.path.join(DATA_DIR, "app_index.json")
+ALIASES_FILE = os.path.join(DATA_DIR, "aliases.json")
+
+# Minimum similarity for fuzzy name matches
+FUZZY_CUTOFF = 0.75
+
+# Field codes such as %U or %f in .desktop Exec lines
+DESKTOP_FIELD_CODE = re.compile(r"\s*%[a-zA-Z]")
+
+NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Shortest interval between the directory walks an unknown app name triggers
+REFRESH_INTERVAL_SECONDS = 10.0
+
+
+def normalize_name(name):
+    """
+    Normalizes an application or site name for lookup.
+
+    Args:
+        name (str): Spoken or indexed name.
+
+    Returns:
+        str: Lowercase alphanumeric name, so "Fire Fox" and "firefox" collide.
+    """
+    return NON_ALNUM.sub("", name.lower())
+
+
+def application_dirs():
+    """
+    Lists the platform directories that contain launchable application entries.
+
+    Args:
+        None
+
+    Returns:
+        list: Existing directories to scan.
+    """
+    if sys.platform.startswith("win"):
+        candidates = [
+            os.path.join(os.environ.get("PROGRAMDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
+            os.path.join(os.environ.get("APPDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs")
+        ]
+    elif sys.platform == "darwin":
+        candidates = ["/Applications", "/System/Applications", os.path.expanduser("~/Applications")]
+    else:
+        data_home = os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))
+        data_dirs = os.environ.get("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(":")
+        candidates = [os.path.join(path, "applications") for path in [data_home] + data_dirs]
+        candidates.append("/var/lib/flatpak/exports/share/applications")
+
+    return [path for path in candidates if os.path.isdir(path)]
+
+
+def parse_desktop_file(path):
+    """
+    Extracts the display name and command from a Linux .desktop entry.
+
+    Args:
+        path (str): Path to the .desktop file.
+
+    Returns:
+        tuple | None: (name, command), or None for hidden or invalid entries.
+    """
+    name = None
+    command = None
+    in_entry = False
+
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as file:
+            for line in file:
+                line = line.strip()
+
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                    continue
+
+                if not in_entry or "=" not in line:
+                    continue
+
+                key, value = line.split("=", 1)
+                if key == "Name" and name is None:
+                    name = value
+                elif key == "Exec":
+                    command = DESKTOP_FIELD_CODE.sub("", value).strip()
+                elif key in ("NoDisplay", "Hidden") and value.lower() == "true":
+                    return None
+
+    except OSError:
+        return None
+
+    if not name or not command:
+        return None
+
+    return name, command
+
+
+def scan_directory(path):
+    """
+    Collects application entries from a single directory.
+
+    Args:
+        path (str): Directory to scan recursively.
+
+    Returns:
+        dict: Normalized name to {"name", "target"} entries.
+    """
+    entries = {}
+
+    for root, dirs, files in os.walk(path):
+        for filename in files:
+            full_path = os.path.join(root, filename)
+            stem, extension = os.path.splitext(filename)
+            extension = extension.lower()
+
+            if extension == ".desktop":
+                parsed = parse_desktop_file(full_path)
+                if parsed is None:
+                    continue
+                name, target = parsed
+
+            # Start Menu shortcuts are launched directly through the shell
+            elif extension in (".lnk", ".url"):
+                name, target = stem, full_path
+
+            else:
+                continue
+
+            entries[normalize_name(name)] = {"name": name, "target": target}
+
+        # macOS application bundles are directories, not files
+        for dirname in list(dirs):
+            if dirname.endswith(".app"):
+                name = dirname[:-4]
+                entries[normalize_name(name)] = {"name": name, "target": os.path.join(root, dirname)}
+                dirs.remove(dirname)
+
+    return entries
+
+
+def parse_alias(name, value):
+    """
+    Converts one aliases file entry into an index entry.
+
+    Args:
+        name (str): Spoken name the entry is stored under.
+        value (object): A URL, an executable/command, or a
+                        {"type", "url" | "target"} object.
+
+    Returns:
+        dict | None: {"type", "name", "url" | "target"}, or None if the entry is malformed.
+    """
+    if isinstance(value, str):
+        value = {"type": "url", "url": value} if "://" in value else {"type": "app", "target": value}
+    elif isinstance(value, dict):
+        value = dict(value)
+        value.setdefault("type", "url" if "url" in value else "app")
+    else:
+        return None
+
+    field = {"url": "url", "app": "target"}.get(value["type"])
+    if field is None or not isinstance(value.get(field), str) or not value[field]:
+        return None
+
+    value["name"] = name
+    return value
+
+
+def tree_mtime(path):
+    """
+    Returns the newest modification time of a directory and its subdirectories.
+
+    Adding or removing an entry only touches its own folder's mtime, so a
+    Start Menu shortcut added to a subfolder is only visible this way.
+
+    Args:
+        path (str): Directory to check.
+
+    Returns:
+        float: Latest mtime in the tree.
+
+    Raises:
+        OSError: If the top-level directory cannot be read.
+    """
+    latest = os.path.getmtime(path)
+
+    for root, dirs, _ in os.walk(path):
+        for dirname in list(dirs):
+            # Bundles are indexed as a whole, their contents never change the index
+            if dirname.endswith(".app"):
+                dirs.remove(dirname)
+                continue
+            try:
+                latest = max(latest, os.path.getmtime(os.path.join(root, dirname)))
+            except OSError:
+                continue
+
+    return latest
+
+
+class AppIndex:
+    def __init__(self, index_file=INDEX_FILE, aliases_file=ALIASES_FILE):
+        """
+        Initializes the local application and bookmark index.
+
+        Args:
+            index_file (str): Path of the persisted index cache.
+            aliases_file (str): Path of the user aliases and bookmarks file.
+
+        Returns:
+            None
+        """
+        self.index_file = index_file
+        self.aliases_file = aliases_file
+        self.lock = threading.Lock()
+
+        # Directory path -> {"mtime": float, "entries": {...}}
+        self.directories = {}
+        self.apps = {}
+        self.aliases = {}
+        self.aliases_mtime = None
+        self.last_refresh = None
+
+        self._load_cache()
+        self.refresh()
+
+    def _load_cache(self):
+        """
+        Restores the previously persisted index so startup skips a full scan.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            with open(self.index_file, encoding="utf-8") as file:
+                self.directories = json.load(file)
+        except (OSError, ValueError):
+            self.directories = {}
+
+    def _save_cache(self):
+        """
+        Persists the per-directory index to disk.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+            with open(self.index_file, "w", encoding="utf-8") as file:
+                json.dump(self.directories, file)
+        except OSError:
+            logger.warning("Could not persist application index to %s", self.index_file)
+
+    def _load_aliases(self):
+        """
+        Reloads user aliases and bookmarks when the file changed.
+
+        The file maps spoken names to a URL, an executable/command, or a full
+        {"type", "url" | "target"} object.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            mtime = os.path.getmtime(self.aliases_file)
+        except OSError:
+            self.aliases = {}
+            self.aliases_mtime = None
+            return
+
+        if mtime == self.aliases_mtime:
+            return
+
+        try:
+            with open(self.aliases_file, encoding="utf-8") as file:
+                raw_aliases = json.load(file)
+        except (OSError, ValueError):
+            logger.warning("Invalid aliases file: %s", self.aliases_file)
+            return
+
+        if not isinstance(raw_aliases, dict):
+            logger.warning("Invalid aliases file, expected an object of names: %s", self.aliases_file)
+            return
+
+        aliases = {}
+        for name, value in raw_aliases.items():
+            entry = parse_alias(name, value)
+            if entry is None:
+                logger.warning("Skipping invalid alias %r in %s", name, self.aliases_file)
+                continue
+            aliases[normalize_name(name)] = entry
+
+        self.aliases = aliases
+        self.aliases_mtime = mtime
+
+    def refresh(self):
+        """
+        Incrementally updates the index, rescanning only changed directories.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with self.lock:
+            changed = False
+            current_dirs = application_dirs()
+            self.last_refresh = time.monotonic()
+
+            for path in current_dirs:
+                try:
+                    mtime = tree_mtime(path)
+                except OSError:
+                    continue
+
+                cached = self.directories.get(path)
+                if cached is not None and cached["mtime"] == mtime:
+                    continue
+
+                self.directories[path] = {"mtime": mtime, "entries": scan_directory(path)}
+                changed = True
+                logger.debug("Application directory indexed | path=%s", path)
+
+            # Forget directories that no longer exist
+            for path in list(self.directories):
+                if path not in current_dirs:
+                    del self.directories[path]
+                    changed = True
+
+            if changed or not self.apps:
+                apps = {}
+                for cached in self.directories.values():
+                    apps.update(cached["entries"])
+                self.apps = apps
+
+            if changed:
+                self._save_cache()
+
+            self._load_aliases()
+
+        logger.debug("Application index ready | apps=%s aliases=%s", len(self.apps), len(self.aliases))
+
+    def _match(self, table, key):
+        """
+        Finds the best entry for a normalized key in a lookup table.
+
+        Args:
+            table (dict): Normalized name to entry mapping.
+            key (str): Normalized query.
+
+        Returns:
+            dict | None: Matching entry, if any.
+        """
+        entry = table.get(key)
+        if entry is not None:
+            return entry
+
+        # Prefer the shortest indexed name that starts with the query ("firefox" -> "firefox web browser")
+        prefixed = [name for name in table if name.startswith(key)]
+        if prefixed:
+            return table[min(prefixed, key=len)]
+
+        close = difflib.get_close_matches(key, table.keys(), n=1, cutoff=FUZZY_CUTOFF)
+        if close:
+            return table[close[0]]
+
+        return None
+
+    def resolve(self, name, request_type=None):
+        """
+        Resolves a spoken name to a bookmark, alias or installed application.
+
+        Args:
+            name (str): Name as spoken by the user.
+            request_type (str | None): "url" restricts the lookup to aliases and
+                                       bookmarks, so a site name never fuzzily
+                                       matches an app ("google" -> Google Chrome).
+
+        Returns:
+            dict | None: {"type": "app", "name", "target"} or {"type": "url", "name", "url"}.
+        """
+        key = normalize_name(name or "")
+        if not key:
+            return None
+
+        alias = self._match(self.aliases, key)
+        if alias is not None or request_type == "url":
+            return alias
+
+        app = self._match(self.apps, key)
+
+        # Newly installed apps are picked up by an incremental refresh; it walks
+        # every application tree, so repeated misses share one per interval
+        if app is None and time.monotonic() - self.last_refresh >= REFRESH_INTERVAL_SECONDS:
+            self.refresh()
+            app = self._match(self.apps, key)
+
+        if app is None:
+            return None
+
+        return {"type": "app", "name": app["name"], "target": app["target"]}
+
+
+def launch(target):
+    """
+    Launches an application entry or executable on the current platform.
+
+    Args:
+        target (str): Shortcut path, bundle path, .desktop Exec command, or executable name.
+
+    Returns:
+        None
+
+    Raises:
+        FileNotFoundError: If the target cannot be found.
+        OSError: If the platform refuses to start the target.
+    """
+    if sys.platform.startswith("win"):
+        os.startfile(target)
+        return
+
+    if sys.platform == "darwin":
+        args = ["open", target] if os.path.exists(target) else ["open", "-a", target]
+        subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+
+    args = shlex.split(target)
+    if not args:
+        raise FileNotFoundError(target)
+
+    # Detach from the assistant so the app outlives it and never blocks the main loop
+    subprocess.Popen(
+        args,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+
+def open_url(url):
+    """
+    Opens a URL in the default browser.
+
+    Args:
+        url (str): Complete URL to open.
+
+    Returns:
+        bool: True if a browser accepted the request.
+    """
+    return webbrowser.open(url)
+
+
+_app_index = None
+_app_index_lock = threading.Lock()
+
+
+def get_app_index():
+    """
+    Returns the shared application index, building it on first use.
+
+    Args:
+        None
+
+    Returns:
+        AppIndex: Process-wide index instance.
+    """
+    global _app_index
+
+    if _app_index is None:
+        with _app_index_lock:
+            if _app_index is None:
+                _app_index = AppIndex()
+
+    return _app_index
+
+
+if __name__ == "__main__":
+    from core.logger_config import setup_logging
+
+    setup_logging()
+
+    started = time.perf_counter()
+    index = get_app_index()
+    print(f"Indexed {len(index.apps)} apps and {len(index.aliases)} aliases in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    while True:
+        name = input("Enter app or site name (Ctrl+C to exit): ")
+        started = time.perf_counter()
+        entry = index.resolve(name)
+        print(f"{entry} ({(time.perf_counter() - started) * 1e6:.0f} µs)")
@@ -0,0 +1,185 @@
+import math
+
+import numpy as np
+
+# Full scale of 16-bit PCM, the unit speech_recognition's energy_threshold is expressed in
+PCM16_FULL_SCALE = 32768.0
+
+
+def pcm_to_float(data, sample_width):
+    """
+    Converts little-endian PCM bytes to float samples in [-1, 1).
+
+    Args:
+        data (bytes): Raw PCM audio (mono).
+        sample_width (int): Bytes per sample (1, 2, 3 or 4).
+
+    Returns:
+        np.ndarray: float32 samples.
+
+    Raises:
+        ValueError: If the sample width is not supported.
+    """
+    if sample_width == 1:
+        # 8-bit WAV data is unsigned
+        return (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    if sample_width == 2:
+        return np.frombuffer(data, dtype="<i2").astype(np.float32) / PCM16_FULL_SCALE
+    if sample_width == 3:
+        raw = np.frombuffer(data[:len(data) - len(data) % 3], dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        values = np.where(values >= 1 << 23, values - (1 << 24), values)
+        return values.astype(np.float32) / float(1 << 23)
+    if sample_width == 4:
+        return (np.frombuffer(data, dtype="<i4").astype(np.float64) / float(1 << 31)).astype(np.float32)
+
+    raise ValueError(f"Unsupported sample width {sample_width}")
+
+
+def float_to_pcm16(samples):
+    """
+    Converts float samples to 16-bit little-endian PCM bytes, clipping out-of-range values.
+
+    Args:
+        samples (np.ndarray): Samples in [-1, 1].
+
+    Returns:
+        bytes: PCM audio.
+    """
+    return (np.clip(samples, -1.0, 32767 / PCM16_FULL_SCALE) * PCM16_FULL_SCALE).astype("<i2").tobytes()
+
+
+def frame_rms(samples, frame_length):
+    """
+    Computes the RMS energy of consecutive frames in one vectorized pass.
+
+    Args:
+        samples (np.ndarray): float samples; a trailing partial frame is ignored.
+        frame_length (int): Samples per frame.
+
+    Returns:
+        np.ndarray: Per-frame RMS in 16-bit PCM units, comparable with
+                    speech_recognition's energy_threshold.
+    """
+    count = len(samples) // frame_length
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    frames = samples[:count * frame_length].reshape(count, frame_length).astype(np.float32)
+    return np.sqrt(np.mean(frames * frames, axis=1)) * PCM16_FULL_SCALE
+
+
+def speech_bounds(samples, sample_rate, energy_threshold, padding_seconds=0.1, frame_seconds=0.02):
+    """
+    Finds the span from the first to the last frame above the speech energy threshold.
+
+    Args:
+        samples (np.ndarray): float samples.
+        sample_rate (int): Sample rate in Hz.
+        energy_threshold (float): Frame RMS (16-bit units) that counts as speech.
+        padding_seconds (float): Audio kept around the first and last speech frame.
+        frame_seconds (float): Analysis frame length.
+
+    Returns:
+        tuple: (start, end) sample indices, the whole buffer if no frame is speech.
+    """
+    frame_length = max(1, int(sample_rate * frame_seconds))
+    voiced = np.flatnonzero(frame_rms(samples, frame_length) > energy_threshold)
+    if len(voiced) == 0:
+        return 0, len(samples)
+
+    padding = int(padding_seconds * sample_rate)
+    start = max(0, voiced[0] * frame_length - padding)
+    end = min(len(samples), (voiced[-1] + 1) * frame_length + padding)
+    return int(start), int(end)
+
+
+def trim_silence(samples, sample_rate, energy_threshold, padding_seconds=0.1, frame_seconds=0.02):
+    """
+    Cuts leading and trailing frames below the speech energy threshold.
+
+    Args:
+        samples (np.ndarray): float samples.
+        sample_rate (int): Sample rate in Hz.
+        energy_threshold (float): Frame RMS (16-bit units) that counts as speech.
+        padding_seconds (float): Audio kept around the first and last speech frame.
+        frame_seconds (float): Analysis frame length.
+
+    Returns:
+        np.ndarray: Trimmed samples (a view), unchanged if no frame is speech.
+    """
+    start, end = speech_bounds(samples, sample_rate, energy_threshold, padding_seconds, frame_seconds)
+    return samples[start:end]
+
+
+# Windowed-sinc taps on each side of an output sample and the Kaiser window shape
+RESAMPLE_HALF_TAPS = 16
+RESAMPLE_KAISER_BETA = 8.6
+
+
+def _polyphase_bank(up, down):
+    """
+    Builds the Kaiser-windowed sinc filter of every output phase.
+
+    Args:
+        up (int): Interpolation factor (output rate / gcd).
+        down (int): Decimation factor (input rate / gcd).
+
+    Returns:
+        tuple: (bank, half_width) where bank has one row of taps per phase.
+    """
+    cutoff = min(1.0, up / down)
+    half_width = int(np.ceil(RESAMPLE_HALF_TAPS / cutoff))
+    offsets = np.arange(-half_width + 1, half_width + 1)
+
+    # Output sample n sits at input position n * down / up; its phase fixes the fractional part
+    phases = np.arange(up)
+    fraction = (phases * down % up) / up
+    distance = fraction[:, None] - offsets[None, :]
+
+    shape = np.clip(1.0 - (distance / half_width) ** 2, 0.0, 1.0)
+    window = np.i0(RESAMPLE_KAISER_BETA * np.sqrt(shape)) / np.i0(RESAMPLE_KAISER_BETA)
+    return (cutoff * np.sinc(cutoff * distance) * window).astype(np.float32), half_width
+
+
+def resample(samples, in_rate, out_rate):
+    """
+    Changes the sample rate with a polyphase Kaiser-windowed sinc filter.
+
+    The kernel cutoff follows the lower of the two Nyquist frequencies, so
+    downsampling is anti-aliased. Each phase is one strided matrix-vector
+    product, e.g. 160 of them for 44.1 kHz to 16 kHz and a single one for 48 kHz.
+
+    Args:
+        samples (np.ndarray): float samples.
+        in_rate (int): Input sample rate in Hz.
+        out_rate (int): Output sample rate in Hz.
+
+    Returns:
+        np.ndarray: float32 samples at out_rate.
+    """
+    if in_rate == out_rate or len(samples) == 0:
+        return samples.astype(np.float32, copy=False)
+
+    divisor = math.gcd(int(in_rate), int(out_rate))
+    up, down = int(out_rate) // divisor, int(in_rate) // divisor
+    bank, half_width = _polyphase_bank(up, down)
+    taps = bank.shape[1]
+
+    padded = np.concatenate([
+        np.zeros(half_width, np.float32),
+        samples.astype(np.float32, copy=False),
+        np.zeros(half_width + down + 1, np.float32)
+    ])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, taps)
+
+    count = len(samples) * up // down
+    output = np.empty(count, dtype=np.float32)
+
+    for phase in range(min(up, count)):
+        # Outputs of one phase read input windows spaced exactly `down` samples apart
+        first = phase * down // up + 1
+        outputs = len(range(phase, count, up))
+        output[phase::up] = windows[first:first + outputs * down:down] @ bank[phase]
+
+    return output
@@ -0,0 +1,254 @@
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Calibration file produced offline and loaded by the router at startup
+DATA_DIR = os.path.join("data")
+CALIBRATION_FILE = os.path.join(DATA_DIR, "calibration.json")
+
+# Accepted intents must be correct at least this often after calibration
+TARGET_ACCURACY = 0.9
+
+# Intents with fewer labeled samples share the pooled calibration
+MIN_SAMPLES_PER_INTENT = 20
+
+# Thresholds are never learned below this raw confidence
+MIN_THRESHOLD = 0.3
+
+
+def fit_isotonic(points):
+    """
+    Fits a non-decreasing step function with pool-adjacent-violators.
+
+    Args:
+        points (list): (reported_confidence, correct) pairs, correct being 0 or 1.
+
+    Returns:
+        list: [lower_bound, calibrated_accuracy, count] blocks ordered by confidence.
+    """
+    blocks = []
+
+    for confidence, correct in sorted(points):
+        blocks.append([confidence, float(correct), 1])
+
+        # Merge backwards while the accuracy sequence decreases
+        while len(blocks) > 1 and blocks[-2][1] > blocks[-1][1]:
+            lower, value, count = blocks.pop()
+            previous = blocks[-1]
+            total = previous[2] + count
+            previous[1] = (previous[1] * previous[2] + value * count) / total
+            previous[2] = total
+
+    return blocks
+
+
+def calibrate(blocks, confidence):
+    """
+    Maps a reported confidence to calibrated accuracy using fitted blocks.
+
+    Args:
+        blocks (list): Output of fit_isotonic().
+        confidence (float): Reported confidence.
+
+    Returns:
+        float: Estimated probability that the intent is correct.
+    """
+    value = 0.0
+    for lower, accuracy, count in blocks:
+        if confidence < lower:
+            break
+        value = accuracy
+    return value
+
+
+def threshold_from_blocks(blocks, target=TARGET_ACCURACY):
+    """
+    Picks the lowest raw confidence whose calibrated accuracy reaches the target.
+
+    Args:
+        blocks (list): Output of fit_isotonic().
+        target (float): Required calibrated accuracy.
+
+    Returns:
+        float | None: Threshold on reported confidence, or None if never reached.
+    """
+    for lower, accuracy, count in blocks:
+        if accuracy >= target:
+            return round(max(lower, MIN_THRESHOLD), 3)
+    return None
+
+
+def load_replay(path):
+    """
+    Reads a labeled replay log.
+
+    Each JSONL line holds the predicted "intent", its reported "confidence" and
+    either the true "label" intent or a boolean "correct".
+
+    Args:
+        path (str): Replay log path.
+
+    Returns:
+        list: (intent, confidence, correct) tuples.
+    """
+    samples = []
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+
+            record = json.loads(line)
+            if "correct" in record:
+                correct = bool(record["correct"])
+            else:
+                correct = record.get("label") == record["intent"]
+
+            samples.append((record["intent"], float(record["confidence"]), int(correct)))
+
+    return samples
+
+
+def fit_thresholds(samples, default_threshold, target=TARGET_ACCURACY):
+    """
+    Learns per-intent thresholds from labeled samples.
+
+    Args:
+        samples (list): (intent, confidence, correct) tuples.
+        default_threshold (float): Global threshold used when data is too thin.
+        target (float): Required calibrated accuracy.
+
+    Returns:
+        dict: Calibration data with "thresholds" and fitted "isotonic" blocks.
+    """
+    pooled_blocks = fit_isotonic([(confidence, correct) for _, confidence, correct in samples])
+    pooled_threshold = threshold_from_blocks(pooled_blocks, target) or default_threshold
+
+    by_intent = {}
+    for intent, confidence, correct in samples:
+        by_intent.setdefault(intent, []).append((confidence, correct))
+
+    thresholds = {}
+    isotonic = {"*": pooled_blocks}
+
+    for intent, points in by_intent.items():
+        if len(points) < MIN_SAMPLES_PER_INTENT:
+            thresholds[intent] = pooled_threshold
+            continue
+
+        blocks = fit_isotonic(points)
+        isotonic[intent] = blocks
+
+        # An intent that never reaches the target keeps the conservative global threshold
+        thresholds[intent] = threshold_from_blocks(blocks, target) or max(default_threshold, pooled_threshold)
+
+    return {
+        "target_accuracy": target,
+        "default_threshold": pooled_threshold,
+        "thresholds": thresholds,
+        "isotonic": isotonic
+    }
+
+
+def evaluate(samples, thresholds, baseline_threshold):
+    """
+    Compares learned thresholds with the single global baseline on a replay log.
+
+    A retry is a correct classification that gets rejected, forcing the user
+    to speak again; a false accept is a wrong classification that gets run.
+
+    Args:
+        samples (list): (intent, confidence, correct) tuples.
+        thresholds (dict): Learned per-intent thresholds.
+        baseline_threshold (float): Current global threshold, also used by the
+                                    router for intents without a learned value.
+
+    Returns:
+        dict: Retry and false-accept counts for both policies.
+    """
+    report = {
+        "samples": len(samples),
+        "baseline_retries": 0,
+        "calibrated_retries": 0,
+        "baseline_false_accepts": 0,
+        "calibrated_false_accepts": 0
+    }
+
+    for intent, confidence, correct in samples:
+        for policy, threshold in (("baseline", baseline_threshold), ("calibrated", thresholds.get(intent, baseline_threshold))):
+            accepted = confidence >= threshold
+            if correct and not accepted:
+                report[f"{policy}_retries"] += 1
+            elif accepted and not correct:
+                report[f"{policy}_false_accepts"] += 1
+
+    report["retries_avoided"] = report["baseline_retries"] - report["calibrated_retries"]
+    return report
+
+
+def load_thresholds(path=CALIBRATION_FILE):
+    """
+    Loads per-intent confidence thresholds produced by the calibration tool.
+
+    Args:
+        path (str): Calibration file path.
+
+    Returns:
+        dict: Intent to threshold, empty if no calibration is available.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    raw_thresholds = data.get("thresholds", {}) if isinstance(data, dict) else None
+    if not isinstance(raw_thresholds, dict):
+        logger.warning("Ignoring malformed calibration file %s", path)
+        return {}
+
+    thresholds = {}
+    for intent, value in raw_thresholds.items():
+        try:
+            thresholds[intent] = float(value)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed threshold | intent=%s value=%r", intent, value)
+
+    logger.debug("Calibrated thresholds loaded | %s", thresholds)
+    return thresholds
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from core.router import CONFIDENCE_THRESHOLD
+
+    parser = argparse.ArgumentParser(description="Learn per-intent confidence thresholds from a labeled replay log.")
+    parser.add_argument("replay", help="JSONL with intent, confidence and label/correct per line")
+    parser.add_argument("--target", type=float, default=TARGET_ACCURACY, help="Required calibrated accuracy")
+    parser.add_argument("--output", default=CALIBRATION_FILE, help="Calibration file to write")
+    parser.add_argument("--holdout", type=int, default=5, help="Evaluate on every Nth sample, fit on the rest (0 = in-sample)")
+    args = parser.parse_args()
+
+    samples = load_replay(args.replay)
+
+    # Deterministic split so the report is not measured on the fitting data
+    if args.holdout:
+        train = [sample for index, sample in enumerate(samples) if index % args.holdout]
+        test = samples[::args.holdout]
+    else:
+        train = test = samples
+
+    calibration = fit_thresholds(train, CONFIDENCE_THRESHOLD, args.target)
+
+    report = evaluate(test, calibration["thresholds"], CONFIDENCE_THRESHOLD)
+    calibration["evaluation"] = report
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(calibration, file, indent=2)
+
+    print(f"Thresholds: {calibration['thresholds']}")
+    print(f"Evaluation: {report}")
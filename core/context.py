@@ -0,0 +1,190 @@
+import logging
+import re
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Number of past turns kept per session
+MAX_TURNS = 6
+
+# Approximate token budget for the summary injected into the LLM prompt
+MAX_CONTEXT_TOKENS = 60
+
+# Turns older than this (in seconds) are no longer considered for follow-ups
+CONTEXT_TTL_SECONDS = 120
+
+# Short elliptical phrasings that only make sense relative to a previous turn
+FOLLOW_UP_PATTERN = re.compile(
+    r"^(?:and|also|what about|how about|and what about|same|again|then)\b"
+    r"|^(?:in|at|for)\s+\w+\s*\??$"
+    r"|^(?:tomorrow|today|there|that one|it)\s*\??$"
+    r"|\b(?:there|that one|same thing|instead)\b"
+)
+
+
+class Turn:
+    # Slotted record keeps per-turn memory small and fixed
+    __slots__ = ("command", "intent", "entities", "timestamp")
+
+    def __init__(self, command, intent, entities, timestamp):
+        """
+        Stores a single classified turn.
+
+        Args:
+            command (str): Raw user command.
+            intent (str): Classified intent.
+            entities (dict): Extracted entities.
+            timestamp (float): Monotonic time the turn was recorded.
+
+        Returns:
+            None
+        """
+        self.command = command
+        self.intent = intent
+        self.entities = entities
+        self.timestamp = timestamp
+
+    def compact(self):
+        """
+        Renders the turn as a compact single-line description.
+
+        Args:
+            None
+
+        Returns:
+            str: Text such as 'weather(location=Paris)'.
+        """
+        args = ",".join(f"{key}={value}" for key, value in self.entities.items())
+        return f"\"{self.command}\" -> {self.intent}({args})"
+
+
+def estimate_tokens(text):
+    """
+    Approximates the LLM token count of a text.
+
+    Args:
+        text (str): Text to measure.
+
+    Returns:
+        int: Rough token count (about four characters per token).
+    """
+    return (len(text) + 3) // 4
+
+
+class ConversationContext:
+    def __init__(self, max_turns=MAX_TURNS, max_tokens=MAX_CONTEXT_TOKENS, ttl=CONTEXT_TTL_SECONDS):
+        """
+        Initializes a bounded per-session conversation memory.
+
+        Args:
+            max_turns (int): Maximum number of turns retained.
+            max_tokens (int): Token budget for the generated summary.
+            ttl (float): Seconds after which a turn is treated as stale.
+
+        Returns:
+            None
+        """
+        self.turns = deque(maxlen=max_turns)
+        self.max_tokens = max_tokens
+        self.ttl = ttl
+        logger.debug("ConversationContext initialized | max_turns=%s max_tokens=%s", max_turns, max_tokens)
+
+    def add_turn(self, command, intent, entities):
+        """
+        Records a classified turn, skipping turns with no useful intent.
+
+        Args:
+            command (str): Raw user command.
+            intent (str): Classified intent.
+            entities (dict): Extracted entities.
+
+        Returns:
+            None
+        """
+        if intent in ("unknown", "courtesy", "exit"):
+            return
+
+        self.turns.append(Turn(command, intent, dict(entities), time.monotonic()))
+
+    def recent_turns(self):
+        """
+        Returns turns that are still fresh enough to be referenced.
+
+        Args:
+            None
+
+        Returns:
+            list: Turn records ordered oldest to newest.
+        """
+        cutoff = time.monotonic() - self.ttl
+        return [turn for turn in self.turns if turn.timestamp >= cutoff]
+
+    def is_follow_up(self, command):
+        """
+        Detects locally whether a command refers back to an earlier turn.
+
+        Args:
+            command (str): Raw user command.
+
+        Returns:
+            bool: True if the command looks like a follow-up and context exists.
+        """
+        if not self.recent_turns():
+            return False
+
+        command = command.strip().lower()
+
+        # Long utterances are almost always self-contained commands
+        if len(command.split()) > 6:
+            return False
+
+        return bool(FOLLOW_UP_PATTERN.search(command))
+
+    def summary(self):
+        """
+        Builds a compressed summary of recent turns within the token budget.
+
+        Args:
+            None
+
+        Returns:
+            str: Newest-last summary lines, or empty string if nothing fits.
+        """
+        lines = []
+        used = 0
+
+        # Walk newest first so the most relevant turns survive the budget
+        for turn in reversed(self.recent_turns()):
+            line = turn.compact()
+            cost = estimate_tokens(line)
+
+            if used + cost > self.max_tokens:
+                break
+
+            lines.append(line)
+            used += cost
+
+        return "\n".join(reversed(lines))
+
+    def clear(self):
+        """
+        Drops all remembered turns.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.turns.clear()
+
+
+if __name__ == "__main__":
+    context = ConversationContext()
+    context.add_turn("what's the weather in paris", "weather", {"location": "Paris"})
+
+    while True:
+        command = input("Enter a follow-up (Ctrl+C to exit): ")
+        print(f"Follow-up: {context.is_follow_up(command)}")
+        print(context.summary())
@@ -0,0 +1,303 @@
+import json
+import logging
+import os
+import zlib
+
+import numpy as np
+
+from core.intent_dataset import DATASET_FILE, load_dataset
+from core.local_classifier import extract_entities
+from core.vector_index import COMPOUND_PATTERN, ENTITY_FREE_INTENTS
+
+logger = logging.getLogger(__name__)
+
+# Trained weights and metadata
+DATA_DIR = os.path.join("data")
+MODEL_FILE = os.path.join(DATA_DIR, "intent_model.npz")
+
+# Hashed feature space shared by character and word n-grams
+FEATURE_DIMENSIONS = 2 ** 15
+
+# Character n-gram sizes taken from the padded utterance
+CHAR_NGRAMS = (2, 3, 4)
+
+# Probability needed to answer without the LLM
+DISTILLED_CONFIDENCE = 0.9
+
+# Training hyperparameters for full-batch softmax regression
+EPOCHS = 300
+LEARNING_RATE = 2.0
+L2_PENALTY = 1e-4
+
+
+def featurize(texts, dimensions=FEATURE_DIMENSIONS):
+    """
+    Converts texts to hashed character and word n-gram features.
+
+    Every text yields at least one feature, so rows are never empty.
+
+    Args:
+        texts (list): Utterances.
+        dimensions (int): Size of the hashed feature space.
+
+    Returns:
+        tuple: (indices, values, offsets) arrays in a compact CSR-like layout,
+               row i spanning indices[offsets[i]:offsets[i + 1]].
+    """
+    indices, values, offsets = [], [], [0]
+
+    for text in texts:
+        text = " ".join(text.lower().split())
+        padded = f" {text} "
+        grams = {f"c{padded[i:i + n]}" for n in CHAR_NGRAMS for i in range(len(padded) - n + 1)}
+
+        words = text.split()
+        grams.update(f"w{word}" for word in words)
+        grams.update(f"b{first} {second}" for first, second in zip(words, words[1:]))
+
+        # Presence features, scaled so long commands do not dominate
+        buckets = np.unique([zlib.crc32(gram.encode("utf-8")) % dimensions for gram in grams])
+        indices.append(buckets)
+        values.append(np.full(len(buckets), 1.0 / np.sqrt(len(buckets)), dtype=np.float32))
+        offsets.append(offsets[-1] + len(buckets))
+
+    return np.concatenate(indices), np.concatenate(values), np.asarray(offsets)
+
+
+def softmax(scores):
+    """
+    Row-wise softmax.
+
+    Args:
+        scores (numpy.ndarray): (rows, classes) logits.
+
+    Returns:
+        numpy.ndarray: Row-normalized probabilities.
+    """
+    scores = scores - scores.max(axis=1, keepdims=True)
+    exponentials = np.exp(scores)
+    return exponentials / exponentials.sum(axis=1, keepdims=True)
+
+
+class DistilledClassifier:
+    def __init__(self, weights, bias, labels):
+        """
+        Initializes a trained softmax regression intent classifier.
+
+        Args:
+            weights (numpy.ndarray): (FEATURE_DIMENSIONS, classes) float32 weights.
+            bias (numpy.ndarray): (classes,) float32 bias.
+            labels (list): Intent name per class.
+
+        Returns:
+            None
+        """
+        self.weights = weights
+        self.bias = bias
+        self.labels = list(labels)
+
+    @classmethod
+    def train(cls, utterances, intents, epochs=EPOCHS, learning_rate=LEARNING_RATE, l2=L2_PENALTY):
+        """
+        Fits the classifier with full-batch gradient descent on cross-entropy.
+
+        Args:
+            utterances (list): Training utterances.
+            intents (list): LLM label for each utterance.
+            epochs (int): Gradient steps.
+            learning_rate (float): Step size.
+            l2 (float): Weight decay.
+
+        Returns:
+            DistilledClassifier: Trained model.
+        """
+        labels = sorted(set(intents))
+        targets = np.zeros((len(intents), len(labels)), dtype=np.float32)
+        targets[np.arange(len(intents)), [labels.index(intent) for intent in intents]] = 1.0
+
+        indices, values, offsets = featurize(utterances)
+        rows = np.repeat(np.arange(len(utterances)), np.diff(offsets))
+
+        model = cls(np.zeros((FEATURE_DIMENSIONS, len(labels)), dtype=np.float32), np.zeros(len(labels), dtype=np.float32), labels)
+
+        for _ in range(epochs):
+            error = (softmax(model._scores(indices, values, offsets)) - targets) / len(utterances)
+
+            # Sparse gradient: only the features present in the batch are touched
+            gradient = error[rows] * values[:, None]
+            np.add.at(model.weights, indices, -learning_rate * gradient)
+            model.weights *= 1.0 - learning_rate * l2
+            model.bias -= learning_rate * error.sum(axis=0)
+
+        return model
+
+    def _scores(self, indices, values, offsets):
+        """
+        Computes logits for a featurized batch.
+
+        Args:
+            indices (numpy.ndarray): Feature indices from featurize().
+            values (numpy.ndarray): Feature values from featurize().
+            offsets (numpy.ndarray): Row offsets from featurize().
+
+        Returns:
+            numpy.ndarray: (rows, classes) logits.
+        """
+        contributions = self.weights[indices] * values[:, None]
+        return np.add.reduceat(contributions, offsets[:-1], axis=0) + self.bias
+
+    def predict_batch(self, texts):
+        """
+        Predicts intents for many utterances in one vectorized pass.
+
+        Args:
+            texts (list): Utterances.
+
+        Returns:
+            list: (intent, probability) per utterance.
+        """
+        if not texts:
+            return []
+
+        probabilities = softmax(self._scores(*featurize(texts)))
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[label], float(probabilities[row, label])) for row, label in enumerate(best)]
+
+    def classify(self, command, min_confidence=DISTILLED_CONFIDENCE):
+        """
+        Classifies a single command when the model is confident and entities are complete.
+
+        Args:
+            command (str): Raw user command.
+            min_confidence (float): Probability required to return a result.
+
+        Returns:
+            tuple | None: (intent, entities, confidence), or None to defer.
+        """
+        if COMPOUND_PATTERN.search(command.lower()):
+            return None
+
+        intent, probability = self.predict_batch([command])[0]
+        if intent == "unknown" or probability < min_confidence:
+            return None
+
+        # Entities come from the rule for the predicted intent; without them the LLM is needed
+        entities = {} if intent in ENTITY_FREE_INTENTS else extract_entities(intent, command)
+        if entities is None:
+            return None
+
+        logger.debug("Distilled classifier hit | intent=%s probability=%.3f", intent, probability)
+        return intent, entities, round(probability, 3)
+
+    def save(self, path=MODEL_FILE):
+        """
+        Writes the model to a compressed .npz file.
+
+        Args:
+            path (str): Model file path.
+
+        Returns:
+            None
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, weights=self.weights, bias=self.bias, labels=np.array(json.dumps(self.labels)))
+
+    @classmethod
+    def load(cls, path=MODEL_FILE):
+        """
+        Loads a trained model if one exists.
+
+        Args:
+            path (str): Model file path.
+
+        Returns:
+            DistilledClassifier | None: The model, or None if it is missing or unreadable.
+        """
+        try:
+            with np.load(path) as data:
+                model = cls(data["weights"], data["bias"], json.loads(str(data["labels"])))
+        except (OSError, ValueError, KeyError):
+            return None
+
+        logger.debug("Distilled classifier loaded | classes=%s", len(model.labels))
+        return model
+
+
+def evaluate(model, examples, min_confidence=DISTILLED_CONFIDENCE):
+    """
+    Measures agreement with the LLM labels on held-out examples.
+
+    Args:
+        model (DistilledClassifier): Trained model.
+        examples (list): Example dicts from load_dataset().
+        min_confidence (float): Probability the engine requires to skip the LLM.
+
+    Returns:
+        dict: Overall agreement, coverage (share answered without the LLM),
+              agreement on that covered share, and per-intent agreement.
+    """
+    predictions = model.predict_batch([example["utterance"] for example in examples])
+
+    per_intent = {}
+    agreed = covered = covered_agreed = 0
+
+    for example, (intent, probability) in zip(examples, predictions):
+        correct = intent == example["intent"]
+        agreed += correct
+
+        stats = per_intent.setdefault(example["intent"], [0, 0])
+        stats[0] += correct
+        stats[1] += 1
+
+        if intent != "unknown" and probability >= min_confidence:
+            covered += 1
+            covered_agreed += correct
+
+    total = max(len(examples), 1)
+    return {
+        "samples": len(examples),
+        "agreement": round(agreed / total, 3),
+        "coverage": round(covered / total, 3),
+        "covered_agreement": round(covered_agreed / max(covered, 1), 3),
+        "per_intent": {intent: round(hits / count, 3) for intent, (hits, count) in sorted(per_intent.items())}
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Train or evaluate the distilled local intent classifier.")
+    parser.add_argument("command", choices=["train", "evaluate"])
+    parser.add_argument("--dataset", default=DATASET_FILE, help="JSONL of LLM-labeled utterances")
+    parser.add_argument("--log", action="append", default=[], help="Application log to mine for extra labels")
+    parser.add_argument("--model", default=MODEL_FILE, help="Model file to write or read")
+    parser.add_argument("--holdout", type=int, default=5, help="Evaluate on every Nth example, train on the rest (0 = in-sample)")
+    args = parser.parse_args()
+
+    examples = load_dataset(args.dataset, args.log)
+    if not examples:
+        raise SystemExit(f"No labeled examples in {args.dataset}")
+
+    if args.holdout:
+        train = [example for index, example in enumerate(examples) if index % args.holdout]
+        test = examples[::args.holdout]
+    else:
+        train = test = examples
+
+    if args.command == "train":
+        started = time.perf_counter()
+        model = DistilledClassifier.train([example["utterance"] for example in train], [example["intent"] for example in train])
+        print(f"Trained on {len(train)} examples in {time.perf_counter() - started:.2f}s")
+        model.save(args.model)
+    else:
+        model = DistilledClassifier.load(args.model)
+        if model is None:
+            raise SystemExit(f"No model at {args.model}, run train first")
+
+    started = time.perf_counter()
+    report = evaluate(model, test)
+    batch_us = (time.perf_counter() - started) / max(len(test), 1) * 1e6
+
+    print(f"Evaluation: {json.dumps(report, indent=2)}")
+    print(f"Batch inference: {batch_us:.0f} us per utterance")
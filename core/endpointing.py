@@ -0,0 +1,326 @@
+import logging
+
+import numpy as np
+
+from core.audio_dsp import pcm_to_float, frame_rms
+
+logger = logging.getLogger(__name__)
+
+# Trailing silence speech_recognition waits for by default (Recognizer.pause_threshold)
+DEFAULT_PAUSE_SECONDS = 0.8
+
+# Speech shorter than this is treated as a noise burst, like phrase_threshold
+MIN_SPEECH_SECONDS = 0.3
+
+# Silence window for short, command-like utterances ...
+MIN_SILENCE_SECONDS = 0.3
+
+# ... growing linearly to the default window for utterances of LONG_UTTERANCE_SECONDS and more
+SHORT_UTTERANCE_SECONDS = 1.0
+LONG_UTTERANCE_SECONDS = 3.0
+
+# Speech that stops without tapering off is likely mid-sentence and gets a longer window
+TRAILING_SECONDS = 0.15
+SUSTAINED_ENERGY_RATIO = 0.6
+MID_SENTENCE_EXTENSION_SECONDS = 0.3
+
+# A pause the speaker already made inside this utterance is not taken for its end
+PAUSE_MARGIN_SECONDS = 0.15
+
+# Upper bound on the adaptive window
+MAX_SILENCE_SECONDS = 1.2
+
+# Frame length used when evaluating recordings
+FRAME_SECONDS = 0.03
+
+# Floor for the energy threshold calibrated from a recording's quietest frames
+MIN_ENERGY_THRESHOLD = 300
+NOISE_FLOOR_MULTIPLIER = 3.0
+
+
+class Endpointer:
+    def __init__(self, energy_threshold, frame_seconds, pause_seconds=DEFAULT_PAUSE_SECONDS):
+        """
+        Detects the end of an utterance after a fixed trailing silence, like speech_recognition.
+
+        Args:
+            energy_threshold (float): Frame RMS (16-bit units) above which a frame is speech.
+            frame_seconds (float): Duration of one frame.
+            pause_seconds (float): Trailing silence that ends the utterance.
+
+        Returns:
+            None
+        """
+        self.energy_threshold = energy_threshold
+        self.frame_seconds = frame_seconds
+        self.pause_seconds = pause_seconds
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets the current utterance.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.started = False
+        self.speech_frames = 0
+        self.silence_frames = 0
+        self.longest_pause_frames = 0
+        self.voiced_energies = []
+        self.window = None
+
+    def silence_window(self):
+        """
+        Returns the trailing silence that ends the current utterance.
+
+        Args:
+            None
+
+        Returns:
+            float: Seconds.
+        """
+        return self.pause_seconds
+
+    def update(self, energy):
+        """
+        Feeds one frame.
+
+        Args:
+            energy (float): Frame RMS in 16-bit units.
+
+        Returns:
+            bool: True when the utterance has ended with this frame.
+        """
+        if energy > self.energy_threshold:
+            if self.silence_frames:
+                self.longest_pause_frames = max(self.longest_pause_frames, self.silence_frames)
+            self.started = True
+            self.speech_frames += 1
+            self.silence_frames = 0
+            self.voiced_energies.append(float(energy))
+            self.window = None
+            return False
+
+        if not self.started:
+            return False
+
+        # The window is decided once per pause, when its first silent frame arrives
+        self.silence_frames += 1
+        if self.window is None:
+            self.window = self.silence_window()
+
+        if self.silence_frames * self.frame_seconds < self.window:
+            return False
+
+        if self.speech_frames * self.frame_seconds < MIN_SPEECH_SECONDS:
+            self.reset()
+            return False
+
+        return True
+
+    @property
+    def trailing_silence_seconds(self):
+        """
+        Returns the silence waited out since the last speech frame.
+
+        Args:
+            None
+
+        Returns:
+            float: Seconds.
+        """
+        return self.silence_frames * self.frame_seconds
+
+
+class AdaptiveEndpointer(Endpointer):
+    def silence_window(self):
+        """
+        Chooses the trailing silence from the utterance's VAD frame statistics.
+
+        Short commands end after MIN_SILENCE_SECONDS; the window grows with the
+        amount of speech, is extended when the speech stopped at full energy
+        (likely mid-sentence), and always exceeds pauses already made in the utterance.
+
+        Args:
+            None
+
+        Returns:
+            float: Seconds.
+        """
+        speech_seconds = self.speech_frames * self.frame_seconds
+        growth = np.clip((speech_seconds - SHORT_UTTERANCE_SECONDS) / (LONG_UTTERANCE_SECONDS - SHORT_UTTERANCE_SECONDS), 0.0, 1.0)
+        window = MIN_SILENCE_SECONDS + growth * (self.pause_seconds - MIN_SILENCE_SECONDS)
+
+        energies = np.asarray(self.voiced_energies, dtype=np.float32)
+        trailing = max(1, round(TRAILING_SECONDS / self.frame_seconds))
+        if len(energies) > trailing and energies[-trailing:].mean() >= SUSTAINED_ENERGY_RATIO * np.median(energies):
+            window += MID_SENTENCE_EXTENSION_SECONDS
+
+        window = max(window, self.longest_pause_frames * self.frame_seconds + PAUSE_MARGIN_SECONDS)
+        return float(min(window, MAX_SILENCE_SECONDS))
+
+
+def calibrate_threshold(energies):
+    """
+    Estimates a speech energy threshold from a recording's quietest frames.
+
+    Args:
+        energies (np.ndarray): Frame RMS values.
+
+    Returns:
+        float: Threshold in 16-bit units.
+    """
+    if len(energies) == 0:
+        return float(MIN_ENERGY_THRESHOLD)
+    return float(max(MIN_ENERGY_THRESHOLD, NOISE_FLOOR_MULTIPLIER * np.percentile(energies, 10)))
+
+
+def simulate(endpointer, energies):
+    """
+    Runs an endpointer over precomputed frame energies.
+
+    Args:
+        endpointer (Endpointer): Fresh endpointer.
+        energies (np.ndarray): Frame RMS values, with trailing silence appended.
+
+    Returns:
+        int | None: Index of the frame at which the utterance ended, or None.
+    """
+    for index, energy in enumerate(energies):
+        if endpointer.update(energy):
+            return index
+    return None
+
+
+def evaluate_clip(samples, sample_rate, energy_threshold=None, pause_seconds=DEFAULT_PAUSE_SECONDS, padding_seconds=2.0):
+    """
+    Compares fixed and adaptive endpointing on one recording.
+
+    Args:
+        samples (np.ndarray): float samples of the utterance.
+        sample_rate (int): Sample rate in Hz.
+        energy_threshold (float | None): Speech threshold, calibrated from the clip when None.
+        pause_seconds (float): Fixed window of the baseline.
+        padding_seconds (float): Silence appended so both endpointers can finish.
+
+    Returns:
+        dict | None: Per-method end frame and end-of-speech delay, or None without speech.
+    """
+    frame_length = max(1, int(sample_rate * FRAME_SECONDS))
+    frame_seconds = frame_length / sample_rate
+    energies = frame_rms(samples, frame_length)
+    threshold = energy_threshold if energy_threshold is not None else calibrate_threshold(energies)
+
+    voiced = np.flatnonzero(energies > threshold)
+    if len(voiced) == 0:
+        return None
+
+    last_speech = int(voiced[-1])
+    padded = np.concatenate([energies, np.zeros(int(padding_seconds / frame_seconds) + 1, dtype=np.float32)])
+
+    result = {"threshold": threshold, "speech_end": (last_speech + 1) * frame_seconds, "frame_seconds": frame_seconds}
+    for name, endpointer in (
+        ("fixed", Endpointer(threshold, frame_seconds, pause_seconds)),
+        ("adaptive", AdaptiveEndpointer(threshold, frame_seconds, pause_seconds))
+    ):
+        end = simulate(endpointer, padded)
+        if end is None:
+            end = len(padded) - 1
+        result[name] = {
+            "end": (end + 1) * frame_seconds,
+            "delay_ms": (end - last_speech) * frame_seconds * 1000,
+            # Ending before the last speech frame splits the utterance
+            "cut": end < last_speech
+        }
+
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import glob
+    import time
+    import wave
+
+    parser = argparse.ArgumentParser(description="Measure end-of-speech latency of fixed vs adaptive endpointing on recordings.")
+    parser.add_argument("wavs", nargs="*", help="Mono WAV recordings of single utterances")
+    parser.add_argument("--captures", help="Also use turns from a capture directory (see core.turn_capture)")
+    parser.add_argument("--pause", type=float, default=DEFAULT_PAUSE_SECONDS, help="Fixed window of the baseline")
+    parser.add_argument("--energy-threshold", type=float, default=None, help="Speech threshold, calibrated per clip by default")
+    parser.add_argument("--stt", action="store_true", help="Transcribe both endpointed versions to include STT time")
+    args = parser.parse_args()
+
+    clips = []
+    for pattern in args.wavs:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            with wave.open(path, "rb") as file:
+                if file.getnchannels() != 1:
+                    print(f"Skipping {path}: not mono")
+                    continue
+                clips.append((path, file.readframes(file.getnframes()), file.getframerate(), file.getsampwidth()))
+
+    if args.captures:
+        from core.turn_capture import iter_turns, load_audio
+
+        for record in iter_turns(args.captures):
+            audio = load_audio(record, args.captures)
+            if audio is not None:
+                clips.append((record["id"], audio.frame_data, audio.sample_rate, audio.sample_width))
+
+    recognizer = None
+    if args.stt:
+        import speech_recognition
+
+        from core.recognizer import Recognizer
+
+        recognizer = Recognizer()
+
+    totals = {"fixed": [], "adaptive": []}
+    cuts = {"fixed": 0, "adaptive": 0}
+    changed = 0
+
+    print(f"{'clip':40} {'fixed ms':>9} {'adaptive ms':>12}  notes")
+    for name, data, rate, width in clips:
+        samples = pcm_to_float(data, width)
+        result = evaluate_clip(samples, rate, args.energy_threshold, args.pause)
+        if result is None:
+            print(f"{name:40} {'-':>9} {'-':>12}  no speech above threshold")
+            continue
+
+        notes, transcripts = [], {}
+        for method in ("fixed", "adaptive"):
+            outcome = result[method]
+            latency = outcome["delay_ms"]
+            cuts[method] += outcome["cut"]
+
+            if recognizer is not None:
+                end = min(len(samples), int(outcome["end"] * rate))
+                audio = speech_recognition.AudioData(data[:end * width], rate, width)
+                started = time.perf_counter()
+                transcripts[method] = recognizer.transcribe(audio)
+                latency += (time.perf_counter() - started) * 1000
+
+            outcome["latency_ms"] = latency
+            totals[method].append(latency)
+            if outcome["cut"]:
+                notes.append(f"{method} cut early")
+
+        if transcripts and transcripts["fixed"] != transcripts["adaptive"]:
+            changed += 1
+            notes.append(f"transcripts differ: {transcripts['fixed']!r} vs {transcripts['adaptive']!r}")
+
+        print(f"{name[-40:]:40} {result['fixed']['latency_ms']:9.0f} {result['adaptive']['latency_ms']:12.0f}  {'; '.join(notes)}")
+
+    if totals["fixed"]:
+        label = "end-of-speech to transcript" if recognizer is not None else "end-of-speech to endpoint"
+        fixed, adaptive = np.array(totals["fixed"]), np.array(totals["adaptive"])
+        print(f"\n{len(fixed)} clips, {label} latency:")
+        print(f"  fixed     mean {fixed.mean():7.0f} ms  p95 {np.percentile(fixed, 95):7.0f} ms  cut {cuts['fixed']}")
+        print(f"  adaptive  mean {adaptive.mean():7.0f} ms  p95 {np.percentile(adaptive, 95):7.0f} ms  cut {cuts['adaptive']}")
+        print(f"  gain      mean {fixed.mean() - adaptive.mean():7.0f} ms")
+        if recognizer is not None:
+            print(f"  transcripts changed by adaptive endpointing: {changed}")
@@ -0,0 +1,366 @@
+import logging
+import re
+from urllib.parse import urlparse
+
+from core.responses import get_renderer
+from modules.timer import MAX_TIMER_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Seconds per spoken duration unit
+DURATION_UNITS = {
+    "s": 1, "sec": 1, "secs": 1, "second": 1, "seconds": 1,
+    "m": 60, "min": 60, "mins": 60, "minute": 60, "minutes": 60,
+    "h": 3600, "hr": 3600, "hrs": 3600, "hour": 3600, "hours": 3600
+}
+
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([a-z]+)?")
+
+# A minus sign before any amount, which DURATION_PATTERN alone would silently drop
+NEGATIVE_AMOUNT = re.compile(r"-\s*\.?\d")
+
+CLOCK_PATTERN = re.compile(r"^(\d{1,2})(?:[:.](\d{2}))?\s*([ap])?\.?\s*m?\.?$")
+
+# Declarative entity schemas per intent, compiled once by SchemaRegistry;
+# errors are core.responses template keys, rendered in the locale current when raised
+ENTITY_SCHEMAS = {
+    "date_time": {
+        "info_type": {
+            "type": "choice_list",
+            "choices": ("time", "date", "day"),
+            "default": ["time", "date", "day"]
+        }
+    },
+    "joke": {
+        "category": {
+            "type": "choice",
+            "choices": ("neutral", "chuck", "all"),
+            "aliases": {
+                "chuck norris": "chuck",
+                "programming": "neutral",
+                "any": "all"
+            },
+            "default": "neutral",
+            "error": "joke.unknown_category"
+        }
+    },
+    "weather": {
+        "location": {"type": "text"}
+    },
+    "search": {
+        "query": {"type": "text", "required": True, "error": "search.no_query"}
+    },
+    "youtube": {
+        "query": {"type": "text", "required": True, "error": "youtube.no_query"}
+    },
+    "opening_app_or_url": {
+        "type": {"type": "choice", "choices": ("app", "url"), "required": True, "error": "open_app.invalid"},
+        "name": {"type": "text"},
+        "executable": {"type": "text"},
+        "url": {"type": "url", "error": "open_app.no_url"}
+    },
+    "system_info": {
+        "resource": {
+            "type": "choice",
+            "choices": ("battery", "cpu", "memory", "storage", "uptime"),
+            "aliases": {
+                "ram": "memory",
+                "mem": "memory",
+                "disk": "storage",
+                "drive": "storage",
+                "hard drive": "storage",
+                "processor": "cpu",
+                "power": "battery"
+            },
+            "required": True,
+            "error": "system_info.no_resource"
+        }
+    },
+    "timer": {
+        "duration": {
+            "type": "duration",
+            "min": 0.001,
+            "max": MAX_TIMER_SECONDS,
+            "error": "timer.invalid_duration",
+            "max_error": "timer.too_long"
+        },
+        "every": {
+            "type": "duration",
+            "min": 1,
+            "max": MAX_TIMER_SECONDS,
+            "error": "timer.invalid_duration",
+            "max_error": "timer.too_long"
+        },
+        "at": {"type": "clock", "error": "timer.invalid_alarm"},
+        "label": {"type": "text"}
+    }
+}
+
+# Intents that need at least one of several optional entities
+REQUIRED_ANY = {
+    "timer": (("duration", "every", "at"), "timer.invalid_duration")
+}
+
+
+class EntityValidationError(ValueError):
+    def __init__(self, key):
+        """
+        Signals that an entity payload cannot be dispatched.
+
+        Args:
+            key (str): Template key of the user-facing explanation, rendered
+                       into message.
+
+        Returns:
+            None
+        """
+        self.key = key
+        self.message = get_renderer().render(key)
+        super().__init__(self.message)
+
+
+def parse_duration(value):
+    """
+    Normalizes a duration given as a number or spoken text into seconds.
+
+    Args:
+        value (int | float | str): Value such as 300, "300", "5 minutes" or "1h 30m".
+
+    Returns:
+        int | float: Duration in seconds, fractional values kept to millisecond precision.
+
+    Raises:
+        ValueError: If the value cannot be interpreted as a duration.
+    """
+    if isinstance(value, bool):
+        raise ValueError("boolean is not a duration")
+
+    if isinstance(value, (int, float)):
+        total = float(value)
+        return int(total) if total.is_integer() else round(total, 3)
+
+    text = str(value).strip().lower()
+    if NEGATIVE_AMOUNT.search(text):
+        raise ValueError(f"negative duration: {value!r}")
+
+    matches = DURATION_PATTERN.findall(text)
+    if not matches:
+        raise ValueError(f"unrecognized duration: {value!r}")
+
+    total = 0.0
+    for amount, unit in matches:
+        # A bare number is already in seconds
+        multiplier = DURATION_UNITS.get(unit, None) if unit else 1
+        if multiplier is None:
+            raise ValueError(f"unknown duration unit: {unit!r}")
+        total += float(amount) * multiplier
+
+    return int(total) if total.is_integer() else round(total, 3)
+
+
+def parse_clock(value):
+    """
+    Normalizes a spoken time of day into 24-hour "HH:MM".
+
+    Args:
+        value (str): Value such as "7:30", "7.30 pm", "7 am" or "19:30".
+
+    Returns:
+        str: Time of day in "HH:MM" format.
+
+    Raises:
+        ValueError: If the value is not a valid time of day.
+    """
+    match = CLOCK_PATTERN.match(str(value).strip().lower())
+    if match is None:
+        raise ValueError(f"unrecognized time: {value!r}")
+
+    hour = int(match.group(1))
+    minute = int(match.group(2) or 0)
+    meridiem = match.group(3)
+
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ValueError(f"invalid 12-hour time: {value!r}")
+        hour = hour % 12 + (12 if meridiem == "p" else 0)
+
+    if hour > 23 or minute > 59:
+        raise ValueError(f"invalid time: {value!r}")
+
+    return f"{hour:02d}:{minute:02d}"
+
+
+def _compile_field(spec):
+    """
+    Builds the coercion function for a single field specification.
+
+    Args:
+        spec (dict): Field specification from ENTITY_SCHEMAS.
+
+    Returns:
+        callable: Function mapping a raw value to its normalized form.
+    """
+    field_type = spec["type"]
+    error = spec.get("error", "request.invalid")
+
+    if field_type == "text":
+        def coerce(value):
+            if not isinstance(value, (str, int, float)):
+                raise EntityValidationError(error)
+            return str(value).strip()
+
+    elif field_type == "choice":
+        choices = frozenset(spec["choices"])
+        aliases = spec.get("aliases", {})
+
+        def coerce(value):
+            value = str(value).strip().lower()
+            value = aliases.get(value, value)
+            if value not in choices:
+                raise EntityValidationError(error)
+            return value
+
+    elif field_type == "choice_list":
+        choices = frozenset(spec["choices"])
+
+        def coerce(value):
+            if isinstance(value, str):
+                value = [value]
+            if not isinstance(value, (list, tuple)):
+                raise EntityValidationError(error)
+
+            # Keep the requested order but drop unknown and duplicate items
+            normalized = []
+            for item in value:
+                item = str(item).strip().lower()
+                if item in choices and item not in normalized:
+                    normalized.append(item)
+            return normalized
+
+    elif field_type == "duration":
+        minimum = spec.get("min", 0)
+        maximum = spec.get("max")
+        max_error = spec.get("max_error", error)
+
+        def coerce(value):
+            try:
+                seconds = parse_duration(value)
+            except ValueError:
+                raise EntityValidationError(error)
+            if seconds < minimum:
+                raise EntityValidationError(error)
+            if maximum is not None and seconds > maximum:
+                raise EntityValidationError(max_error)
+            return seconds
+
+    elif field_type == "clock":
+        def coerce(value):
+            try:
+                return parse_clock(value)
+            except ValueError:
+                raise EntityValidationError(error)
+
+    elif field_type == "url":
+        def coerce(value):
+            value = str(value).strip()
+            if "://" not in value:
+                value = "https://" + value
+            parsed = urlparse(value)
+            if parsed.scheme not in ("http", "https") or not parsed.netloc:
+                raise EntityValidationError(error)
+            return value
+
+    else:
+        raise ValueError(f"Unsupported entity field type: {field_type}")
+
+    return coerce
+
+
+class SchemaRegistry:
+    def __init__(self, schemas=None):
+        """
+        Compiles entity validators for every intent once at startup.
+
+        Args:
+            schemas (dict | None): Intent to field specification mapping,
+                                   defaults to ENTITY_SCHEMAS.
+
+        Returns:
+            None
+        """
+        schemas = ENTITY_SCHEMAS if schemas is None else schemas
+        self.validators = {}
+
+        for intent, fields in schemas.items():
+            compiled = []
+            for name, spec in fields.items():
+                compiled.append((
+                    name,
+                    _compile_field(spec),
+                    spec.get("required", False),
+                    spec.get("default"),
+                    spec.get("error", "request.invalid")
+                ))
+            self.validators[intent] = tuple(compiled)
+
+        logger.debug("SchemaRegistry initialized | intents=%s", len(self.validators))
+
+    def validate(self, intent, entities):
+        """
+        Coerces and normalizes the entities of an intent.
+
+        Unknown keys are dropped and empty values are treated as missing.
+
+        Args:
+            intent (str): Classified intent.
+            entities (dict): Raw entities from the classifier.
+
+        Returns:
+            dict: Normalized entities ready for dispatch.
+
+        Raises:
+            EntityValidationError: If a required entity is missing or malformed.
+        """
+        validators = self.validators.get(intent)
+
+        # Intents without a schema take no entities
+        if validators is None:
+            return {}
+
+        normalized = {}
+        for name, coerce, required, default, error in validators:
+            value = entities.get(name)
+
+            if value is not None and value != "" and value != []:
+                value = coerce(value)
+
+            if value is None or value == "" or value == []:
+                if required:
+                    raise EntityValidationError(error)
+                if default is not None:
+                    normalized[name] = list(default) if isinstance(default, list) else default
+                continue
+
+            normalized[name] = value
+
+        required_any = REQUIRED_ANY.get(intent)
+        if required_any is not None:
+            names, error = required_any
+            if not any(name in normalized for name in names):
+                raise EntityValidationError(error)
+
+        return normalized
+
+
+if __name__ == "__main__":
+    import ast
+
+    registry = SchemaRegistry()
+
+    intent = input("Enter intent: ")
+    entities = ast.literal_eval(input("Enter entities: "))
+
+    try:
+        print(registry.validate(intent, entities))
+    except EntityValidationError as e:
+        print(f"Rejected: {e.message}")
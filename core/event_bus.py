@@ -0,0 +1,511 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Event priorities, lower is delivered first; events of equal priority keep publish order
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2
+
+# Text for the user, spoken by the speech output between turns (payload: str)
+TOPIC_ANNOUNCE = "speech.announce"
+
+# Progress of a long-running skill (payload: dict with source, message, fraction, done)
+TOPIC_PROGRESS = "skill.progress"
+
+# Events a subscriber may have queued before publishers see backpressure
+DEFAULT_MAX_PENDING = 64
+
+# Longest wait for queued events to be delivered when the bus is closed
+CLOSE_TIMEOUT_SECONDS = 2.0
+
+
+class Event:
+    # Slotted, since progress updates can be published at a high rate
+    __slots__ = ("topic", "payload", "priority", "sequence", "key", "published")
+
+    def __init__(self, topic, payload, priority, sequence, key=None):
+        """
+        Stores one published event.
+
+        Args:
+            topic (str): Dotted topic name such as "speech.announce".
+            payload (object): Event data, not copied.
+            priority (int): PRIORITY_* value.
+            sequence (int): Publish order across the bus.
+            key (str | None): Coalescing key; a newer event with the same key
+                              replaces a still-queued one.
+
+        Returns:
+            None
+        """
+        self.topic = topic
+        self.payload = payload
+        self.priority = priority
+        self.sequence = sequence
+        self.key = key
+        self.published = time.monotonic()
+
+
+class Subscription:
+    def __init__(self, pattern, handler, max_pending=DEFAULT_MAX_PENDING, name=None):
+        """
+        Starts a bounded priority queue and its delivery thread for one handler.
+
+        Each subscriber has its own thread, so a slow handler (speech) never
+        delays delivery to the others or the publisher.
+
+        Args:
+            pattern (str): Exact topic, "prefix.*" or "*".
+            handler (callable): Called with each Event on the delivery thread.
+            max_pending (int): Queue bound.
+            name (str | None): Name for logs and stats.
+
+        Returns:
+            None
+        """
+        self.pattern = pattern
+        self.handler = handler
+        self.max_pending = max_pending
+        self.name = name or pattern
+
+        self.condition = threading.Condition()
+        self.heap = []
+        self.keyed = {}
+        self.closed = False
+        self.busy = False
+        self.stats = {"delivered": 0, "dropped": 0, "coalesced": 0, "failed": 0}
+
+        self.thread = threading.Thread(target=self._run, daemon=True, name=f"EventBus-{self.name}")
+        self.thread.start()
+
+    def matches(self, topic):
+        """
+        Tells whether an event topic is delivered to this subscription.
+
+        Args:
+            topic (str): Event topic.
+
+        Returns:
+            bool: True on an exact, prefix or catch-all match.
+        """
+        if self.pattern == "*" or self.pattern == topic:
+            return True
+        return self.pattern.endswith(".*") and topic.startswith(self.pattern[:-1])
+
+    def _evict_for(self, event):
+        """
+        Drops the least important queued event if the new one outranks it.
+
+        Args:
+            event (Event): Event waiting for room.
+
+        Returns:
+            bool: True if room was made.
+        """
+        # Bounded queues are small, so a linear scan beats keeping a second heap
+        worst = max(self.heap)
+        if worst[0] <= event.priority:
+            return False
+
+        self.heap.remove(worst)
+        heapq.heapify(self.heap)
+        if worst[2].key is not None:
+            self.keyed.pop(worst[2].key, None)
+
+        self.stats["dropped"] += 1
+        logger.debug("Event dropped for a higher priority one | subscriber=%s topic=%s", self.name, worst[2].topic)
+        return True
+
+    def offer(self, event, timeout=0):
+        """
+        Queues an event, applying coalescing and backpressure.
+
+        Args:
+            event (Event): Event to deliver.
+            timeout (float): Seconds to wait for room when the queue is full;
+                             0 never blocks the publisher.
+
+        Returns:
+            bool: True if the event was queued or merged into a queued one.
+        """
+        deadline = time.monotonic() + timeout
+
+        with self.condition:
+            if self.closed:
+                return False
+
+            # Only the latest state matters for keyed events such as progress
+            entry = self.keyed.get(event.key) if event.key is not None else None
+            if entry is not None:
+                entry[2] = event
+                # A promoted event is ordered among its new priority by when it was promoted
+                if event.priority < entry[0]:
+                    entry[0] = event.priority
+                    entry[1] = event.sequence
+                    heapq.heapify(self.heap)
+                self.stats["coalesced"] += 1
+                return True
+
+            while len(self.heap) >= self.max_pending and not self._evict_for(event):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self.closed:
+                    self.stats["dropped"] += 1
+                    # Background events are expendable by design, losing anything else is worth a warning
+                    log = logger.debug if event.priority >= PRIORITY_BACKGROUND else logger.warning
+                    log("Event rejected, subscriber queue full | subscriber=%s topic=%s", self.name, event.topic)
+                    return False
+                self.condition.wait(remaining)
+
+            # Lists, so a coalesced event can replace the entry in place
+            entry = [event.priority, event.sequence, event]
+            heapq.heappush(self.heap, entry)
+            if event.key is not None:
+                self.keyed[event.key] = entry
+
+            self.condition.notify_all()
+            return True
+
+    def discard(self, key):
+        """
+        Drops a still-queued keyed event.
+
+        Args:
+            key (str): Coalescing key of the event.
+
+        Returns:
+            bool: True if an event was dropped.
+        """
+        with self.condition:
+            entry = self.keyed.pop(key, None)
+            if entry is None:
+                return False
+
+            self.heap.remove(entry)
+            heapq.heapify(self.heap)
+            self.condition.notify_all()
+            return True
+
+    def pending(self):
+        """
+        Returns the number of queued events, including one being handled.
+
+        Args:
+            None
+
+        Returns:
+            int: Events not yet fully delivered.
+        """
+        with self.condition:
+            return len(self.heap) + self.busy
+
+    def _run(self):
+        """
+        Delivery thread loop: hands queued events to the handler in priority order.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        while True:
+            with self.condition:
+                while not self.heap and not self.closed:
+                    self.condition.wait()
+                if not self.heap:
+                    return
+
+                _, _, event = heapq.heappop(self.heap)
+                if event.key is not None:
+                    self.keyed.pop(event.key, None)
+                self.busy = True
+
+                # Wake publishers waiting for room
+                self.condition.notify_all()
+
+            # Handle outside the lock so publishing never waits for a handler
+            try:
+                self.handler(event)
+                self.stats["delivered"] += 1
+            except Exception:
+                self.stats["failed"] += 1
+                logger.exception("Event handler failed | subscriber=%s topic=%s", self.name, event.topic)
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def close(self, timeout=CLOSE_TIMEOUT_SECONDS):
+        """
+        Stops accepting events and lets the queued ones be delivered.
+
+        Args:
+            timeout (float): Longest wait for the delivery thread.
+
+        Returns:
+            None
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if threading.current_thread() is not self.thread:
+            self.thread.join(timeout)
+
+
+class EventBus:
+    def __init__(self, max_pending=DEFAULT_MAX_PENDING):
+        """
+        Initializes an in-process publish/subscribe bus.
+
+        Publishing is non-blocking by default: every matching subscriber gets
+        the event in its own bounded priority queue. When a queue is full, a
+        more important event evicts the least important queued one; otherwise
+        publish reports the rejection (or waits, if given a timeout).
+
+        Args:
+            max_pending (int): Default queue bound per subscriber.
+
+        Returns:
+            None
+        """
+        self.max_pending = max_pending
+        self.subscriptions = []
+        self.lock = threading.Lock()
+        self.sequence = itertools.count()
+        logger.debug("Event bus initialized")
+
+    def subscribe(self, pattern, handler, max_pending=None, name=None):
+        """
+        Registers a handler for a topic.
+
+        Args:
+            pattern (str): Exact topic, "prefix.*" or "*".
+            handler (callable): Called with each Event on the subscription's own thread.
+            max_pending (int | None): Queue bound, the bus default when None.
+            name (str | None): Name for logs and stats.
+
+        Returns:
+            Subscription: Handle for unsubscribe().
+        """
+        subscription = Subscription(pattern, handler, max_pending or self.max_pending, name)
+        with self.lock:
+            self.subscriptions.append(subscription)
+
+        logger.debug("Subscribed | subscriber=%s pattern=%s", subscription.name, pattern)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Removes a subscription after its queued events are delivered.
+
+        Args:
+            subscription (Subscription): Handle from subscribe().
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if subscription in self.subscriptions:
+                self.subscriptions.remove(subscription)
+        subscription.close()
+
+    def publish(self, topic, payload=None, priority=PRIORITY_NORMAL, key=None, timeout=0):
+        """
+        Delivers an event to every matching subscriber.
+
+        Args:
+            topic (str): Event topic.
+            payload (object): Event data.
+            priority (int): PRIORITY_* value.
+            key (str | None): Coalescing key, see Event.
+            timeout (float): Seconds to wait per full subscriber queue; 0 never blocks.
+
+        Returns:
+            bool: True if every matching subscriber accepted the event.
+        """
+        event = Event(topic, payload, priority, next(self.sequence), key)
+        with self.lock:
+            targets = [subscription for subscription in self.subscriptions if subscription.matches(topic)]
+
+        if not targets:
+            logger.debug("Event without subscribers | topic=%s", topic)
+            return True
+
+        # Offer to every target even after a rejection, so one full queue does not starve the rest
+        results = [subscription.offer(event, timeout) for subscription in targets]
+        return all(results)
+
+    def discard(self, topic, key):
+        """
+        Withdraws a keyed event that matching subscribers have not handled yet.
+
+        Args:
+            topic (str): Event topic.
+            key (str): Coalescing key of the event.
+
+        Returns:
+            int: Number of subscribers the event was dropped from.
+        """
+        with self.lock:
+            targets = [subscription for subscription in self.subscriptions if subscription.matches(topic)]
+        return sum(subscription.discard(key) for subscription in targets)
+
+    def drain(self, timeout=CLOSE_TIMEOUT_SECONDS):
+        """
+        Waits until every queued event has been handled.
+
+        Args:
+            timeout (float): Longest wait in seconds.
+
+        Returns:
+            bool: True if all queues emptied in time.
+        """
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+
+        for subscription in subscriptions:
+            with subscription.condition:
+                while subscription.heap or subscription.busy:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    subscription.condition.wait(remaining)
+        return True
+
+    def stats(self):
+        """
+        Returns delivery counters per subscriber.
+
+        Args:
+            None
+
+        Returns:
+            dict: Subscriber name to pending, delivered, dropped, coalesced and failed counts.
+        """
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        return {subscription.name: dict(subscription.stats, pending=subscription.pending()) for subscription in subscriptions}
+
+    def close(self, timeout=CLOSE_TIMEOUT_SECONDS):
+        """
+        Delivers what is queued, then stops every subscription.
+
+        Args:
+            timeout (float): Longest wait for queued events.
+
+        Returns:
+            None
+        """
+        self.drain(timeout)
+        with self.lock:
+            subscriptions, self.subscriptions = self.subscriptions, []
+        for subscription in subscriptions:
+            subscription.close(timeout)
+
+
+class ProgressReporter:
+    def __init__(self, bus, source):
+        """
+        Streams the progress of one long-running skill over the bus.
+
+        Progress updates are background events coalesced per source, so a
+        skill can report as often as it likes without flooding a slow
+        subscriber; the final result is announced at normal priority.
+
+        Args:
+            bus (EventBus): Bus to publish on.
+            source (str): Skill or task name, the coalescing key.
+
+        Returns:
+            None
+        """
+        self.bus = bus
+        self.source = source
+
+    def update(self, message, fraction=None, announce=False):
+        """
+        Publishes an intermediate progress state.
+
+        Args:
+            message (str): Short status text.
+            fraction (float | None): Completed fraction in [0, 1], if known.
+            announce (bool): Also speak the message, at background priority.
+
+        Returns:
+            bool: True if every subscriber accepted the update.
+        """
+        payload = {"source": self.source, "message": message, "fraction": fraction, "done": False}
+        accepted = self.bus.publish(TOPIC_PROGRESS, payload, PRIORITY_BACKGROUND, key=f"progress:{self.source}")
+        if announce:
+            accepted = self.bus.publish(TOPIC_ANNOUNCE, message, PRIORITY_BACKGROUND, key=f"announce:{self.source}") and accepted
+        return accepted
+
+    def finish(self, message=None):
+        """
+        Publishes the final state and announces the result.
+
+        Args:
+            message (str | None): Result text for the user, nothing is spoken when None.
+
+        Returns:
+            bool: True if every subscriber accepted the events.
+        """
+        payload = {"source": self.source, "message": message, "fraction": 1.0, "done": True}
+        accepted = self.bus.publish(TOPIC_PROGRESS, payload, PRIORITY_NORMAL, key=f"progress:{self.source}")
+
+        # The result replaces a progress announcement still queued, which would otherwise be spoken after it
+        key = f"announce:{self.source}"
+        if message:
+            accepted = self.bus.publish(TOPIC_ANNOUNCE, message, PRIORITY_NORMAL, key=key) and accepted
+        else:
+            self.bus.discard(TOPIC_ANNOUNCE, key)
+        return accepted
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from core.logger_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="Demonstrate ordering, coalescing and backpressure on the event bus.")
+    parser.add_argument("--events", type=int, default=200, help="Progress updates to publish")
+    parser.add_argument("--handler-ms", type=float, default=50, help="Simulated speech time per announcement")
+    parser.add_argument("--max-pending", type=int, default=8, help="Queue bound of the slow subscriber")
+    args = parser.parse_args()
+
+    setup_logging()
+    bus = EventBus()
+    delivered = []
+
+    def slow_speaker(event):
+        time.sleep(args.handler_ms / 1000)
+        delivered.append((event.priority, event.payload))
+
+    bus.subscribe(TOPIC_ANNOUNCE, slow_speaker, max_pending=args.max_pending, name="speaker")
+    bus.subscribe(TOPIC_PROGRESS, lambda event: delivered.append(("progress", event.payload["message"])), name="progress")
+
+    reporter = ProgressReporter(bus, "demo")
+    started = time.perf_counter()
+    rejected = 0
+    for index in range(args.events):
+        reporter.update(f"step {index + 1} of {args.events}", (index + 1) / args.events, announce=index % 10 == 0)
+        rejected += not bus.publish(TOPIC_ANNOUNCE, f"background {index}", PRIORITY_BACKGROUND)
+    bus.publish(TOPIC_ANNOUNCE, "Timer finished.", PRIORITY_URGENT)
+    reporter.finish("Demo finished.")
+    publish_ms = (time.perf_counter() - started) * 1000
+
+    bus.drain(timeout=30)
+    stats = bus.stats()
+    bus.close()
+
+    spoken = [payload for priority, payload in delivered if priority != "progress"]
+    print(f"Published {args.events * 2 + 2}+ events in {publish_ms:.1f} ms without blocking ({rejected} background events rejected)")
+    print(f"Spoken in order: {spoken[:3]} ... {spoken[-3:]}")
+    print(f"Progress updates delivered: {sum(1 for priority, _ in delivered if priority == 'progress')} of {args.events + 1}")
+    print(f"Stats: {stats}")
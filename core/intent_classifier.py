@@ -1,7 +1,18 @@
 import logging
-import json
 
 from core.llm_client import GeminiClient
+from core.json_extract import extract_json
+from core.local_classifier import classify_locally
+from core.intent_dataset import append_example
+from core.rate_limiter import UsageLedger
+
+try:
+    from core.vector_index import GROW_CONFIDENCE, IntentVectorIndex, parse_few_shot_examples
+    from core.distilled_classifier import DistilledClassifier
+except ImportError:
+    # NumPy is required for the nearest-neighbor and distilled tiers, every command goes to the LLM without it
+    IntentVectorIndex = None
+    DistilledClassifier = None
 
 logger = logging.getLogger(__name__)
 
@@ -21,40 +32,108 @@ ALLOWED_INTENTS = {
     "unknown"
 }
 
+# Upper bound on intents executed from a single compound command
+MAX_INTENTS_PER_COMMAND = 3
+
+# Probability the distilled model needs when it stands in for a failed LLM call
+OFFLINE_DISTILLED_CONFIDENCE = 0.5
+
+# Ask the provider for schema-constrained JSON instead of relying on the prompt alone
+USE_STRUCTURED_OUTPUT = False
+
+# Response schema (Gemini OpenAPI subset) used in structured output mode
+INTENT_ITEM_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "intent": {"type": "STRING", "enum": sorted(ALLOWED_INTENTS)},
+        "entities": {
+            "type": "OBJECT",
+            "properties": {
+                "info_type": {"type": "ARRAY", "items": {"type": "STRING", "enum": ["time", "date", "day"]}},
+                "location": {"type": "STRING"},
+                "query": {"type": "STRING"},
+                "resource": {"type": "STRING", "enum": ["battery", "cpu", "memory", "storage", "uptime"]},
+                "duration": {"type": "NUMBER"},
+                "at": {"type": "STRING"},
+                "every": {"type": "NUMBER"},
+                "label": {"type": "STRING"},
+                "type": {"type": "STRING", "enum": ["app", "url"]},
+                "name": {"type": "STRING"},
+                "executable": {"type": "STRING"},
+                "url": {"type": "STRING"},
+                "category": {"type": "STRING", "enum": ["neutral", "chuck", "all"]}
+            }
+        },
+        "confidence": {"type": "NUMBER"}
+    },
+    "required": ["intent", "entities", "confidence"]
+}
+
+RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "intents": {"type": "ARRAY", "items": INTENT_ITEM_SCHEMA}
+    },
+    "required": ["intents"]
+}
+
 class IntentEngine:
-    def __init__(self):
+    def __init__(self, structured_output=USE_STRUCTURED_OUTPUT, use_vector_index=True, settings=None, record=True):
         """
         Initializes the intent classification engine and LLM client.
 
         Args:
-            None
+            structured_output (bool): Request schema-constrained JSON from the provider.
+            use_vector_index (bool): Answer near-duplicate commands from the
+                                     embedding index before calling the LLM.
+            settings (SettingsStore | None): Settings source for the LLM client.
+            record (bool): Log classified commands to the intent dataset and grow
+                           the vector index; off for replays and evaluations.
 
         Returns:
             None
         """
-        self.llm = GeminiClient()
+        self.llm = GeminiClient(settings=settings)
+        self.response_schema = RESPONSE_SCHEMA if structured_output else None
+        self.usage = UsageLedger()
+        self.record = record
+        self.vector_index = None
+
+        # Trained offline from LLM labels with `python -m core.distilled_classifier train`
+        self.distilled = DistilledClassifier.load() if DistilledClassifier is not None else None
+
+        if use_vector_index and IntentVectorIndex is not None:
+            self.vector_index = IntentVectorIndex()
+
+            # The prompt's few-shot examples are the initial labeled utterances
+            self.vector_index.seed(parse_few_shot_examples(self.build_prompt("")), save=record)
+
         logger.debug("Intent Engine initialized")
 
-    def classify(self, user_command):
+    def build_prompt(self, user_command, context_block=""):
         """
-        Classifies a user command into a single intent with entities and confidence.
+        Builds the classification prompt for a user command.
 
         Args:
             user_command (str): Raw user input from speech or text.
+            context_block (str): Optional conversation context for follow-ups.
 
         Returns:
-            tuple: (intent, entities, confidence) after validation and normalization.
+            str: Prompt text sent to the LLM.
         """
 
         # Strict prompt to force deterministic intent + entity + confidence output from the LLM
-        prompt = f"""
+        return f"""
             You are a precise intent classification system.
             Your ONLY job is to classify user input into predefined categories.
 
             USER INPUT: "{user_command}"
+            {context_block}
 
             ===== INTENT DEFINITIONS =====
-            You must classify the input into EXACTLY ONE of these intents:
+            Each request in the input must be classified into EXACTLY ONE of these intents.
+            If the input combines several independent requests (e.g. "what's the time and the weather in Paris"),
+            classify each request separately (at most {MAX_INTENTS_PER_COMMAND}):
 
             1. "date_time" - User asks about current time, date, day, or calendar information
             
@@ -81,6 +160,7 @@ class IntentEngine:
 
             2. "joke" - User requests a joke or something funny
             Examples: "tell me a joke", "say something funny", "make me laugh"
+            Optional "category" entity: "chuck" for Chuck Norris jokes, "all" for any kind, otherwise omit it
 
             3. "location" - User asks about a place, address, or directions
             Examples: "where is Mumbai", "how do I get to the airport", "find nearest hospital"
@@ -130,19 +210,19 @@ class IntentEngine:
             "is my battery charging" → system_info with resource: battery
             "memory status" → system_info with resource: memory
 
-            10. "timer" - User wants to set a timer or countdown for a specific duration
+            10. "timer" - User wants to set a timer, countdown, alarm at a clock time, or recurring reminder
             
             Duration Conversion:
             - CRITICAL: ALWAYS convert time to SECONDS in the "duration" entity
             - Extract the numeric value and time unit, then convert to seconds
-            - Supported units: seconds, minutes, hours
-            - Maximum allowed: 3600 seconds (1 hour)
+            - Supported units: seconds, minutes, hours (fractions such as 1.5 seconds are allowed)
+            - Maximum allowed: 86400 seconds (24 hours)
             
             Conversion Rules:
             - Seconds → keep as is (e.g., 30 seconds = 30)
             - Minutes → multiply by 60 (e.g., 5 minutes = 300)
             - Hours → multiply by 3600 (e.g., 1 hour = 3600)
-            - Mixed units → convert each part and sum (e.g., 1 hour 30 minutes = 3600 + 1800 = 5400, but cap at 3600)
+            - Mixed units → convert each part and sum (e.g., 1 hour 30 minutes = 3600 + 1800 = 5400)
             
             Examples:
             "set a timer for 30 seconds" → timer with duration: 30
@@ -153,9 +233,10 @@ class IntentEngine:
             "set timer 10 minutes" → timer with duration: 600
             "remind me in 3 minutes" → timer with duration: 180
             "countdown 20 seconds" → timer with duration: 20
+            "wake me up at 7:30" → timer with at: "07:30"
+            "remind me every 20 minutes" → timer with every: 1200
             
-            If duration exceeds 3600 seconds, still classify as timer but keep duration at 3600 (max limit).
-            If no duration is specified, use confidence 0.6-0.7 and omit duration entity.
+            If no duration, time or interval is specified, use confidence 0.6-0.7 and omit those entities.
 
             11. "courtesy" - User expresses gratitude, thanks, or polite acknowledgment
             
@@ -244,16 +325,21 @@ class IntentEngine:
               "memory usage" → {{"resource": "memory"}}
 
             - FOR "timer" INTENT:
-              {{"duration": seconds_as_integer}}
+              {{"duration": seconds, "at": "HH:MM", "every": seconds, "label": "short_label"}}
+              
+              - "duration": countdown length in seconds (relative timers)
+              - "at": 24-hour clock time for alarms ("at 7:30 pm" → "19:30")
+              - "every": repeat interval in seconds for recurring reminders
+              - "label": what the timer is for, only if the user said it ("pasta timer" → "pasta")
               
               CRITICAL CONVERSION RULES:
-              - ALWAYS return duration in SECONDS as an integer
+              - ALWAYS return duration and every in SECONDS as a number
               - Extract the number and time unit from user input
               - Convert to seconds using these multipliers:
                 * seconds/sec/s → × 1
                 * minutes/mins/min/m → × 60
                 * hours/hrs/hr/h → × 3600
-              - Maximum value: 3600 (1 hour cap)
+              - Maximum value: 86400 (24 hours)
               - If multiple units mentioned, convert each and sum them
               
               Examples with MANDATORY conversions:
@@ -270,6 +356,9 @@ class IntentEngine:
               IMPORTANT: The LLM must do the math conversion itself!
               Do NOT return "5 minutes" or "2 mins" - convert to seconds: 300, 120
               
+              "alarm at 6 am" → {{"at": "06:00"}}
+              "every 20 minutes remind me to stretch" → {{"every": 1200, "label": "stretch"}}
+              
               If no duration specified, omit the duration entity entirely.
 
             - FOR "opening_app_or_url" INTENT:
@@ -303,7 +392,7 @@ class IntentEngine:
               - Browser/desktop software → app
               - Online services/social media → url
 
-            DO NOT extract entities for joke, courtesy, exit, or unknown intents.
+            DO NOT extract entities for courtesy, exit, or unknown intents (joke only takes the optional "category").
             DO NOT invent entities that aren't in the user input.
 
             ===== CONFIDENCE SCORING RULES =====
@@ -354,6 +443,14 @@ class IntentEngine:
             "confidence": 0.85
             }}
 
+            REQUIRED FORMAT FOR MULTIPLE INDEPENDENT REQUESTS (in the order they were spoken):
+            {{
+            "intents": [
+                {{"intent": "...", "entities": {{}}, "confidence": 0.9}},
+                {{"intent": "...", "entities": {{}}, "confidence": 0.9}}
+            ]
+            }}
+
             ===== STRICT RULES =====
             1. Intent MUST be one of: date_time, joke, location, news, weather, search, youtube, opening_app_or_url, system_info, timer, courtesy, exit, unknown
             2. DO NOT create new intent names
@@ -363,17 +460,18 @@ class IntentEngine:
             6. confidence MUST be a number between 0.0 and 1.0
             7. Output MUST be valid JSON that can be parsed
             8. DO NOT hallucinate entities that aren't in the user input
-            9. If unsure between two intents, pick the most likely one and lower confidence
+            9. If unsure between two intents for the same request, pick the most likely one and lower confidence
             10. Empty input = unknown intent with confidence 0.0
-            11. For opening_app_or_url: ALWAYS include "type" field (either "app" or "url")
+            11. For opening_app_or_url: ALWAYS include "type" field (either "app" or "url") and "name" as the plain app or site name the user said
             12. For opening_app_or_url with type "app": ALWAYS include "executable" field (short name, no .exe)
             13. For opening_app_or_url with type "url": ALWAYS include full "url" field with https://
             14. For system_info: ALWAYS include "resource" field (one of: battery, cpu, memory, storage, uptime)
-            15. For timer: ALWAYS include "duration" field as INTEGER in SECONDS (after conversion from minutes/hours)
+            15. For timer: include "duration" and/or "every" in SECONDS (after conversion from minutes/hours), or "at" as "HH:MM"
             16. For timer: YOU MUST do the math conversion (e.g., 5 minutes → 300, not "5 minutes")
             17. For courtesy: NO entities needed, just high confidence for clear expressions of thanks
             18. For date_time: ALWAYS include "info_type" field as an ARRAY of strings (["time"], ["date"], ["day"], or combinations)
             19. For date_time: Analyze the user's query carefully to extract ONLY what they're asking for
+            20. Use the "intents" list ONLY for clearly separate requests; "time and date" is ONE date_time request
 
             ===== EXAMPLES =====
             Input: "what's the weather in Mumbai"
@@ -382,6 +480,9 @@ class IntentEngine:
             Input: "tell me a joke"
             Output: {{"intent": "joke", "entities": {{}}, "confidence": 0.9}}
 
+            Input: "tell me a chuck norris joke"
+            Output: {{"intent": "joke", "entities": {{"category": "chuck"}}, "confidence": 0.93}}
+
             Input: "play despacito"
             Output: {{"intent": "youtube", "entities": {{"query": "despacito"}}, "confidence": 0.92}}
 
@@ -475,50 +576,146 @@ class IntentEngine:
             Input: ""
             Output: {{"intent": "unknown", "entities": {{}}, "confidence": 0.0}}
 
+            Input: "what's the time and the weather in Paris"
+            Output: {{"intents": [{{"intent": "date_time", "entities": {{"info_type": ["time"]}}, "confidence": 0.95}}, {{"intent": "weather", "entities": {{"location": "Paris"}}, "confidence": 0.95}}]}}
+
             Now classify this input: "{user_command}"
         """
+
+    def classify(self, user_command, context=None):
+        """
+        Classifies a user command into one or more intents with entities and confidence.
+
+        Args:
+            user_command (str): Raw user input from speech or text.
+            context (ConversationContext | None): Per-session memory used to
+                                                  resolve follow-up commands.
+
+        Returns:
+            list: (intent, entities, confidence) tuples in spoken order, after
+                  validation and normalization. Always contains at least one item.
+        """
+        context_block = ""
+        follow_up = context is not None and context.is_follow_up(user_command)
+
+        # Near-duplicates of known commands skip the LLM; follow-ups need the context it resolves
+        if self.vector_index is not None and not follow_up:
+            intent_result = self.vector_index.lookup(user_command)
+
+            if intent_result is not None:
+                logger.info("Intent classified from vector index | %s", intent_result)
+                if context is not None:
+                    context.add_turn(user_command, intent_result[0], intent_result[1])
+                return [intent_result]
+
+        # A confident distilled model answers on its own, shrinking LLM traffic as it improves
+        if self.distilled is not None and not follow_up:
+            intent_result = self.distilled.classify(user_command)
+
+            if intent_result is not None:
+                logger.info("Intent classified by distilled model | %s", intent_result)
+                if context is not None:
+                    context.add_turn(user_command, intent_result[0], intent_result[1])
+                return [intent_result]
+
+        # Only pay for extra prompt tokens when the command is a follow-up
+        if follow_up:
+            summary = context.summary()
+            if summary:
+                logger.debug("Follow-up detected, injecting context summary")
+                context_block = (
+                    "CONVERSATION CONTEXT (previous turns, oldest first):\n"
+                    f"{summary}\n"
+                    "The input is a follow-up: reuse the previous intent and entities, "
+                    "overriding only what the user changed.\n"
+                )
+
+        prompt = self.build_prompt(user_command, context_block)
+
         # Send the constructed prompt to the LLM for intent classification
-        raw_data = self.llm.generate(prompt)
+        usage = {}
+        raw_data = self.llm.generate(prompt, response_schema=self.response_schema, usage=usage)
 
-        # Treat missing or None LLM responses and fall back safely
+        # Missing, failed or throttled LLM responses degrade to the distilled model, then the local rules
         if not raw_data:
-            logger.warning("LLM response is missing or empty, falling back to default (unknown) intent result")
-            return "unknown", {}, 0.0
+            intent_result = None
+            if self.distilled is not None:
+                intent_result = self.distilled.classify(user_command, min_confidence=OFFLINE_DISTILLED_CONFIDENCE)
+            if intent_result is None:
+                intent_result = classify_locally(user_command)
+
+            if intent_result is None:
+                logger.warning("LLM response is missing or empty, falling back to default (unknown) intent result")
+                return [("unknown", {}, 0.0)]
+
+            logger.warning("LLM response is missing or empty, using local classification | %s", intent_result)
+            if context is not None:
+                context.add_turn(user_command, intent_result[0], intent_result[1])
+            return [intent_result]
         
-        raw_data = raw_data.strip()
-        if raw_data.startswith("```"):
-            lines = raw_data.splitlines()
+        # Locate the first balanced JSON value, ignoring fences and surrounding chatter
+        data = extract_json(raw_data)
 
-            # Drop opening fence (``` or ```json)
-            lines = lines[1:]
+        if data is None:
+            logger.warning("No JSON found in LLM output, falling back to default (unknown) intent result")
+            logger.debug("Raw LLM output: %s", raw_data)
+            return [("unknown", {}, 0.0)]
 
-            # Remove closing code fence if present
-            if lines and lines[-1].strip() == "```":
-                lines = lines[:-1]
+        logger.debug("Parsed LLM JSON output: %s", data)
 
-            raw_data = "\n".join(lines).strip()
+        # A compound command arrives as {"intents": [...]}, a simple one as a single object
+        if isinstance(data, dict) and isinstance(data.get("intents"), list):
+            items = data["intents"][:MAX_INTENTS_PER_COMMAND]
+        elif isinstance(data, list):
+            items = data[:MAX_INTENTS_PER_COMMAND]
+        else:
+            items = [data]
 
-        try:
-            # LLM output must be valid JSON to proceed
-            data = json.loads(raw_data.strip())
-            logger.debug("Parsed LLM JSON output: %s", data)
+        intent_results = []
+        for item in items:
+            intent_result = self._validate_result(item)
 
+            if intent_result is not None:
+                intent_results.append(intent_result)
 
-        except json.JSONDecodeError:
-            logger.warning("Invalid JSON from LLM, falling back to default (unknown) intent result")
-            logger.debug("Raw LLM output: %s", raw_data)
-            return "unknown", {}, 0.0
+        if not intent_results:
+            return [("unknown", {}, 0.0)]
 
-        except Exception:
-            # Any parsing failure is considered an unsafe response
-            logger.exception("Failed to parse LLM response, falling back to default (unknown) intent result")
-            logger.debug("Raw LLM output: %s", raw_data)
-            return "unknown", {}, 0.0
+        logger.info("Intent classified | %s", intent_results)
+
+        # Token cost is attributed to the (first) classified intent
+        if usage:
+            self.usage.record(intent_results[0][0], usage)
+
+        if context is not None:
+            for intent, entities, confidence in intent_results:
+                context.add_turn(user_command, intent, entities)
+
+        # Single-intent answers teach the local tiers; follow-ups depend on context and are not reusable
+        if self.record and not follow_up and len(intent_results) == 1:
+            intent, entities, confidence = intent_results[0]
+            append_example(user_command, intent, entities, confidence)
+
+            if self.vector_index is not None and intent != "unknown" and confidence >= GROW_CONFIDENCE:
+                self.vector_index.add(user_command, intent, entities)
+
+        return intent_results
+
+    def _validate_result(self, data):
+        """
+        Validates and normalizes a single intent object from the LLM output.
+
+        Args:
+            data (object): One decoded JSON value describing an intent.
+
+        Returns:
+            tuple | None: (intent, entities, confidence), or None if the item is invalid.
+        """
 
         # Non-dict responses are treated as invalid model behavior
         if not isinstance(data, dict):
-            logger.warning("LLM output is not a JSON object, falling back to default (unknown) intent result")
-            return "unknown", {}, 0.0
+            logger.warning("LLM output is not a JSON object, dropping intent item")
+            return None
         
         # Extract expected fields with defensive defaults
         intent = data.get("intent", "unknown")
@@ -527,8 +724,8 @@ class IntentEngine:
 
         # Enforce intent whitelist to prevent hallucinated labels
         if intent not in ALLOWED_INTENTS:
-            logger.warning("Intent is not matching any allowed intent, falling back to default (unknown) intent result")
-            return "unknown", {}, 0.0
+            logger.warning("Intent is not matching any allowed intent, dropping intent item | intent=%s", intent)
+            return None
 
         # Ensure entities is always a dictionary for downstream safety
         if not isinstance(entities, dict):
@@ -542,9 +739,7 @@ class IntentEngine:
             logger.debug("Invalid confidence value from LLM: %s", data.get("confidence"))
             confidence = 0.0
 
-        intent_result = intent, entities, confidence
-        logger.info("Intent classified | %s", intent_result)
-        return intent_result
+        return intent, entities, confidence
     
 
 if __name__ == "__main__":
@@ -554,4 +749,4 @@ if __name__ == "__main__":
     user_intent = IntentEngine()
 
     user_command = input("Enter the command: ")
-    intent_result = user_intent.classify(user_command)
+    intent_results = user_intent.classify(user_command)
@@ -0,0 +1,140 @@
+import ast
+import json
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Labeled utterances collected from live LLM classifications
+DATA_DIR = os.path.join("data")
+DATASET_FILE = os.path.join(DATA_DIR, "intent_dataset.jsonl")
+
+# LLM labels below this confidence are too noisy to learn from (unknown is always kept)
+MIN_LABEL_CONFIDENCE = 0.6
+
+RECOGNIZED_LINE = re.compile(r"\| Recognized command: (.+)$")
+CLASSIFIED_LINE = re.compile(r"\| Intent classified \| (\[.+\])$")
+
+_write_lock = threading.Lock()
+
+
+def append_example(utterance, intent, entities, confidence, path=DATASET_FILE):
+    """
+    Appends one LLM-labeled utterance to the training dataset.
+
+    Args:
+        utterance (str): Raw user command.
+        intent (str): Intent assigned by the LLM.
+        entities (dict): Entities extracted by the LLM.
+        confidence (float): Confidence reported by the LLM.
+        path (str): Dataset file path.
+
+    Returns:
+        None
+    """
+    record = {"utterance": utterance, "intent": intent, "entities": entities, "confidence": confidence}
+
+    try:
+        with _write_lock:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(record, separators=(",", ":")) + "\n")
+    except OSError:
+        logger.warning("Could not append to intent dataset %s", path)
+
+
+def parse_log(path):
+    """
+    Recovers labeled utterances from an application log file.
+
+    Pairs each "Recognized command" line with the "Intent classified" line that
+    follows it. Compound commands (several intents) are skipped.
+
+    Args:
+        path (str): Log file written by core.logger_config.
+
+    Returns:
+        list: Example dicts with utterance, intent, entities and confidence.
+    """
+    examples = []
+    utterance = None
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.rstrip("\n")
+
+            match = RECOGNIZED_LINE.search(line)
+            if match:
+                utterance = match.group(1).strip()
+                continue
+
+            match = CLASSIFIED_LINE.search(line)
+            if not match or utterance is None:
+                continue
+
+            try:
+                results = ast.literal_eval(match.group(1))
+            except (ValueError, SyntaxError):
+                continue
+
+            if len(results) == 1:
+                intent, entities, confidence = results[0]
+                examples.append({"utterance": utterance, "intent": intent, "entities": entities, "confidence": confidence})
+
+            utterance = None
+
+    return examples
+
+
+def load_dataset(path=DATASET_FILE, logs=()):
+    """
+    Loads the training dataset, merged with examples recovered from logs.
+
+    Utterances are normalized to lowercase and deduplicated, the most recent
+    label winning: mined log labels first, then the dataset in file order.
+    Low-confidence labels are dropped.
+
+    Args:
+        path (str): Dataset file path.
+        logs (iterable): Extra log files to mine with parse_log().
+
+    Returns:
+        list: Example dicts in first-seen order.
+    """
+    records = []
+
+    # Log-mined labels are the oldest source, so dataset entries added since override them
+    for log_path in logs:
+        records.extend(parse_log(log_path))
+
+    try:
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+
+    examples = {}
+    for record in records:
+        utterance = str(record.get("utterance", "")).strip().lower()
+        intent = record.get("intent")
+        confidence = float(record.get("confidence", 0.0))
+
+        if not utterance or not intent:
+            continue
+        if intent != "unknown" and confidence < MIN_LABEL_CONFIDENCE:
+            continue
+
+        examples[utterance] = {
+            "utterance": utterance,
+            "intent": intent,
+            "entities": record.get("entities") or {},
+            "confidence": confidence
+        }
+
+    return list(examples.values())
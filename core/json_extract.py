@@ -0,0 +1,170 @@
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Shared decoder, raw_decode parses in place starting at an index without slicing
+_decoder = json.JSONDecoder()
+
+# Openers followed by something that can continue a JSON object/array; stray braces
+# are skipped without a decode attempt (JSONDecodeError counts lines up to its position)
+OBJECT_START = re.compile(r'\{\s*["}]')
+ARRAY_START = re.compile(r'\[\s*[\[\]{"\-0-9tfn]')
+
+# Failed decodes tolerated per scan; each costs O(position), real answers need a handful
+MAX_FAILED_DECODES = 64
+
+
+def _is_object_list(value):
+    """
+    Tells whether a decoded value is a non-empty array of objects.
+
+    Args:
+        value (object): Decoded JSON value.
+
+    Returns:
+        bool: True for a list such as [{...}, {...}].
+    """
+    return isinstance(value, list) and bool(value) and all(isinstance(item, dict) for item in value)
+
+
+def _first_value(text, start_pattern, accept, limit=None):
+    """
+    Decodes the first accepted JSON value that starts at an opener character.
+
+    After a failed decode the scan resumes where the decoder gave up, and the
+    number of failed decodes is capped, so adversarial input such as thousands
+    of unclosed braces stays linear.
+
+    Args:
+        text (str): Raw LLM output.
+        start_pattern (re.Pattern): OBJECT_START or ARRAY_START.
+        accept (callable): Predicate the decoded value must satisfy.
+        limit (int | None): Values must start before this index; no limit when None.
+
+    Returns:
+        tuple: (value, start index) of the first accepted value, or (None, None).
+    """
+    match = start_pattern.search(text)
+    failures = 0
+
+    while match is not None and failures < MAX_FAILED_DECODES:
+        position = match.start()
+        if limit is not None and position >= limit:
+            break
+
+        try:
+            value, end = _decoder.raw_decode(text, position)
+        except json.JSONDecodeError as e:
+            # Not valid JSON at this opener, skip the span the decoder already rejected
+            end = max(e.pos, position + 1)
+            failures += 1
+        except RecursionError:
+            # Nesting deeper than the decoder supports is not an LLM answer
+            return None, None
+        else:
+            if accept(value):
+                return value, position
+
+        match = start_pattern.search(text, end)
+
+    return None, None
+
+
+def extract_json(text):
+    """
+    Finds and decodes the first complete top-level JSON value embedded in text.
+
+    Code fences, leading chatter and trailing explanations are skipped. An
+    array of objects (several intents) is returned when it starts before the
+    first object; any other array only when no object parses, so
+    "Step [1]: {...}" yields the object. The scan only moves an index over
+    the original string; nothing is split, joined or copied before decoding.
+
+    Args:
+        text (str): Raw LLM output.
+
+    Returns:
+        dict | list | None: Decoded JSON value, or None if there is none.
+    """
+    if not text:
+        return None
+
+    value, position = _first_value(text, OBJECT_START, lambda value: isinstance(value, dict))
+
+    # Only an array opening before the object is the top-level value, so the array scan stops there
+    array, _ = _first_value(text, ARRAY_START, _is_object_list, limit=position)
+    if array is not None:
+        return array
+
+    if value is None:
+        value, _ = _first_value(text, ARRAY_START, lambda value: isinstance(value, list))
+
+    return value
+
+
+def strip_code_fence(text):
+    """
+    Legacy extraction kept for comparison: strips a surrounding ``` fence.
+
+    Args:
+        text (str): Raw LLM output.
+
+    Returns:
+        object | None: Decoded JSON, or None if the remaining text is not pure JSON.
+    """
+    text = text.strip()
+    if text.startswith("```"):
+        lines = text.splitlines()[1:]
+        if lines and lines[-1].strip() == "```":
+            lines = lines[:-1]
+        text = "\n".join(lines).strip()
+
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return None
+
+
+def benchmark(samples, repeat=200):
+    """
+    Compares parse success rate and time per parse of the legacy and new extractors.
+
+    Args:
+        samples (list): Raw LLM output strings.
+        repeat (int): Timing repetitions over the whole corpus.
+
+    Returns:
+        dict: Per-extractor success rate and microseconds per parse.
+    """
+    import timeit
+
+    report = {}
+    for name, function in (("code_fence", strip_code_fence), ("extract_json", extract_json)):
+        parsed = sum(1 for sample in samples if isinstance(function(sample), (dict, list)))
+        seconds = timeit.timeit(lambda: [function(sample) for sample in samples], number=repeat)
+        report[name] = {
+            "success_rate": round(parsed / len(samples), 3),
+            "us_per_parse": round(seconds / (repeat * len(samples)) * 1e6, 2)
+        }
+
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    default_corpus = os.path.join("benchmarks", "llm_outputs.jsonl")
+
+    parser = argparse.ArgumentParser(description="Benchmark JSON extraction over captured LLM outputs.")
+    parser.add_argument("corpus", nargs="?", default=default_corpus, help="JSONL file with a \"raw\" field per line")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as file:
+        samples = [json.loads(line)["raw"] for line in file if line.strip()]
+
+    print(f"Samples: {len(samples)}")
+    for name, result in benchmark(samples).items():
+        print(f"{name}: {result}")
@@ -1,49 +1,124 @@
+import json
 import logging
-import os
 import requests
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+from core.rate_limiter import RateLimiter, PRIORITY_INTERACTIVE, estimate_prompt_tokens
+from core.single_flight import get_flight
+from core.settings import get_settings_store
 
 logger = logging.getLogger(__name__)
 
+# Delay applied after HTTP 429 when the provider sends no Retry-After header
+DEFAULT_RETRY_AFTER_SECONDS = 10
+
 class GeminiClient:
-    def __init__(self, model="gemini-2.5-flash", timeout=10):
+    def __init__(self, model=None, timeout=None, limiter=None, settings=None):
         """
         Initializes the Gemini LLM client with model and request settings.
 
         Args:
-            model (str): Gemini model identifier to use for generation.
-            timeout (int): HTTP timeout in seconds for API calls.
+            model (str | None): Gemini model identifier, defaults to the GEMINI_MODEL setting.
+            timeout (float | None): HTTP timeout in seconds, defaults to the LLM_TIMEOUT setting.
+            limiter (RateLimiter | None): Client-side request/token budget,
+                                          shared between clients of one key.
+            settings (SettingsStore | None): Settings source, read on every request
+                                             so key and model changes apply live.
 
         Returns:
             None
         """
-        self.api_key = os.getenv("GEMINI_API_KEY")
-        self.model = model
-        self.timeout = timeout
-        self.url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent"
-        
-        logger.debug(
-            "GeminiClient initialized | Model=%s Timeout=%s URL=%s",
-            self.model,
-            self.timeout,
-            self.url
-        )
-
-    def generate(self, prompt):
+        self.settings = settings or get_settings_store()
+        self.model_override = model
+        self.timeout_override = timeout
+        self.limiter = limiter or RateLimiter()
+        self.flight = get_flight("gemini")
+
+        logger.debug("GeminiClient initialized | Model=%s Timeout=%s", self.model, self.timeout)
+
+    @property
+    def model(self):
+        """
+        Returns the Gemini model in use.
+
+        Args:
+            None
+
+        Returns:
+            str: Explicit model, or the current GEMINI_MODEL setting.
+        """
+        return self.model_override or self.settings.current.gemini_model
+
+    @property
+    def timeout(self):
+        """
+        Returns the HTTP timeout in use.
+
+        Args:
+            None
+
+        Returns:
+            float: Explicit timeout, or the current LLM_TIMEOUT setting.
+        """
+        return self.timeout_override or self.settings.current.llm_timeout
+
+    @property
+    def url(self):
+        """
+        Returns the generateContent endpoint of the current model.
+
+        Args:
+            None
+
+        Returns:
+            str: Endpoint URL under the GEMINI_BASE_URL setting.
+        """
+        return f"{self.settings.current.gemini_base_url}/models/{self.model}:generateContent"
+
+    def generate(self, prompt, response_schema=None, priority=PRIORITY_INTERACTIVE, usage=None):
         """
         Sends a prompt to the Gemini API and returns generated text.
 
         Args:
             prompt (str): Prompt text to be sent to the LLM.
+            response_schema (dict | None): When set, enables JSON mode constrained
+                                           to this schema (structured output).
+            priority (int): Rate limiter priority, interactive turns go first.
+            usage (dict | None): Filled with the response usageMetadata when given.
+                                 Left empty when the call joined an identical
+                                 in-flight request, so tokens are counted once.
 
         Returns:
-            str | None: Generated text response, or None on failure.
+            str | None: Generated text response, or None on failure or local throttling.
         """
-        if not self.api_key:
-            logger.warning("GEMINI_API_KEY not found in environment variables")
+        api_key = self.settings.current.gemini_api_key
+        if not api_key:
+            logger.warning("GEMINI_API_KEY is not configured")
+            return None
+
+        # Identical concurrent prompts wait for one upstream request and share its text
+        schema_key = json.dumps(response_schema, sort_keys=True) if response_schema is not None else None
+        key = (self.model, prompt, schema_key)
+
+        return self.flight.do(key, self._request, api_key, prompt, response_schema, priority, usage)
+
+    def _request(self, api_key, prompt, response_schema, priority, usage):
+        """
+        Performs a single rate-limited generateContent request.
+
+        Args:
+            api_key (str): Gemini API key.
+            prompt (str): Prompt text to be sent to the LLM.
+            response_schema (dict | None): Structured output schema, if any.
+            priority (int): Rate limiter priority.
+            usage (dict | None): Filled with the response usageMetadata when given.
+
+        Returns:
+            str | None: Generated text response, or None on failure or local throttling.
+        """
+
+        # Queue briefly for budget, callers degrade gracefully when this fails
+        estimated_tokens = estimate_prompt_tokens(prompt)
+        if not self.limiter.acquire(estimated_tokens, priority):
             return None
         
         headers = {
@@ -51,7 +126,7 @@ class GeminiClient:
         }
 
         params = {
-            "key": self.api_key
+            "key": api_key
         }
 
         payload = {
@@ -62,6 +137,13 @@ class GeminiClient:
             }]
         }
 
+        # Structured output makes the model emit bare JSON matching the schema
+        if response_schema is not None:
+            payload["generationConfig"] = {
+                "responseMimeType": "application/json",
+                "responseSchema": response_schema
+            }
+
         try:
             response = requests.post(
                 self.url,
@@ -82,6 +164,15 @@ class GeminiClient:
                 response.status_code,
             )
 
+            # Provider-side throttling pauses every queued request, not just this one
+            if response.status_code == 429:
+                retry_after = response.headers.get("Retry-After")
+                try:
+                    retry_after = float(retry_after)
+                except (TypeError, ValueError):
+                    retry_after = DEFAULT_RETRY_AFTER_SECONDS
+                self.limiter.backoff(retry_after)
+
             # Raises exception for non-2xx responses
             response.raise_for_status()
 
@@ -89,6 +180,13 @@ class GeminiClient:
             data = response.json()
             logger.debug("Parsed JSON response from Gemini: %s", data)
 
+            # Replace the estimate with the real token usage
+            usage_metadata = data.get("usageMetadata", {})
+            if usage_metadata:
+                self.limiter.record_usage(estimated_tokens, usage_metadata.get("totalTokenCount", estimated_tokens))
+                if usage is not None:
+                    usage.update(usage_metadata)
+
             # Safely extract nested text without assuming response shape
             result = data.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
             logger.debug("Gemini generated text: %s", result)
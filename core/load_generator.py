@@ -0,0 +1,409 @@
+import json
+import logging
+import os
+import queue
+import random
+import tempfile
+import threading
+import time
+
+from core.context import ConversationContext
+from core.rate_limiter import RateLimiter, TOKENS_PER_MINUTE
+from core.single_flight import flight_stats
+from core.stand_ins import StandInServer, UpstreamProfile, UPSTREAMS, DISTRIBUTIONS, load_profiles
+
+logger = logging.getLogger(__name__)
+
+# Weighted utterance mix, one {"text", "weight"} object per line
+DEFAULT_CORPUS = os.path.join("benchmarks", "load_utterances.jsonl")
+
+# Offered load steps in turns per second
+DEFAULT_RATES = (1, 2, 5, 10, 20, 50)
+
+# A step is saturated when it completes less than this fraction of the offered rate
+SATURATION_THROUGHPUT = 0.9
+
+# ... or when its 95th percentile response latency exceeds the SLO
+DEFAULT_SLO_MS = 1500
+
+# Longest wait for queued turns to finish after a step stops offering load
+DRAIN_TIMEOUT_SECONDS = 60
+
+# Settings used for the run, so no real keys or endpoints are involved
+STAND_IN_SETTINGS = {
+    "GEMINI_API_KEY": "stand-in",
+    "WEATHER_API_KEY": "stand-in",
+    "NEWS_API_KEY": "stand-in",
+    "HOME_LOCATION": "",
+    "ASSISTLY_CAPTURE": "false",
+    "ASSISTLY_LOCALE": "en"
+}
+
+# Skill responses that mean an upstream or skill failed (the run pins the English locale)
+FAILURE_PREFIXES = ("Could not", "Something went wrong", "That is taking too long")
+
+
+def load_corpus(path=DEFAULT_CORPUS):
+    """
+    Reads the weighted utterance mix.
+
+    Args:
+        path (str): JSON Lines file with "text" and optional "weight" fields.
+
+    Returns:
+        tuple: (texts, weights) lists of equal length.
+    """
+    texts, weights = [], []
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            texts.append(record["text"])
+            weights.append(float(record.get("weight", 1)))
+
+    return texts, weights
+
+
+def percentile(values, fraction):
+    """
+    Returns a nearest-rank percentile.
+
+    Args:
+        values (list): Sorted values.
+        fraction (float): Percentile as a fraction, e.g. 0.95.
+
+    Returns:
+        float | None: Percentile value, or None for no values.
+    """
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class LoadSession:
+    def __init__(self, session_id, engine, router):
+        """
+        Simulates one user: turns are handled in arrival order with private conversation memory.
+
+        Args:
+            session_id (int): Session number.
+            engine (IntentEngine): Shared intent engine.
+            router (Router): Shared router.
+
+        Returns:
+            None
+        """
+        self.session_id = session_id
+        self.engine = engine
+        self.router = router
+        self.context = ConversationContext()
+        self.inbox = queue.SimpleQueue()
+        self.results = []
+        self.thread = threading.Thread(target=self._run, daemon=True, name=f"LoadSession-{session_id}")
+        self.thread.start()
+
+    def submit(self, arrival, text):
+        """
+        Queues a turn for this session.
+
+        Args:
+            arrival (float): perf_counter time the user spoke.
+            text (str): Utterance.
+
+        Returns:
+            None
+        """
+        self.inbox.put((arrival, text))
+
+    def close(self):
+        """
+        Stops the session thread once its queued turns are done.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.inbox.put(None)
+        self.thread.join()
+
+    def _run(self):
+        """
+        Handles queued turns until closed.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        while True:
+            item = self.inbox.get()
+            if item is None:
+                return
+
+            arrival, text = item
+            started = time.perf_counter()
+            failed = False
+
+            try:
+                intent_results = self.engine.classify(text, self.context)
+                response = self.router.define_routes(intent_results)
+                if isinstance(response, list):
+                    response = ". ".join(str(headline) for headline in response)
+                failed = isinstance(response, str) and response.startswith(FAILURE_PREFIXES)
+            except Exception:
+                logger.exception("Turn raised | session=%s text=%r", self.session_id, text)
+                failed = True
+
+            finished = time.perf_counter()
+            # list.append is atomic, the driver only reads after the step has drained
+            self.results.append((arrival, started, finished, failed))
+
+
+def run_step(sessions, rate, duration, texts, weights, rng):
+    """
+    Offers open-loop Poisson load at one rate and measures the outcome.
+
+    Arrivals do not wait for earlier turns, so an overloaded core shows up as
+    growing latency and falling throughput rather than a slower generator.
+
+    Args:
+        sessions (list): LoadSession objects; each arrival goes to a random one.
+        rate (float): Offered turns per second across all sessions.
+        duration (float): Seconds of offered load.
+        texts (list): Corpus utterances.
+        weights (list): Corpus weights.
+        rng (random.Random): Arrival and utterance sampler.
+
+    Returns:
+        dict: Offered and achieved rates, latency percentiles in ms and failure count.
+    """
+    for session in sessions:
+        session.results.clear()
+
+    start = time.perf_counter()
+    offset = rng.expovariate(rate)
+    offered = 0
+
+    while offset < duration:
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        rng.choice(sessions).submit(start + offset, rng.choices(texts, weights)[0])
+        offered += 1
+        offset += rng.expovariate(rate)
+
+    deadline = time.perf_counter() + DRAIN_TIMEOUT_SECONDS
+    while sum(len(session.results) for session in sessions) < offered and time.perf_counter() < deadline:
+        time.sleep(0.05)
+
+    results = [result for session in sessions for result in session.results]
+    latencies = sorted((finished - arrival) * 1000 for arrival, _, finished, _ in results)
+    service = sorted((finished - started) * 1000 for _, started, finished, _ in results)
+    elapsed = max((finished for _, _, finished, _ in results), default=start + duration) - start
+
+    return {
+        "offered_rate": rate,
+        "offered": offered,
+        "duration": duration,
+        "completed": len(results),
+        "failed": sum(1 for result in results if result[3]),
+        "throughput": round(len(results) / max(elapsed, duration), 2),
+        "p50_ms": round(percentile(latencies, 0.50) or 0, 1),
+        "p95_ms": round(percentile(latencies, 0.95) or 0, 1),
+        "p99_ms": round(percentile(latencies, 0.99) or 0, 1),
+        "service_p50_ms": round(percentile(service, 0.50) or 0, 1),
+        "service_p95_ms": round(percentile(service, 0.95) or 0, 1)
+    }
+
+
+def find_saturation(steps, slo_ms=DEFAULT_SLO_MS):
+    """
+    Returns the first step where the core stops keeping up.
+
+    Args:
+        steps (list): run_step results in increasing rate order.
+        slo_ms (float): p95 response latency objective.
+
+    Returns:
+        dict | None: First saturated step with a "reason", or None if none saturated.
+    """
+    for step in steps:
+        # Compared with the arrivals actually generated, not the nominal rate, so Poisson noise is not saturation
+        if step["completed"] < step["offered"] or step["throughput"] < SATURATION_THROUGHPUT * step["offered"] / step["duration"]:
+            return {**step, "reason": "throughput"}
+        if step["p95_ms"] > slo_ms:
+            return {**step, "reason": "latency"}
+    return None
+
+
+def run_load(rates=DEFAULT_RATES, session_count=8, duration=10.0, corpus=DEFAULT_CORPUS,
+             profiles=None, slo_ms=DEFAULT_SLO_MS, llm_rpm=6000, local_tiers=True, seed=None):
+    """
+    Runs a rate sweep against the shared IntentEngine and Router backed by stand-in upstreams.
+
+    The run works in a temporary directory with stand-in keys and base URLs,
+    so it never touches real APIs or the assistant's data files.
+
+    Args:
+        rates (tuple): Offered turns per second, one step each.
+        session_count (int): Concurrent simulated users.
+        duration (float): Seconds of load per step.
+        corpus (str): Weighted utterance corpus.
+        profiles (dict | None): Upstream name to UpstreamProfile for the stand-ins.
+        slo_ms (float): p95 response latency objective for the saturation point.
+        llm_rpm (int): Client-side Gemini request budget for the run.
+        local_tiers (bool): Keep the vector index and distilled model in front of the LLM.
+        seed (int | None): Seed for arrivals, utterances and injected faults.
+
+    Returns:
+        dict: Report with per-step results, saturation point and shared-component stats.
+    """
+    from core.intent_classifier import IntentEngine
+    from core.router import Router
+
+    texts, weights = load_corpus(corpus)
+    rng = random.Random(seed)
+    server = StandInServer(profiles, seed=seed).start()
+
+    previous_cwd = os.getcwd()
+    previous_env = {name: os.environ.get(name) for name in {**STAND_IN_SETTINGS, **server.base_urls()}}
+    os.environ.update({**STAND_IN_SETTINGS, **server.base_urls()})
+
+    with tempfile.TemporaryDirectory(prefix="assistly-load-") as workdir:
+        os.chdir(workdir)
+        try:
+            engine = IntentEngine(use_vector_index=local_tiers)
+            if not local_tiers:
+                engine.distilled = None
+            # Token budget scales with the request budget, keeping the free tier's ratio
+            engine.llm.limiter = RateLimiter(llm_rpm, TOKENS_PER_MINUTE * max(1, llm_rpm // 10))
+            router = Router(isolate_skills=False)
+
+            sessions = [LoadSession(session_id, engine, router) for session_id in range(session_count)]
+            steps = []
+
+            for rate in rates:
+                step = run_step(sessions, rate, duration, texts, weights, rng)
+                steps.append(step)
+                logger.info("Load step done | %s", step)
+
+            for session in sessions:
+                session.close()
+            router.close()
+
+            return {
+                "sessions": session_count,
+                "duration": duration,
+                "slo_ms": slo_ms,
+                "local_tiers": local_tiers,
+                "steps": steps,
+                "saturation": find_saturation(steps, slo_ms),
+                "single_flight": flight_stats(),
+                "limiter": dict(engine.llm.limiter.stats),
+                "upstreams": server.stats()
+            }
+        finally:
+            os.chdir(previous_cwd)
+            for name, value in previous_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            server.stop()
+
+
+def format_report(report):
+    """
+    Renders a load report as a throughput-vs-latency table.
+
+    Args:
+        report (dict): run_load result.
+
+    Returns:
+        str: Multi-line text report.
+    """
+    lines = [
+        f"Sessions={report['sessions']} step={report['duration']}s SLO p95={report['slo_ms']}ms local_tiers={report['local_tiers']}",
+        f"{'offered/s':>10} {'achieved/s':>11} {'done':>6} {'failed':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'svc p95':>8}"
+    ]
+
+    for step in report["steps"]:
+        lines.append(
+            f"{step['offered_rate']:>10} {step['throughput']:>11} {step['completed']:>6} {step['failed']:>7} "
+            f"{step['p50_ms']:>8} {step['p95_ms']:>8} {step['p99_ms']:>8} {step['service_p95_ms']:>8}"
+        )
+
+    saturation = report["saturation"]
+    if saturation is None:
+        lines.append("Saturation: not reached in this sweep")
+    else:
+        lines.append(f"Saturation: {saturation['offered_rate']} turns/s ({saturation['reason']})")
+
+    lines.append(f"Single-flight: {report['single_flight']}")
+    lines.append(f"LLM limiter: {report['limiter']}")
+    lines.append(f"Upstream requests: {report['upstreams']}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sweep offered load over concurrent text sessions against stand-in upstreams.")
+    parser.add_argument("--rates", default=",".join(str(rate) for rate in DEFAULT_RATES), help="Comma-separated turns per second")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per rate")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Weighted utterance corpus (JSON Lines)")
+    parser.add_argument("--slo-ms", type=float, default=DEFAULT_SLO_MS, help="p95 latency objective")
+    parser.add_argument("--llm-rpm", type=int, default=6000, help="Client-side Gemini requests per minute")
+    parser.add_argument("--no-local-tiers", action="store_true", help="Send every command to the (stand-in) LLM")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for repeatable runs")
+    parser.add_argument("--profiles", help="JSON scenario file with per-upstream profiles (overrides the flags below)")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="normal", help="Latency distribution for every upstream")
+    for upstream in UPSTREAMS:
+        parser.add_argument(f"--{upstream}-latency", type=float, default=0.0, help=f"Mean {upstream} latency in ms")
+        parser.add_argument(f"--{upstream}-jitter", type=float, default=0.0, help=f"{upstream} latency spread in ms")
+        parser.add_argument(f"--{upstream}-errors", type=float, default=0.0, help=f"Fraction of {upstream} requests failing with HTTP 500")
+        parser.add_argument(f"--{upstream}-throttle", type=float, default=0.0, help=f"Fraction of {upstream} requests answered with HTTP 429")
+        parser.add_argument(f"--{upstream}-malformed", type=float, default=0.0, help=f"Fraction of {upstream} responses with a broken body")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s | %(name)s | %(message)s")
+
+    profiles = {
+        upstream: UpstreamProfile(
+            getattr(args, f"{upstream}_latency"),
+            getattr(args, f"{upstream}_jitter"),
+            getattr(args, f"{upstream}_errors"),
+            distribution=args.distribution,
+            throttle_rate=getattr(args, f"{upstream}_throttle"),
+            malformed_rate=getattr(args, f"{upstream}_malformed")
+        )
+        for upstream in UPSTREAMS
+    }
+    if args.profiles:
+        profiles.update(load_profiles(args.profiles))
+
+    report = run_load(
+        rates=[float(rate) for rate in args.rates.split(",")],
+        session_count=args.sessions,
+        duration=args.duration,
+        corpus=os.path.abspath(args.corpus),
+        profiles=profiles,
+        slo_ms=args.slo_ms,
+        llm_rpm=args.llm_rpm,
+        local_tiers=not args.no_local_tiers,
+        seed=args.seed
+    )
+
+    print(format_report(report))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
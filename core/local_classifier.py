@@ -0,0 +1,134 @@
+import logging
+import re
+
+from core.app_index import get_app_index, normalize_name
+
+logger = logging.getLogger(__name__)
+
+# Confidence reported for rule matches, just above the router threshold
+RULE_CONFIDENCE = 0.75
+
+# Spoken words that make an "open ..." command a website, and names that look like a domain
+WEBSITE_WORDS = re.compile(r"\s+(?:web ?site|site|web ?page|page)$")
+DOMAIN_NAME = re.compile(r"^[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{2,}$")
+
+
+def open_entities(match):
+    """
+    Builds app or URL entities for an "open ..." command, if the type is certain.
+
+    Bookmarks, domain-like names and names followed by "website" or "site" are
+    URLs; installed applications are apps. Anything else is left to the LLM,
+    which knows which names are sites.
+
+    Args:
+        match (re.Match): Match of the opening_app_or_url rule.
+
+    Returns:
+        dict | None: Entities, or None to defer the command.
+    """
+    target = match.group(1).strip()
+    website = WEBSITE_WORDS.search(target) is not None
+    name = WEBSITE_WORDS.sub("", target).strip()
+    index = get_app_index()
+
+    bookmark = index.resolve(name, "url")
+    if bookmark is not None and bookmark["type"] == "url":
+        return {"type": "url", "name": name, "url": bookmark["url"]}
+
+    domain = name.replace(" ", "")
+    if DOMAIN_NAME.match(domain):
+        return {"type": "url", "name": name, "url": f"https://{domain}"}
+
+    if website:
+        return {"type": "url", "name": name, "url": f"https://www.{normalize_name(name)}.com"}
+
+    if index.resolve(name, "app") is not None:
+        return {"type": "app", "name": name, "executable": name}
+
+    return None
+
+
+# Ordered (intent, pattern, entity builder) rules for short, unambiguous commands;
+# a builder returning None means the rule cannot decide and the command is deferred
+RULES = [
+    ("exit", re.compile(r"^(?:exit|quit|stop|goodbye|bye|go to sleep|shut ?down)$"), None),
+    ("courtesy", re.compile(r"^(?:thanks?(?: you)?(?: so much| a lot)?|cheers|appreciate it)$"), None),
+    ("joke", re.compile(r"\b(?:joke|make me laugh|something funny)\b"), None),
+    ("news", re.compile(r"\b(?:news|headlines)\b"), None),
+    ("timer", re.compile(r"\btimer\b.*?\b(\d+(?:\.\d+)?)\s*(second|sec|minute|min|hour|hr)s?\b"),
+        lambda match: {"duration": f"{match.group(1)} {match.group(2)}"}),
+    ("weather", re.compile(r"\b(?:weather|temperature|forecast)\b(?:.*?\bin ([a-z][a-z .'-]+?))?\s*\??$"),
+        lambda match: {"location": match.group(1).strip().title()} if match.group(1) else {}),
+    ("system_info", re.compile(r"\b(battery|cpu|processor|ram|memory|disk|storage|uptime)\b"),
+        lambda match: {"resource": match.group(1)}),
+    ("date_time", re.compile(r"\bwhat(?:'s| is)? the (time|date|day)\b|\bwhat (time|day) is it\b"),
+        lambda match: {"info_type": [match.group(1) or match.group(2)]}),
+    ("youtube", re.compile(r"^play (.+?)(?: on youtube)?$"),
+        lambda match: {"query": match.group(1)}),
+    ("search", re.compile(r"^(?:search(?: for)?|google|look up) (.+)$"),
+        lambda match: {"query": match.group(1)}),
+    ("opening_app_or_url", re.compile(r"^(?:open|launch|start) (.+)$"), open_entities),
+    ("location", re.compile(r"\bwhere am i\b|\bmy location\b"), None)
+]
+
+
+def classify_locally(command):
+    """
+    Classifies simple commands with regular expression rules, without the LLM.
+
+    Used whenever the LLM is unavailable or throttled, so common commands keep
+    working instead of failing with "unknown".
+
+    Args:
+        command (str): Raw user command.
+
+    Returns:
+        tuple | None: (intent, entities, confidence), or None if no rule matched.
+    """
+    command = command.strip().lower()
+
+    for intent, pattern, build_entities in RULES:
+        match = pattern.search(command)
+        if match is None:
+            continue
+
+        entities = build_entities(match) if build_entities else {}
+        if entities is None:
+            continue
+
+        logger.debug("Local rule matched | intent=%s", intent)
+        return intent, entities, RULE_CONFIDENCE
+
+    return None
+
+
+def extract_entities(intent, command):
+    """
+    Extracts entities for an already known intent using that intent's rule.
+
+    Args:
+        intent (str): Intent predicted by another classifier.
+        command (str): Raw user command.
+
+    Returns:
+        dict | None: Entities (possibly empty), or None if the intent's rule does not
+                     match or cannot decide.
+    """
+    command = command.strip().lower()
+
+    for rule_intent, pattern, build_entities in RULES:
+        if rule_intent != intent:
+            continue
+
+        match = pattern.search(command)
+        if match is not None:
+            return build_entities(match) if build_entities else {}
+
+    return None
+
+
+if __name__ == "__main__":
+    while True:
+        command = input("Enter the command (Ctrl+C to exit): ")
+        print(classify_locally(command))
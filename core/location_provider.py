@@ -0,0 +1,323 @@
+import ipaddress
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+import requests
+
+from core.mmdb import MMDBReader, InvalidDatabaseError
+from core.single_flight import get_flight
+from core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Offline GeoIP database (e.g. GeoLite2-City.mmdb) and last network result
+DATA_DIR = os.path.join("data")
+GEOIP_DATABASE = os.path.join(DATA_DIR, "GeoLite2-City.mmdb")
+CACHE_FILE = os.path.join(DATA_DIR, "location_cache.json")
+
+# Network results are trusted this long before ipinfo.io is asked again
+CACHE_TTL_SECONDS = 6 * 3600
+
+# Resolved locations are reused in memory for this long
+MEMORY_TTL_SECONDS = 600
+
+NETWORK_TIMEOUT_SECONDS = 10
+
+
+class Location:
+    # Slotted, shared by weather and any other location-aware skill
+    __slots__ = ("city", "region", "country", "latitude", "longitude", "source")
+
+    def __init__(self, city, region=None, country=None, latitude=None, longitude=None, source=None):
+        """
+        Stores a resolved location.
+
+        Args:
+            city (str): City name.
+            region (str | None): Region or state.
+            country (str | None): Country name or code.
+            latitude (float | None): Latitude in degrees.
+            longitude (float | None): Longitude in degrees.
+            source (str | None): Provider that produced it ("home", "geoip", "cache", "network").
+
+        Returns:
+            None
+        """
+        self.city = city
+        self.region = region
+        self.country = country
+        self.latitude = latitude
+        self.longitude = longitude
+        self.source = source
+
+    def __repr__(self):
+        return f"Location({self.city!r}, source={self.source!r})"
+
+
+def local_public_ip():
+    """
+    Returns this machine's outbound address if it is publicly routable.
+
+    Connecting a UDP socket sends no packets; it only selects the interface.
+
+    Args:
+        None
+
+    Returns:
+        str | None: Global IP address, or None behind NAT or offline.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+            probe.connect(("192.0.2.1", 80))
+            ip = probe.getsockname()[0]
+    except OSError:
+        return None
+
+    return ip if ipaddress.ip_address(ip).is_global else None
+
+
+class LocationProvider:
+    def __init__(self, home_location=None, geoip_database=GEOIP_DATABASE, cache_file=CACHE_FILE, public_ip=None):
+        """
+        Initializes the location chain: configured home, offline GeoIP, then network.
+
+        Args:
+            home_location (str | None): Explicit city, defaults to the HOME_LOCATION setting.
+            geoip_database (str): MaxMind-format .mmdb file, skipped when missing.
+            cache_file (str): Where the last network result (and public IP) is kept.
+            public_ip (str | None): Address to look up offline, defaults to the
+                                    PUBLIC_IP setting, then the last network result.
+
+        Returns:
+            None
+        """
+        self.home_location = home_location
+        self.cache_file = cache_file
+        self.public_ip = public_ip
+        self.flight = get_flight("location")
+        self.lock = threading.Lock()
+        self.current = None
+        self.current_expires = 0.0
+
+        self.reader = None
+        try:
+            self.reader = MMDBReader(geoip_database)
+            logger.debug("GeoIP database loaded | %s", self.reader.metadata.get("database_type"))
+        except FileNotFoundError:
+            pass
+        except (OSError, InvalidDatabaseError):
+            logger.warning("Could not open GeoIP database %s", geoip_database)
+
+        logger.debug("LocationProvider initialized | geoip=%s", self.reader is not None)
+
+    def _load_cache(self):
+        """
+        Reads the last network result.
+
+        Args:
+            None
+
+        Returns:
+            dict: Cached record, empty if none.
+        """
+        try:
+            with open(self.cache_file, encoding="utf-8") as file:
+                record = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        return record if isinstance(record, dict) else {}
+
+    def _save_cache(self, record):
+        """
+        Persists a network result.
+
+        Args:
+            record (dict): ipinfo.io response plus a "time" field.
+
+        Returns:
+            None
+        """
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            with open(self.cache_file, "w", encoding="utf-8") as file:
+                json.dump(record, file)
+        except OSError:
+            logger.warning("Could not write location cache %s", self.cache_file)
+
+    def from_geoip(self):
+        """
+        Resolves the location offline from the GeoIP database.
+
+        Args:
+            None
+
+        Returns:
+            Location | None: Location, or None without a database, known IP or match.
+        """
+        if self.reader is None:
+            return None
+
+        # A stale cached address may belong to another network, so it is refreshed through the network provider
+        cached = self._load_cache()
+        cached_ip = cached.get("ip") if time.time() - cached.get("time", 0) <= CACHE_TTL_SECONDS else None
+
+        ip = self.public_ip or get_settings().public_ip or cached_ip or local_public_ip()
+        if not ip:
+            return None
+
+        try:
+            record = self.reader.get(ip)
+        except (ValueError, InvalidDatabaseError):
+            return None
+
+        city = ((record or {}).get("city") or {}).get("names", {}).get("en")
+        if not city:
+            return None
+
+        coordinates = record.get("location", {})
+        return Location(
+            city,
+            region=((record.get("subdivisions") or [{}])[0]).get("names", {}).get("en"),
+            country=record.get("country", {}).get("iso_code"),
+            latitude=coordinates.get("latitude"),
+            longitude=coordinates.get("longitude"),
+            source="geoip"
+        )
+
+    def _fetch_network(self):
+        """
+        Requests the location from ipinfo.io and caches it.
+
+        Args:
+            None
+
+        Returns:
+            dict | None: ipinfo.io record, or None on failure.
+        """
+        url = f"{get_settings().ipinfo_base_url}/json"
+
+        try:
+            response = requests.get(url, timeout=NETWORK_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            data = response.json()
+        except Exception:
+            logger.warning("Could not fetch location from %s", url)
+            return None
+
+        if not isinstance(data, dict) or not data.get("city"):
+            return None
+
+        data["time"] = time.time()
+        self._save_cache(data)
+        return data
+
+    def from_network(self):
+        """
+        Resolves the location from a fresh cache entry or, failing that, ipinfo.io.
+
+        A stale cache entry is still used when the network request fails.
+
+        Args:
+            None
+
+        Returns:
+            Location | None: Location, or None if nothing is known.
+        """
+        cached = self._load_cache()
+        source = "cache"
+
+        if not cached.get("city") or time.time() - cached.get("time", 0) > CACHE_TTL_SECONDS:
+            # Concurrent misses share a single request
+            fetched = self.flight.do("ipinfo", self._fetch_network)
+            if fetched:
+                cached, source = fetched, "network"
+
+        if not cached.get("city"):
+            return None
+
+        # ipinfo may send "loc": null or a malformed value, the city is still usable without coordinates
+        latitude = longitude = None
+        loc = cached.get("loc")
+        if isinstance(loc, str) and "," in loc:
+            try:
+                latitude, longitude = (float(part) for part in loc.split(",", 1))
+            except ValueError:
+                logger.debug("Ignoring malformed coordinates | loc=%s", loc)
+
+        return Location(cached["city"], cached.get("region"), cached.get("country"), latitude, longitude, source)
+
+    def resolve(self):
+        """
+        Returns the current location from the first provider that knows it.
+
+        Args:
+            None
+
+        Returns:
+            Location | None: Resolved location, or None if every provider failed.
+        """
+        # Read on every call so a reloaded HOME_LOCATION applies immediately
+        home_location = self.home_location or get_settings().home_location
+        if home_location:
+            return Location(home_location, source="home")
+
+        now = time.monotonic()
+        with self.lock:
+            if self.current is not None and now < self.current_expires:
+                return self.current
+
+        location = self.from_geoip() or self.from_network()
+
+        if location is not None:
+            with self.lock:
+                self.current = location
+                self.current_expires = now + MEMORY_TTL_SECONDS
+            logger.debug("Location resolved | %s", location)
+
+        return location
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_location_provider():
+    """
+    Returns the process-wide location provider, creating it on first use.
+
+    Args:
+        None
+
+    Returns:
+        LocationProvider: Shared provider.
+    """
+    global _provider
+
+    with _provider_lock:
+        if _provider is None:
+            _provider = LocationProvider()
+        return _provider
+
+
+if __name__ == "__main__":
+    import timeit
+
+    provider = get_location_provider()
+
+    started = time.perf_counter()
+    location = provider.resolve()
+    print(f"First lookup: {location} in {(time.perf_counter() - started) * 1000:.2f} ms")
+
+    runs = 100000
+    seconds = timeit.timeit(provider.resolve, number=runs)
+    print(f"Warm lookup: {seconds / runs * 1e6:.2f} us")
+
+    if provider.reader is not None and (provider.public_ip or provider._load_cache().get("ip")):
+        ip = provider.public_ip or provider._load_cache()["ip"]
+        seconds = timeit.timeit(lambda: provider.reader.get(ip), number=10000)
+        print(f"GeoIP lookup: {seconds / 10000 * 1e6:.2f} us")
@@ -0,0 +1,249 @@
+import ipaddress
+import mmap
+import struct
+
+# Marks the start of the metadata section at the end of every .mmdb file
+METADATA_MARKER = b"\xab\xcd\xefMaxMind.com"
+
+# The 16 zero bytes between the search tree and the data section
+DATA_SECTION_SEPARATOR = 16
+
+# Decoder type numbers from the MaxMind DB format specification
+TYPE_EXTENDED = 0
+TYPE_POINTER = 1
+TYPE_STRING = 2
+TYPE_DOUBLE = 3
+TYPE_BYTES = 4
+TYPE_UINT16 = 5
+TYPE_UINT32 = 6
+TYPE_MAP = 7
+TYPE_INT32 = 8
+TYPE_UINT64 = 9
+TYPE_UINT128 = 10
+TYPE_ARRAY = 11
+TYPE_BOOLEAN = 14
+TYPE_FLOAT = 15
+
+
+class InvalidDatabaseError(ValueError):
+    pass
+
+
+class Decoder:
+    def __init__(self, buffer, pointer_base):
+        """
+        Initializes a decoder for the MaxMind DB data section format.
+
+        Args:
+            buffer (bytes | mmap.mmap): Database contents.
+            pointer_base (int): Offset that pointers are relative to.
+
+        Returns:
+            None
+        """
+        self.buffer = buffer
+        self.pointer_base = pointer_base
+
+    def _size(self, size, offset):
+        """
+        Resolves the extended payload size encoding.
+
+        Args:
+            size (int): Size bits from the control byte.
+            offset (int): Offset just after the control (and type) bytes.
+
+        Returns:
+            tuple: (size, new_offset)
+        """
+        if size < 29:
+            return size, offset
+        if size == 29:
+            return 29 + self.buffer[offset], offset + 1
+        if size == 30:
+            return 285 + int.from_bytes(self.buffer[offset:offset + 2], "big"), offset + 2
+        return 65821 + int.from_bytes(self.buffer[offset:offset + 3], "big"), offset + 3
+
+    def decode(self, offset):
+        """
+        Decodes one value.
+
+        Args:
+            offset (int): Absolute offset of the value's control byte.
+
+        Returns:
+            tuple: (value, offset just past the value)
+        """
+        buffer = self.buffer
+        control = buffer[offset]
+        offset += 1
+        kind = control >> 5
+
+        if kind == TYPE_POINTER:
+            size = (control >> 3) & 0x3
+            value = control & 0x7
+            if size == 0:
+                pointer = (value << 8) | buffer[offset]
+            elif size == 1:
+                pointer = ((value << 16) | int.from_bytes(buffer[offset:offset + 2], "big")) + 2048
+            elif size == 2:
+                pointer = ((value << 24) | int.from_bytes(buffer[offset:offset + 3], "big")) + 526336
+            else:
+                pointer = int.from_bytes(buffer[offset:offset + 4], "big")
+
+            # Pointers are followed for the value but decoding continues after the pointer itself
+            decoded, _ = self.decode(self.pointer_base + pointer)
+            return decoded, offset + size + 1
+
+        if kind == TYPE_EXTENDED:
+            kind = 7 + buffer[offset]
+            offset += 1
+
+        size, offset = self._size(control & 0x1F, offset)
+
+        if kind == TYPE_STRING:
+            return bytes(buffer[offset:offset + size]).decode("utf-8"), offset + size
+        if kind == TYPE_MAP:
+            result = {}
+            for _ in range(size):
+                key, offset = self.decode(offset)
+                result[key], offset = self.decode(offset)
+            return result, offset
+        if kind == TYPE_ARRAY:
+            result = []
+            for _ in range(size):
+                item, offset = self.decode(offset)
+                result.append(item)
+            return result, offset
+        if kind in (TYPE_UINT16, TYPE_UINT32, TYPE_UINT64, TYPE_UINT128):
+            return int.from_bytes(buffer[offset:offset + size], "big"), offset + size
+        if kind == TYPE_INT32:
+            return int.from_bytes(buffer[offset:offset + size].rjust(4, b"\x00"), "big", signed=True), offset + size
+        if kind == TYPE_DOUBLE:
+            return struct.unpack(">d", buffer[offset:offset + 8])[0], offset + 8
+        if kind == TYPE_FLOAT:
+            return struct.unpack(">f", buffer[offset:offset + 4])[0], offset + 4
+        if kind == TYPE_BOOLEAN:
+            return bool(size), offset
+        if kind == TYPE_BYTES:
+            return bytes(buffer[offset:offset + size]), offset + size
+
+        raise InvalidDatabaseError(f"Unsupported data type {kind} at offset {offset}")
+
+
+class MMDBReader:
+    def __init__(self, path):
+        """
+        Memory-maps a MaxMind DB (.mmdb) file such as GeoLite2-City.
+
+        Args:
+            path (str): Database file path.
+
+        Returns:
+            None
+
+        Raises:
+            OSError: If the file cannot be opened.
+            InvalidDatabaseError: If the file is not a MaxMind DB.
+        """
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        marker = self.buffer.rfind(METADATA_MARKER, max(0, len(self.buffer) - 128 * 1024))
+        if marker < 0:
+            self.buffer.close()
+            raise InvalidDatabaseError(f"{path} is not a MaxMind DB file")
+
+        metadata_start = marker + len(METADATA_MARKER)
+        self.metadata, _ = Decoder(self.buffer, metadata_start).decode(metadata_start)
+
+        self.node_count = self.metadata["node_count"]
+        self.record_size = self.metadata["record_size"]
+        self.ip_version = self.metadata["ip_version"]
+        self.node_bytes = self.record_size * 2 // 8
+        self.tree_size = self.node_count * self.node_bytes
+
+        if self.record_size not in (24, 28, 32):
+            raise InvalidDatabaseError(f"Unsupported record size {self.record_size}")
+
+        self.decoder = Decoder(self.buffer, self.tree_size + DATA_SECTION_SEPARATOR)
+
+        # IPv4 addresses live under ::/96 in IPv6 trees, walk those 96 zero bits once
+        self.ipv4_start = 0
+        if self.ip_version == 6:
+            node = 0
+            for _ in range(96):
+                if node >= self.node_count:
+                    break
+                node = self._read_node(node, 0)
+            self.ipv4_start = node
+
+    def _read_node(self, node, bit):
+        """
+        Reads the left (0) or right (1) record of a search tree node.
+
+        Args:
+            node (int): Node number.
+            bit (int): Address bit selecting the record.
+
+        Returns:
+            int: Record value (node number, data pointer, or node_count for "not found").
+        """
+        offset = node * self.node_bytes
+        buffer = self.buffer
+
+        if self.record_size == 24:
+            offset += bit * 3
+            return int.from_bytes(buffer[offset:offset + 3], "big")
+
+        if self.record_size == 28:
+            middle = buffer[offset + 3]
+            if bit:
+                return ((middle & 0x0F) << 24) | int.from_bytes(buffer[offset + 4:offset + 7], "big")
+            return ((middle & 0xF0) << 20) | int.from_bytes(buffer[offset:offset + 3], "big")
+
+        offset += bit * 4
+        return int.from_bytes(buffer[offset:offset + 4], "big")
+
+    def get(self, ip):
+        """
+        Looks up the record for an IP address.
+
+        Args:
+            ip (str): IPv4 or IPv6 address.
+
+        Returns:
+            dict | None: Decoded record, or None if the address is not in the database.
+        """
+        address = ipaddress.ip_address(ip)
+        packed = int.from_bytes(address.packed, "big")
+        bits = address.max_prefixlen
+
+        if address.version == 4 and self.ip_version == 6:
+            node = self.ipv4_start
+        elif address.version == 6 and self.ip_version == 4:
+            return None
+        else:
+            node = 0
+
+        for depth in range(bits):
+            if node >= self.node_count:
+                break
+            node = self._read_node(node, (packed >> (bits - 1 - depth)) & 1)
+
+        if node <= self.node_count:
+            return None
+
+        value, _ = self.decoder.decode(node - self.node_count + self.tree_size)
+        return value
+
+    def close(self):
+        """
+        Unmaps the database file.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.buffer.close()
@@ -0,0 +1,296 @@
+import logging
+import os
+import re
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Where collapsed stacks and memory diffs are written
+PROFILE_DIR = os.path.join("data", "profiles")
+
+# Default capture length and sampling period
+DEFAULT_DURATION_SECONDS = 30
+SAMPLE_INTERVAL_SECONDS = 0.01
+
+# Longest capture accepted from a voice command
+MAX_DURATION_SECONDS = 600
+
+# Frames kept per tracemalloc allocation and lines written to the memory report
+TRACEMALLOC_FRAMES = 10
+MEMORY_REPORT_LINES = 40
+
+# Spoken trigger, e.g. "debug profile" or "debug profile 60 seconds"
+PROFILE_COMMAND = re.compile(r"^debug profile(?: for)?(?: (\d+)(?: seconds?)?)?$")
+
+
+def parse_profile_command(command):
+    """
+    Recognizes the profiling command before it reaches intent classification.
+
+    Args:
+        command (str): Lowercased user command.
+
+    Returns:
+        int | None: Requested duration in seconds, or None if this is not the command.
+    """
+    match = PROFILE_COMMAND.match(command.strip())
+    if match is None:
+        return None
+    return min(int(match.group(1) or DEFAULT_DURATION_SECONDS), MAX_DURATION_SECONDS)
+
+
+def _frame_label(code):
+    """
+    Names a stack frame for collapsed-stack output.
+
+    Args:
+        code (types.CodeType): Frame code object.
+
+    Returns:
+        str: Label such as "classify (intent_classifier.py:582)", without semicolons.
+    """
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    def __init__(self, interval=SAMPLE_INTERVAL_SECONDS, output_dir=PROFILE_DIR):
+        """
+        Initializes an on-demand wall-clock sampling profiler for all Python threads.
+
+        Sampling reads sys._current_frames() from a background thread, so the
+        profiled threads run unmodified and nothing is paid while it is idle.
+        Skills isolated in worker processes are not covered.
+
+        Args:
+            interval (float): Seconds between samples.
+            output_dir (str): Directory for profile files.
+
+        Returns:
+            None
+        """
+        self.interval = interval
+        self.output_dir = output_dir
+        self.lock = threading.Lock()
+        self.thread = None
+        self.code_labels = {}
+
+    @property
+    def running(self):
+        """
+        Reports whether a capture is in progress.
+
+        Args:
+            None
+
+        Returns:
+            bool: True while sampling.
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, duration=DEFAULT_DURATION_SECONDS, memory=True):
+        """
+        Starts a capture in the background.
+
+        Args:
+            duration (float): Seconds to sample.
+            memory (bool): Also diff tracemalloc snapshots taken at start and end.
+
+        Returns:
+            bool: True if started, False if a capture is already running.
+        """
+        with self.lock:
+            if self.running:
+                logger.warning("Profiler already running, request ignored")
+                return False
+
+            self.thread = threading.Thread(target=self._capture, args=(duration, memory), daemon=True, name="Profiler")
+            self.thread.start()
+
+        logger.info("Profiling started | duration=%ss memory=%s", duration, memory)
+        return True
+
+    def _label(self, code):
+        """
+        Returns the cached label of a code object.
+
+        Args:
+            code (types.CodeType): Frame code object.
+
+        Returns:
+            str: Frame label.
+        """
+        label = self.code_labels.get(code)
+        if label is None:
+            label = self.code_labels[code] = _frame_label(code)
+        return label
+
+    def sample(self, stacks, skip_ident):
+        """
+        Adds one sample of every thread's stack.
+
+        Args:
+            stacks (Counter): Collapsed stack to sample count.
+            skip_ident (int): Thread to leave out (the sampler itself).
+
+        Returns:
+            None
+        """
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+        for ident, frame in sys._current_frames().items():
+            if ident == skip_ident:
+                continue
+
+            labels = []
+            while frame is not None:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+
+            labels.append(names.get(ident, f"thread-{ident}"))
+            stacks[";".join(reversed(labels))] += 1
+
+    def _capture(self, duration, memory):
+        """
+        Samples for the requested time and writes the profile files.
+
+        Args:
+            duration (float): Seconds to sample.
+            memory (bool): Diff tracemalloc snapshots.
+
+        Returns:
+            None
+        """
+        started_tracing = False
+        baseline = None
+
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                started_tracing = True
+            baseline = tracemalloc.take_snapshot()
+
+        stacks = Counter()
+        ident = threading.get_ident()
+        samples = 0
+        sampling_seconds = 0.0
+        started = time.perf_counter()
+        deadline = started + duration
+
+        while True:
+            tick = time.perf_counter()
+            if tick >= deadline:
+                break
+
+            self.sample(stacks, ident)
+            samples += 1
+            sampling_seconds += time.perf_counter() - tick
+
+            # Fixed period measured from the tick, so slow samples do not stretch it
+            time.sleep(max(0.0, self.interval - (time.perf_counter() - tick)))
+
+        elapsed = time.perf_counter() - started
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        stacks_path = os.path.join(self.output_dir, f"profile-{stamp}.collapsed")
+        with open(stacks_path, "w", encoding="utf-8") as file:
+            for stack, count in stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+        memory_path = None
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+
+            # The profiler's own bookkeeping is not growth of the assistant
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            differences = snapshot.filter_traces(filters).compare_to(baseline.filter_traces(filters), "lineno")
+
+            memory_path = os.path.join(self.output_dir, f"profile-{stamp}.memory.txt")
+            with open(memory_path, "w", encoding="utf-8") as file:
+                file.write(f"Memory growth over {elapsed:.1f} s, largest changes first\n")
+                for difference in differences[:MEMORY_REPORT_LINES]:
+                    file.write(f"{difference}\n")
+
+        logger.info(
+            "Profiling finished | samples=%s rate=%.0f/s overhead=%.2f%% stacks=%s memory=%s",
+            samples,
+            samples / elapsed if elapsed else 0,
+            sampling_seconds / elapsed * 100 if elapsed else 0,
+            stacks_path,
+            memory_path
+        )
+
+
+def install_signal_handler(profiler, signum=None, duration=DEFAULT_DURATION_SECONDS):
+    """
+    Starts a capture whenever the process receives a signal (SIGUSR1 by default).
+
+    Args:
+        profiler (SamplingProfiler): Profiler to start.
+        signum (int | None): Signal number, defaults to SIGUSR1.
+        duration (float): Capture length.
+
+    Returns:
+        bool: True if installed, False where the signal does not exist (Windows).
+    """
+    signum = signum if signum is not None else getattr(signal, "SIGUSR1", None)
+    if signum is None:
+        logger.debug("No SIGUSR1 on this platform, profiling is available through the voice command only")
+        return False
+
+    # Handlers run on the main thread between bytecodes; start() only spawns the sampler
+    signal.signal(signum, lambda received, frame: profiler.start(duration))
+    logger.debug("Profiler signal handler installed | signal=%s", signum)
+    return True
+
+
+def summarize(path, limit=20):
+    """
+    Aggregates a collapsed-stack file into self and total sample counts per frame.
+
+    Args:
+        path (str): .collapsed file.
+        limit (int): Frames listed.
+
+    Returns:
+        tuple: (total_samples, [(label, self_samples, total_samples), ...]) by self samples.
+    """
+    own, inclusive = Counter(), Counter()
+    total = 0
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if not stack:
+                continue
+
+            count = int(count)
+            frames = stack.split(";")
+            total += count
+            own[frames[-1]] += count
+            for label in set(frames):
+                inclusive[label] += count
+
+    return total, [(label, samples, inclusive[label]) for label, samples in own.most_common(limit)]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize a collapsed-stack profile written by the assistant.")
+    parser.add_argument("path", help=".collapsed file (also usable with flamegraph.pl or speedscope)")
+    parser.add_argument("--limit", type=int, default=20, help="Frames to list")
+    args = parser.parse_args()
+
+    total, rows = summarize(args.path, args.limit)
+    print(f"{total} samples")
+    print(f"{'self %':>7} {'total %':>8}  frame")
+    for label, own_samples, inclusive_samples in rows:
+        print(f"{own_samples / total * 100:7.1f} {inclusive_samples / total * 100:8.1f}  {label}")
@@ -0,0 +1,278 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+# Provider budgets (Gemini free tier defaults)
+REQUESTS_PER_MINUTE = 10
+TOKENS_PER_MINUTE = 250000
+
+# Lower value is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# How long a request may queue before it is degraded instead of sent
+MAX_WAIT_SECONDS = {
+    PRIORITY_INTERACTIVE: 2.0,
+    PRIORITY_BACKGROUND: 30.0
+}
+
+# Output tokens assumed for a request before the real usage is known
+EXPECTED_OUTPUT_TOKENS = 100
+
+
+def estimate_prompt_tokens(prompt):
+    """
+    Approximates the token cost of a prompt before it is sent.
+
+    Args:
+        prompt (str): Prompt text.
+
+    Returns:
+        int: Estimated prompt plus output tokens.
+    """
+    return len(prompt) // 4 + EXPECTED_OUTPUT_TOKENS
+
+
+class TokenBucket:
+    def __init__(self, capacity, refill_per_second):
+        """
+        Initializes a bucket that refills continuously up to its capacity.
+
+        Args:
+            capacity (float): Maximum stored units (the per-minute budget).
+            refill_per_second (float): Units added per second.
+
+        Returns:
+            None
+        """
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.level = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        """
+        Adds the units accrued since the last update.
+
+        Args:
+            now (float): Current monotonic time.
+
+        Returns:
+            None
+        """
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """
+        Returns how long until the bucket can cover an amount.
+
+        Args:
+            amount (float): Units needed.
+            now (float): Current monotonic time.
+
+        Returns:
+            float: Seconds to wait, 0 if available now.
+        """
+        self._refill(now)
+
+        # Requests larger than the whole budget are allowed once the bucket is full
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_per_second
+
+    def take(self, amount):
+        """
+        Removes units for a granted request.
+
+        Args:
+            amount (float): Units consumed.
+
+        Returns:
+            None
+        """
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount):
+        """
+        Corrects the level once the real cost of a request is known.
+
+        Args:
+            amount (float): Extra units consumed (negative to refund).
+
+        Returns:
+            None
+        """
+        self.level = min(self.capacity, self.level - amount)
+
+    def drain(self, now):
+        """
+        Empties the bucket so no request is granted until it refills.
+
+        Args:
+            now (float): Current monotonic time.
+
+        Returns:
+            None
+        """
+        self._refill(now)
+        self.level = min(self.level, 0.0)
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE):
+        """
+        Initializes client-side request and token budgets with priority queuing.
+
+        Args:
+            requests_per_minute (int): Request budget per minute.
+            tokens_per_minute (int): Token budget per minute.
+
+        Returns:
+            None
+        """
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.condition = threading.Condition()
+        self.waiters = []
+        self.sequence = itertools.count()
+        self.blocked_until = 0.0
+        self.stats = defaultdict(int)
+
+    def acquire(self, tokens, priority=PRIORITY_INTERACTIVE, timeout=None):
+        """
+        Waits until both budgets allow a request, serving higher priority first.
+
+        Args:
+            tokens (int): Estimated tokens the request will consume.
+            priority (int): PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND.
+            timeout (float | None): Maximum queueing time, defaults per priority.
+
+        Returns:
+            bool: True if the request may be sent, False if it was throttled.
+        """
+        if timeout is None:
+            timeout = MAX_WAIT_SECONDS.get(priority, MAX_WAIT_SECONDS[PRIORITY_BACKGROUND])
+
+        deadline = time.monotonic() + timeout
+        ticket = (priority, next(self.sequence))
+
+        with self.condition:
+            heapq.heappush(self.waiters, ticket)
+
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = deadline - now
+
+                    # Only the head of the queue may take budget, so interactive turns jump ahead
+                    if self.waiters[0] == ticket:
+                        head_wait = max(
+                            self.blocked_until - now,
+                            self.requests.wait_time(1, now),
+                            self.tokens.wait_time(tokens, now)
+                        )
+                        if head_wait <= 0:
+                            self.requests.take(1)
+                            self.tokens.take(tokens)
+                            self.stats["granted"] += 1
+                            return True
+                        wait = min(wait, head_wait)
+
+                    if now >= deadline:
+                        self.stats["throttled"] += 1
+                        logger.warning("LLM request throttled locally | priority=%s tokens=%s", priority, tokens)
+                        return False
+
+                    self.stats["queued"] += 1
+                    self.condition.wait(wait)
+
+            finally:
+                self.waiters.remove(ticket)
+                heapq.heapify(self.waiters)
+                self.condition.notify_all()
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """
+        Corrects the token budget with the real usage reported by the provider.
+
+        Args:
+            estimated_tokens (int): Tokens reserved in acquire().
+            actual_tokens (int): Tokens the provider actually billed.
+
+        Returns:
+            None
+        """
+        with self.condition:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+            self.condition.notify_all()
+
+    def backoff(self, seconds):
+        """
+        Pauses all requests after the provider itself throttled us (HTTP 429).
+
+        Args:
+            seconds (float): Retry-After delay requested by the provider.
+
+        Returns:
+            None
+        """
+        with self.condition:
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + seconds)
+            self.requests.drain(now)
+            self.stats["provider_throttled"] += 1
+
+        logger.warning("Provider throttled requests, backing off for %.1f seconds", seconds)
+
+
+class UsageLedger:
+    def __init__(self):
+        """
+        Initializes per-key accounting of LLM token usage.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.lock = threading.Lock()
+        self.totals = defaultdict(lambda: {"requests": 0, "prompt_tokens": 0, "output_tokens": 0, "total_tokens": 0})
+
+    def record(self, key, usage):
+        """
+        Adds one request's usageMetadata to a key (usually the classified intent).
+
+        Args:
+            key (str): Accounting key.
+            usage (dict): Gemini usageMetadata with token counts.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            entry = self.totals[key]
+            entry["requests"] += 1
+            entry["prompt_tokens"] += usage.get("promptTokenCount", 0)
+            entry["output_tokens"] += usage.get("candidatesTokenCount", 0)
+            entry["total_tokens"] += usage.get("totalTokenCount", 0)
+
+    def report(self):
+        """
+        Returns a snapshot of the accumulated usage.
+
+        Args:
+            None
+
+        Returns:
+            dict: Key to usage counters.
+        """
+        with self.lock:
+            return {key: dict(value) for key, value in self.totals.items()}
@@ -1,20 +1,63 @@
+import itertools
 import logging
+import time
+from collections import deque
+
 import speech_recognition
 
+from core.settings import get_settings_store
+from core.wake_word import open_microphone, split_frames, strip_wake_word
+
+try:
+    from core.audio_dsp import pcm_to_float, frame_rms
+    from core.endpointing import AdaptiveEndpointer
+    from core.stt_upload import prepare_audio, STT_SAMPLE_RATE
+except ImportError:
+    # NumPy is required for adaptive endpointing, compact uploads and noise suppression, the raw audio is used without it
+    AdaptiveEndpointer = None
+    prepare_audio = None
+
 logger = logging.getLogger(__name__)
 
+# Audio kept from before the first speech frame, so soft onsets are not clipped
+PRE_ROLL_SECONDS = 0.3
+
+# Trailing silence left on the captured audio after the endpoint
+TRAILING_KEEP_SECONDS = 0.2
+
+# Longest single utterance recorded by the adaptive listener
+MAX_PHRASE_SECONDS = 15
+
+# Silence after the wake word segment before the command is taken to be complete;
+# the user may pause after "computer" or have said the command in the same breath
+WAKE_FOLLOW_UP_SECONDS = 0.8
+
 class Recognizer:
-    def __init__(self):
+    def __init__(self, wake_gate=None, settings=None):
         """
         Initializes the speech recognition engine.
 
         Args:
-            None
+            wake_gate (WakeWordGate | None): Optional offline wake word front end.
+                                             When set, audio is only sent to full
+                                             STT after the wake word is heard.
+            settings (SettingsStore | None): Settings source for the STT endpoint,
+                                             endpointing mode, upload format and preprocessing.
 
         Returns:
             None
         """
         self.recognizer = speech_recognition.Recognizer()
+        self.wake_gate = wake_gate
+        self.settings = settings or get_settings_store()
+
+        # Audio and stage timings of the latest turn, kept for turn capture
+        self.last_audio = None
+        self.timings = {}
+
+        # The wake-gated microphone is calibrated once, not on every wake
+        self.calibrated = False
+
         logger.debug("Recognizer initialized")
 
     def recognize_command(self):
@@ -27,6 +70,13 @@ class Recognizer:
         Returns:
             str | None: Recognized command in lowercase, or None if recognition fails.
         """
+        self.last_audio = None
+        self.timings = {}
+        started = time.perf_counter()
+
+        # Stay in low-CPU wake word mode until the user addresses the assistant
+        if self.wake_gate is not None and self.wake_gate.enabled:
+            return self.recognize_after_wake_word(started)
 
         # Acquire microphone input as the audio source
         with speech_recognition.Microphone() as source:
@@ -37,12 +87,152 @@ class Recognizer:
             logger.debug("Ambience noise adjusted")
             
             # Listen for user's voice input
-            audio = self.recognizer.listen(source)
+            listen_started = time.perf_counter()
+            if AdaptiveEndpointer is not None and self.settings.current.endpointing == "adaptive":
+                audio = self.listen_adaptive(source)
+            else:
+                audio = self.recognizer.listen(source)
+            self.timings["listen_ms"] = round((time.perf_counter() - listen_started) * 1000, 1)
             logger.debug("Audio captured from microphone")
 
+        self.last_audio = audio
+        return self.transcribe(audio)
+
+    def recognize_after_wake_word(self, started):
+        """
+        Waits for the wake word and records the command on the same open microphone.
+
+        The segment that contained the wake word is kept, so a command said in
+        the same breath ("computer, what time is it") is not lost, and listening
+        starts without reopening the device or re-calibrating.
+
+        Args:
+            started (float): perf_counter() at the start of the turn.
+
+        Returns:
+            str | None: Recognized command without the wake word, or None.
+        """
+        with open_microphone() as source:
+            # Calibrated while idle, so the first wake does not pay for it either
+            if not self.calibrated:
+                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                self.calibrated = True
+                logger.debug("Ambience noise adjusted")
+
+            self.wake_gate.wait_for_wake_word(source)
+            self.timings["wake_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            # Also set when the detector failed mid-stream, then it is the start of the command
+            carry = split_frames(self.wake_gate.wake_audio)
+            logger.info("Listening...")
+
+            listen_started = time.perf_counter()
+            if AdaptiveEndpointer is not None and self.settings.current.endpointing == "adaptive":
+                audio = self.listen_adaptive(source, carry, WAKE_FOLLOW_UP_SECONDS if carry else 0.0)
+            else:
+                try:
+                    audio = self.recognizer.listen(source, timeout=WAKE_FOLLOW_UP_SECONDS if carry else None)
+                    data = audio.frame_data
+                except speech_recognition.WaitTimeoutError:
+                    # Nothing after the wake word, the command was in the same breath
+                    data = b""
+                audio = speech_recognition.AudioData(b"".join(carry) + data, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+            self.timings["listen_ms"] = round((time.perf_counter() - listen_started) * 1000, 1)
+
+        self.last_audio = audio
+        command = self.transcribe(audio)
+        if command and carry:
+            command = strip_wake_word(command, self.wake_gate.detector.wake_word) or None
+        return command
+
+    def listen_adaptive(self, source, carry=(), hold_seconds=0.0):
+        """
+        Records one utterance, ending it after an adaptive trailing silence.
+
+        Short commands are sent to STT after about 0.3 s of silence instead of
+        speech_recognition's fixed pause_threshold; longer or unfinished
+        sentences get a longer window (see core.endpointing).
+
+        Args:
+            source (speech_recognition.Microphone): Open audio source.
+            carry (list): Chunks already heard (the wake word segment), processed first.
+            hold_seconds (float): Silence after the carried audio that must pass
+                                  before the utterance may end.
+
+        Returns:
+            speech_recognition.AudioData: Captured utterance.
+        """
+        frame_seconds = source.CHUNK / source.SAMPLE_RATE
+        endpointer = AdaptiveEndpointer(self.recognizer.energy_threshold, frame_seconds, self.recognizer.pause_threshold)
+        pre_roll = deque(maxlen=max(1, int(PRE_ROLL_SECONDS / frame_seconds)))
+        frames = []
+
+        # No end is accepted before this many chunks, so a pause after the wake word is waited out
+        hold_until = len(carry) + int(hold_seconds / frame_seconds)
+        live = iter(lambda: source.stream.read(source.CHUNK), b"")
+
+        for index, chunk in enumerate(itertools.chain(carry, live), 1):
+            energy = frame_rms(pcm_to_float(chunk, source.SAMPLE_WIDTH), len(chunk) // source.SAMPLE_WIDTH)
+            ended = endpointer.update(energy[0] if len(energy) else 0.0) and index >= hold_until
+
+            # Before speech, or after a noise burst was discarded, only the pre-roll is kept
+            if not endpointer.started:
+                frames = []
+                pre_roll.append(chunk)
+                continue
+
+            if not frames:
+                frames.extend(pre_roll)
+            frames.append(chunk)
+
+            if ended or len(frames) * frame_seconds >= MAX_PHRASE_SECONDS:
+                break
+
+        # Drop most of the silence that was waited out, STT does not need it
+        keep = int(TRAILING_KEEP_SECONDS / frame_seconds)
+        surplus = max(0, endpointer.silence_frames - keep)
+        if surplus:
+            frames = frames[:-surplus]
+
+        self.timings["endpoint_ms"] = round(endpointer.trailing_silence_seconds * 1000, 1)
+        return speech_recognition.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+    def transcribe(self, audio):
+        """
+        Converts captured audio to text with the remote STT backend.
+
+        Args:
+            audio (speech_recognition.AudioData): Captured utterance.
+
+        Returns:
+            str | None: Recognized command in lowercase, or None if recognition fails.
+        """
+        started = time.perf_counter()
+
+        # Trimmed 16 kHz audio makes a much smaller FLAC upload than a 44.1/48 kHz capture
+        compact, enhance = self.settings.current.compact_upload, self.settings.current.noise_suppression
+        if prepare_audio is not None and (compact or enhance):
+            audio, upload = prepare_audio(
+                audio,
+                self.recognizer.energy_threshold,
+                target_rate=STT_SAMPLE_RATE if compact else audio.sample_rate,
+                trim=compact,
+                enhance=enhance
+            )
+            self.timings.update({"prep_ms": upload["prep_ms"], "raw_bytes": upload["raw_bytes"], "sent_bytes": upload["sent_bytes"]})
+            logger.debug(
+                "STT upload prepared | bytes=%s->%s seconds=%s->%s enhanced=%s prep_ms=%s",
+                upload["raw_bytes"],
+                upload["sent_bytes"],
+                upload["raw_seconds"],
+                upload["sent_seconds"],
+                enhance,
+                upload["prep_ms"]
+            )
+
         try:
             # Use Google's speech recognition backend for transcription
-            command = self.recognizer.recognize_google(audio)
+            endpoint = f"{self.settings.current.stt_base_url}/recognize"
+            command = self.recognizer.recognize_google(audio, endpoint=endpoint)
             command = command.lower()
             logger.info("Recognized command: %s", command)
 
@@ -52,12 +242,20 @@ class Recognizer:
             # Expected, common, non-fatal
             logger.warning("Speech could not be understood")
             return None
-        
+
+        except (speech_recognition.RequestError, ValueError) as e:
+            # Upstream unavailable, throttled, or answered with a body that is not valid JSON
+            logger.warning("STT request failed: %s", e)
+            return None
+
         except Exception:
             # Unexpected, real bug
             logger.exception("Unexpected error during speech recognition")
             return None
 
+        finally:
+            self.timings["stt_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
 
 if __name__ == "__main__":
     from core.logger_config import setup_logging
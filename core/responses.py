@@ -0,0 +1,459 @@
+import logging
+import string
+import time
+from functools import lru_cache
+
+from core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Message templates per locale; keys missing from a locale fall back to English
+TEMPLATES = {
+    "en": {
+        "format.time": "{hour12:02d}:{minute:02d} {period}",
+        "format.date": "{month_name} {day:02d}, {year}",
+        "format.day": "{weekday_name}",
+        "format.period_am": "AM",
+        "format.period_pm": "PM",
+        "format.and": "and",
+        "format.decimal": ".",
+
+        "courtesy.welcome": "You're welcome.",
+        "courtesy.no_problem": "No problem.",
+        "courtesy.anytime": "Anytime.",
+        "courtesy.all_good": "All good.",
+
+        "date_time.time": "The current time is {time}",
+        "date_time.date": "Today's date is {date}",
+        "date_time.day": "The day is {day}",
+        "date_time.unknown": "I couldn't determine what date/time information you need.",
+
+        "greet.morning": "Good Morning",
+        "greet.afternoon": "Good Afternoon",
+        "greet.evening": "Good Evening",
+
+        "joke.unknown_category": "I don't know jokes of that kind.",
+
+        "location.failed": "Could not fetch location data.",
+
+        "news.not_configured": "News is not configured.",
+        "news.failed": "Could not fetch news.",
+
+        "open_app.invalid": "Invalid Request.",
+        "open_app.no_executable": "No executable provided.",
+        "open_app.not_found": "Application '{executable}' is not installed or not found.",
+        "open_app.opening": "Opening {name}.",
+        "open_app.failed": "Failed to open application.",
+        "open_app.no_url": "No URL provided.",
+        "open_app.navigating": "Navigating to {name}.",
+
+        "profile.started": "Profiling for {seconds} seconds.",
+        "profile.running": "A profile is already running.",
+
+        "request.invalid": "Invalid request details.",
+
+        "router.fallback": "I'm not sure what you meant. Could you rephrase?",
+        "router.goodbye": "Goodbye",
+        "router.timeout": "That is taking too long, so I stopped it.",
+        "router.failed": "Something went wrong while doing that.",
+
+        "search.no_query": "No search query provided.",
+        "search.searching": "Searching \"{query}\" on Google",
+
+        "system_info.battery_charging": "Battery is {percent}% and currently charging.",
+        "system_info.battery": "Battery is {percent}%.",
+        "system_info.cpu": "Current CPU usage is {usage}%.",
+        "system_info.memory": "Out of {total} gigabytes, {available} gigabytes of RAM is currently free.",
+        "system_info.storage": "Drive C has {available} GB of free space out of a total {total} GB.",
+        "system_info.uptime_minutes": "The system has been running for {minutes} minutes.",
+        "system_info.uptime": "The system has been running for {hours} hours and {minutes} minutes.",
+        "system_info.battery_failed": "I could not access battery information.",
+        "system_info.battery_unavailable": "Battery information is unavailable.",
+        "system_info.cpu_failed": "I could not retrieve CPU usage.",
+        "system_info.memory_failed": "I could not retrieve memory information.",
+        "system_info.storage_unsupported": "Disk statistics is only supported on Windows.",
+        "system_info.storage_failed": "I could not access disk information.",
+        "system_info.uptime_failed": "I could not retrieve system uptime.",
+        "system_info.no_resource": "No resource was queried.",
+        "system_info.unsupported": "This system information is not supported yet.",
+
+        "timer.no_scheduler": "Scheduler must be provided when running timer.",
+        "timer.started": "Timer started for {duration}",
+        "timer.finished": "Timer finished.",
+        "timer.finished_label": "{label} timer finished.",
+        "timer.invalid_duration": "Invalid timer duration.",
+        "timer.too_long": "Sorry, I can only set timers up to 24 hours.",
+        "timer.invalid_alarm": "Invalid alarm time.",
+        "timer.alarm": "Alarm.",
+        "timer.alarm_set": "Alarm set for {time}",
+        "timer.alarm_set_repeating": "Alarm set for {time}, repeating every {interval}",
+        "timer.reminder": "Reminder.",
+        "timer.reminder_label": "Reminder: {label}.",
+        "timer.reminder_set": "Reminder set for every {interval}",
+
+        "unit.hour": "{count} hour",
+        "unit.hours": "{count} hours",
+        "unit.minute": "{count} minute",
+        "unit.minutes": "{count} minutes",
+        "unit.second": "{count} second",
+        "unit.seconds": "{count} seconds",
+
+        "weather.report": "Currently in {city}, it's {condition} with a temperature of {temperature} degrees Celsius and wind speed of {wind_speed} kilometers per hour.",
+        "weather.failed": "Could not fetch weather data.",
+        "weather.not_configured": "Weather is not configured.",
+        "weather.no_location": "Could not determine your location for weather report.",
+
+        "youtube.no_query": "No content specified for YouTube playback.",
+        "youtube.playing": "Playing \"{query}\" on YouTube"
+    },
+    "es": {
+        "format.time": "{hour:02d}:{minute:02d}",
+        "format.date": "{day} de {month_name} de {year}",
+        "format.and": "y",
+        "format.decimal": ",",
+
+        "courtesy.welcome": "De nada.",
+        "courtesy.no_problem": "No hay problema.",
+        "courtesy.anytime": "Cuando quieras.",
+        "courtesy.all_good": "Todo bien.",
+
+        "date_time.time": "La hora actual es {time}",
+        "date_time.date": "La fecha de hoy es {date}",
+        "date_time.day": "Hoy es {day}",
+        "date_time.unknown": "No pude determinar qué información de fecha u hora necesitas.",
+
+        "greet.morning": "Buenos días",
+        "greet.afternoon": "Buenas tardes",
+        "greet.evening": "Buenas noches",
+
+        "joke.unknown_category": "No conozco chistes de ese tipo.",
+
+        "location.failed": "No pude obtener los datos de ubicación.",
+
+        "news.not_configured": "Las noticias no están configuradas.",
+        "news.failed": "No pude obtener las noticias.",
+
+        "open_app.invalid": "Solicitud no válida.",
+        "open_app.no_executable": "No se indicó ningún ejecutable.",
+        "open_app.not_found": "La aplicación '{executable}' no está instalada o no se encontró.",
+        "open_app.opening": "Abriendo {name}.",
+        "open_app.failed": "No pude abrir la aplicación.",
+        "open_app.no_url": "No se indicó ninguna URL.",
+        "open_app.navigating": "Abriendo {name} en el navegador.",
+
+        "profile.started": "Perfilando durante {seconds} segundos.",
+        "profile.running": "Ya hay un perfil en ejecución.",
+
+        "request.invalid": "Los datos de la solicitud no son válidos.",
+
+        "router.fallback": "No estoy seguro de lo que quisiste decir. ¿Puedes decirlo de otra forma?",
+        "router.goodbye": "Adiós",
+        "router.timeout": "Eso está tardando demasiado, así que lo detuve.",
+        "router.failed": "Algo salió mal al hacer eso.",
+
+        "search.no_query": "No se indicó ninguna búsqueda.",
+        "search.searching": "Buscando \"{query}\" en Google",
+
+        "system_info.battery_charging": "La batería está al {percent}% y cargando.",
+        "system_info.battery": "La batería está al {percent}%.",
+        "system_info.cpu": "El uso actual de CPU es del {usage}%.",
+        "system_info.memory": "De {total} gigabytes, {available} gigabytes de RAM están libres.",
+        "system_info.storage": "La unidad C tiene {available} GB libres de un total de {total} GB.",
+        "system_info.uptime_minutes": "El sistema lleva {minutes} minutos encendido.",
+        "system_info.uptime": "El sistema lleva {hours} horas y {minutes} minutos encendido.",
+        "system_info.battery_failed": "No pude acceder a la información de la batería.",
+        "system_info.battery_unavailable": "La información de la batería no está disponible.",
+        "system_info.cpu_failed": "No pude obtener el uso de CPU.",
+        "system_info.memory_failed": "No pude obtener la información de la memoria.",
+        "system_info.storage_unsupported": "Las estadísticas de disco solo están disponibles en Windows.",
+        "system_info.storage_failed": "No pude acceder a la información del disco.",
+        "system_info.uptime_failed": "No pude obtener el tiempo de actividad del sistema.",
+        "system_info.no_resource": "No se indicó ningún recurso.",
+        "system_info.unsupported": "Esa información del sistema todavía no está disponible.",
+
+        "timer.no_scheduler": "Se necesita un planificador para usar el temporizador.",
+        "timer.started": "Temporizador iniciado para {duration}",
+        "timer.finished": "El temporizador ha terminado.",
+        "timer.finished_label": "El temporizador {label} ha terminado.",
+        "timer.invalid_duration": "La duración del temporizador no es válida.",
+        "timer.too_long": "Lo siento, solo puedo poner temporizadores de hasta 24 horas.",
+        "timer.invalid_alarm": "La hora de la alarma no es válida.",
+        "timer.alarm": "Alarma.",
+        "timer.alarm_set": "Alarma puesta para las {time}",
+        "timer.alarm_set_repeating": "Alarma puesta para las {time}, repitiéndose cada {interval}",
+        "timer.reminder": "Recordatorio.",
+        "timer.reminder_label": "Recordatorio: {label}.",
+        "timer.reminder_set": "Recordatorio programado cada {interval}",
+
+        "unit.hour": "{count} hora",
+        "unit.hours": "{count} horas",
+        "unit.minute": "{count} minuto",
+        "unit.minutes": "{count} minutos",
+        "unit.second": "{count} segundo",
+        "unit.seconds": "{count} segundos",
+
+        "weather.report": "Ahora mismo en {city}: {condition}, con una temperatura de {temperature} grados Celsius y viento de {wind_speed} kilómetros por hora.",
+        "weather.failed": "No pude obtener los datos del tiempo.",
+        "weather.not_configured": "El tiempo no está configurado.",
+        "weather.no_location": "No pude determinar tu ubicación para el informe del tiempo.",
+
+        "youtube.no_query": "No se indicó qué reproducir en YouTube.",
+        "youtube.playing": "Reproduciendo \"{query}\" en YouTube"
+    }
+}
+
+# Month and weekday names per locale, independent of the process C locale used by strftime
+MONTH_NAMES = {
+    "en": ("January", "February", "March", "April", "May", "June", "July",
+           "August", "September", "October", "November", "December"),
+    "es": ("enero", "febrero", "marzo", "abril", "mayo", "junio", "julio",
+           "agosto", "septiembre", "octubre", "noviembre", "diciembre")
+}
+
+WEEKDAY_NAMES = {
+    "en": ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"),
+    "es": ("lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo")
+}
+
+
+class ClockSnapshot:
+    # Slotted, one is taken per turn and shared by every skill in it
+    __slots__ = ("year", "month", "day", "weekday", "hour", "minute", "second")
+
+    def __init__(self, epoch=None):
+        """
+        Reads the local wall clock once.
+
+        Args:
+            epoch (float | None): Epoch seconds to snapshot, defaults to now.
+
+        Returns:
+            None
+        """
+        local = time.localtime(epoch)
+        self.year = local.tm_year
+        self.month = local.tm_mon
+        self.day = local.tm_mday
+        self.weekday = local.tm_wday
+        self.hour = local.tm_hour
+        self.minute = local.tm_min
+        self.second = local.tm_sec
+
+
+def compile_template(text):
+    """
+    Validates a template once and returns its bound formatter.
+
+    Args:
+        text (str): str.format template.
+
+    Returns:
+        callable: text.format, ready to call with keyword fields.
+
+    Raises:
+        ValueError: If the template has positional or malformed fields.
+    """
+    for _, field, _, _ in string.Formatter().parse(text):
+        if field is not None and (not field or field.isdigit()):
+            raise ValueError(f"Template fields must be named: {text!r}")
+    return text.format
+
+
+class Renderer:
+    def __init__(self, locale="en"):
+        """
+        Compiles the message templates of a locale.
+
+        Args:
+            locale (str): Language code such as "en" or "es".
+
+        Returns:
+            None
+        """
+        if locale not in TEMPLATES:
+            logger.warning("Unsupported locale %s, using English", locale)
+            locale = "en"
+
+        self.locale = locale
+        merged = {**TEMPLATES["en"], **TEMPLATES[locale]}
+        self.templates = {key: compile_template(text) for key, text in merged.items()}
+
+        self.month_names = MONTH_NAMES.get(locale, MONTH_NAMES["en"])
+        self.weekday_names = WEEKDAY_NAMES.get(locale, WEEKDAY_NAMES["en"])
+        self.period_am = merged["format.period_am"]
+        self.period_pm = merged["format.period_pm"]
+        self.conjunction = merged["format.and"]
+        self.decimal = merged["format.decimal"]
+
+        logger.debug("Renderer initialized | locale=%s templates=%s", locale, len(self.templates))
+
+    def render(self, key, **fields):
+        """
+        Renders a message template.
+
+        Args:
+            key (str): Template key such as "date_time.time".
+            **fields: Template fields.
+
+        Returns:
+            str: Rendered message.
+        """
+        return self.templates[key](**fields)
+
+    def time(self, clock):
+        """
+        Formats the time of day of a clock snapshot.
+
+        Args:
+            clock (ClockSnapshot): Snapshot of the current turn.
+
+        Returns:
+            str: Locale time such as "10:30 PM" or "22:30".
+        """
+        return self.templates["format.time"](
+            hour=clock.hour,
+            hour12=clock.hour % 12 or 12,
+            minute=clock.minute,
+            period=self.period_am if clock.hour < 12 else self.period_pm
+        )
+
+    def date(self, clock):
+        """
+        Formats the calendar date of a clock snapshot.
+
+        Args:
+            clock (ClockSnapshot): Snapshot of the current turn.
+
+        Returns:
+            str: Locale date such as "November 06, 2025".
+        """
+        return self.templates["format.date"](month_name=self.month_names[clock.month - 1], day=clock.day, year=clock.year)
+
+    def day(self, clock):
+        """
+        Formats the weekday of a clock snapshot.
+
+        Args:
+            clock (ClockSnapshot): Snapshot of the current turn.
+
+        Returns:
+            str: Locale weekday name.
+        """
+        return self.templates["format.day"](weekday_name=self.weekday_names[clock.weekday])
+
+    def number(self, value, digits=1):
+        """
+        Formats a number with the locale decimal separator.
+
+        Args:
+            value (float): Number to format.
+            digits (int): Decimal places.
+
+        Returns:
+            str: Formatted number.
+        """
+        text = f"{value:.{digits}f}"
+        return text.replace(".", self.decimal) if self.decimal != "." else text
+
+    def join(self, fragments):
+        """
+        Joins sentence fragments as "a, b and c".
+
+        Args:
+            fragments (list): Fragments in spoken order.
+
+        Returns:
+            str: Joined text, empty for no fragments.
+        """
+        if len(fragments) <= 1:
+            return "".join(fragments)
+        return f"{', '.join(fragments[:-1])} {self.conjunction} {fragments[-1]}"
+
+    def duration(self, seconds):
+        """
+        Renders a duration in seconds as short spoken text.
+
+        Args:
+            seconds (float): Duration in seconds.
+
+        Returns:
+            str: Text such as "1 hour 30 minutes" or "2.5 seconds".
+        """
+        if seconds < 60:
+            value = f"{seconds:g}"
+            return self.render("unit.second" if value == "1" else "unit.seconds", count=value.replace(".", self.decimal))
+
+        seconds = int(round(seconds))
+        parts = []
+        for unit, size in (("hour", 3600), ("minute", 60), ("second", 1)):
+            amount, seconds = divmod(seconds, size)
+            if amount:
+                parts.append(self.render(f"unit.{unit}" if amount == 1 else f"unit.{unit}s", count=amount))
+
+        return " ".join(parts)
+
+
+@lru_cache(maxsize=None)
+def _compiled_renderer(locale):
+    """
+    Returns the shared renderer of a locale, compiling it on first use.
+
+    Args:
+        locale (str): Language code.
+
+    Returns:
+        Renderer: Compiled renderer.
+    """
+    return Renderer(locale)
+
+
+def get_renderer(locale=None):
+    """
+    Returns the renderer of a locale.
+
+    Args:
+        locale (str | None): Language code, defaults to the ASSISTLY_LOCALE setting
+                             so a reloaded setting applies to the next response.
+
+    Returns:
+        Renderer: Compiled renderer.
+    """
+    return _compiled_renderer(locale or get_settings().locale)
+
+
+if __name__ == "__main__":
+    import timeit
+    from datetime import datetime
+
+    def legacy_date_time():
+        now = datetime.now()
+        return (now.strftime("%I:%M %p"), now.strftime("%B %d, %Y"), now.strftime("%A"))
+
+    def legacy_greet_hour():
+        current_time = datetime.now().strftime("%I:%M %p")
+        return datetime.strptime(current_time, "%I:%M %p").hour
+
+    renderer = get_renderer("en")
+
+    def rendered_date_time():
+        clock = ClockSnapshot()
+        return (renderer.time(clock), renderer.date(clock), renderer.day(clock))
+
+    def snapshot_greet_hour():
+        return ClockSnapshot().hour
+
+    assert rendered_date_time() == legacy_date_time(), "English output must match the strftime formats"
+
+    for label, function in (
+        ("legacy date_time (strftime x3)", legacy_date_time),
+        ("rendered date_time (snapshot)", rendered_date_time),
+        ("legacy greet hour (strftime + strptime)", legacy_greet_hour),
+        ("snapshot greet hour", snapshot_greet_hour)
+    ):
+        runs = 20000
+        seconds = timeit.timeit(function, number=runs)
+        print(f"{label:42} {seconds / runs * 1e6:6.2f} us")
+
+    for locale in TEMPLATES:
+        clock = ClockSnapshot()
+        print(locale, "|", get_renderer(locale).join([get_renderer(locale).time(clock), get_renderer(locale).date(clock)]))
@@ -1,15 +1,32 @@
 CONFIDENCE_THRESHOLD = 0.6
 
+# Worker threads used to run the skills of a compound command concurrently
+MAX_PARALLEL_SKILLS = 4
+
+# Skills that launch browsers/apps and may block or crash run in worker processes
+UNSAFE_SKILLS = {
+    "search": ("modules.search_google", "search_google"),
+    "youtube": ("modules.youtube_player", "youtube_player"),
+    "opening_app_or_url": ("modules.open_app_or_url", "open_app_or_url")
+}
+
+import importlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from core.entity_schema import SchemaRegistry, EntityValidationError
+from core.scheduler import Scheduler
+from core.event_bus import EventBus, ProgressReporter, TOPIC_ANNOUNCE, PRIORITY_NORMAL
+from core.calibration import load_thresholds
+from core.skill_pool import SkillPool, SkillTimeoutError, SkillCrashError
+from core.responses import ClockSnapshot, get_renderer
+from core.settings import get_settings_store
 
 from modules.date_and_time import get_date_time
 from modules.joke import get_joke
 from modules.location import get_location
 from modules.news import get_news
-from modules.search_google import search_google
 from modules.weather import get_weather
-from modules.youtube_player import youtube_player
-from modules.open_app_or_url import open_app_or_url
 from modules.system_info import handle_system_info
 from modules.timer import run_timer
 from modules.courtesy_handler import handle_courtesy
@@ -17,51 +34,216 @@ from modules.courtesy_handler import handle_courtesy
 logger = logging.getLogger(__name__)
 
 class Router:
-    def __init__(self, speaker=None):
+    def __init__(self, speaker=None, isolate_skills=True, settings=None, bus=None):
         """
         Initializes the router with optional speaker dependency.
 
         Args:
             speaker (object | None): Text-to-speech handler used by modules
                                      that require asynchronous feedback.
+            isolate_skills (bool): Run UNSAFE_SKILLS in a pre-started process pool.
+            settings (SettingsStore | None): Settings source; skills receive the
+                                             snapshot current at routing time.
+            bus (EventBus | None): Bus for asynchronous skill notifications. Without
+                                   one, a private bus announces through the speaker.
 
         Returns:
             None
         """
-        self.fallback = "I'm not sure what you meant. Could you rephrase?"
         self.speaker = speaker
+
+        # Set once an exit intent is routed, so the caller stops in any locale
+        self.exit_requested = False
+        self.settings = settings or get_settings_store()
+        self.schemas = SchemaRegistry()
+
+        # Per-intent thresholds learned offline, CONFIDENCE_THRESHOLD covers the rest
+        self.thresholds = load_thresholds()
+
+        self.owns_bus = bus is None
+        self.bus = bus or EventBus()
+        if self.owns_bus and speaker is not None:
+            self.bus.subscribe(TOPIC_ANNOUNCE, lambda event: speaker.speak(event.payload), name="speaker")
+
+        # Timers and alarms are announced on the bus when they fire, never from the scheduler thread
+        self.scheduler = Scheduler(notify=self.announce) if speaker is not None or not self.owns_bus else None
+        self.executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_SKILLS, thread_name_prefix="SkillWorker")
+
+        # Worker processes are started once here so no call pays the spawn cost
+        preload = sorted({module_name for module_name, _ in UNSAFE_SKILLS.values()})
+        self.skill_pool = SkillPool(preload) if isolate_skills else None
         logger.debug("Router initialized")
 
-    def define_route(self, intent_result):
+    @property
+    def fallback(self):
+        """
+        Returns the reply for commands that cannot be handled.
+
+        Args:
+            None
+
+        Returns:
+            str: Rephrase request in the current locale.
+        """
+        return get_renderer().render("router.fallback")
+
+    def run_unsafe_skill(self, intent, entities):
+        """
+        Runs a blocking or crash-prone skill in an isolated worker process.
+
+        Args:
+            intent (str): Intent whose skill is listed in UNSAFE_SKILLS.
+            entities (dict): Validated entities passed to the skill.
+
+        Returns:
+            str: Skill response, or an apology if the worker timed out or crashed.
+        """
+        module_name, function_name = UNSAFE_SKILLS[intent]
+
+        # Fall back to in-process execution when isolation is disabled
+        if self.skill_pool is None:
+            module = importlib.import_module(module_name)
+            return getattr(module, function_name)(entities)
+
+        try:
+            return self.skill_pool.call(module_name, function_name, entities)
+
+        except SkillTimeoutError:
+            logger.warning("Skill timed out | intent=%s", intent)
+            return get_renderer().render("router.timeout")
+
+        except SkillCrashError as e:
+            logger.warning("Skill failed in worker | intent=%s error=%s", intent, e)
+            return get_renderer().render("router.failed")
+
+    def announce(self, message, priority=PRIORITY_NORMAL):
+        """
+        Publishes text for the user from a background skill or job.
+
+        Args:
+            message (str): Text to speak.
+            priority (int): Event priority (see core.event_bus).
+
+        Returns:
+            bool: True if the speech output accepted the announcement.
+        """
+        return self.bus.publish(TOPIC_ANNOUNCE, message, priority)
+
+    def progress(self, source):
+        """
+        Returns a reporter that long-running skills use to stream progress.
+
+        Args:
+            source (str): Skill or task name.
+
+        Returns:
+            ProgressReporter: Reporter publishing on this router's bus.
+        """
+        return ProgressReporter(self.bus, source)
+
+    def close(self):
+        """
+        Releases worker threads and processes.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.executor.shutdown(wait=False)
+        if self.skill_pool is not None:
+            self.skill_pool.close()
+
+        # A shared bus belongs to the caller, which may still have announcements queued
+        if self.owns_bus:
+            self.bus.close()
+
+    def define_routes(self, intent_results):
+        """
+        Routes every intent of a (possibly compound) command and merges the responses.
+
+        Independent skills run concurrently, so a compound command costs roughly
+        as much as its slowest skill. Responses are merged in spoken order.
+
+        Args:
+            intent_results (list): (intent, entities, confidence) tuples from intent classifier.
+
+        Returns:
+            str | list | None: Single module response, or merged text for compound commands.
+        """
+        # One clock reading per turn, so every part of a compound answer agrees
+        clock = ClockSnapshot()
+
+        if len(intent_results) == 1:
+            return self.define_route(intent_results[0], clock)
+
+        # Exit is handled after every other request so nothing is cut short
+        intent_results = sorted(intent_results, key=lambda result: result[0] == "exit")
+
+        futures = [self.executor.submit(self.define_route, result, clock) for result in intent_results]
+
+        responses = []
+        for future in futures:
+            try:
+                response = future.result()
+            except Exception:
+                logger.exception("Skill raised an exception while handling compound command")
+                response = self.fallback
+
+            # News returns a list of headlines, flatten it into a sentence
+            if isinstance(response, list):
+                response = ". ".join(str(item) for item in response if item)
+
+            # Skip empty responses and repeated fallbacks from rejected parts
+            if not response or response in responses:
+                continue
+
+            responses.append(str(response))
+
+        logger.debug("Compound command handled | parts=%s", len(intent_results))
+        return " ".join(responses)
+
+    def define_route(self, intent_result, clock=None):
         """
         Routes the classified intent to the appropriate functionality module.
 
         Args:
             intent_result (tuple): (intent, entities, confidence) from intent classifier.
+            clock (ClockSnapshot | None): Clock reading shared by the current turn.
 
         Returns:
             str | None: Response returned by the invoked module.
         """
         intent, entities, confidence = intent_result
+        threshold = self.thresholds.get(intent, CONFIDENCE_THRESHOLD)
 
         # Reject low-confidence intents to avoid incorrect actions
-        if confidence < CONFIDENCE_THRESHOLD:
+        if confidence < threshold:
             logger.warning(
-                "Low confidence intent, no module invoked | confidence=%s threshold=%s",
+                "Low confidence intent, no module invoked | intent=%s confidence=%s threshold=%s",
+                intent,
                 confidence,
-                CONFIDENCE_THRESHOLD
+                threshold
             )
             response = self.fallback
             return response
+
+        try:
+            # Reject malformed payloads before any slow or side-effecting module runs
+            entities = self.schemas.validate(intent, entities)
+        except EntityValidationError as e:
+            logger.warning("Entity validation failed | intent=%s entities=%s error=%s", intent, entities, e.message)
+            return e.message
         
         if intent == "date_time":
             logger.debug("get_date_time module invoked")
-            response = get_date_time(entities)
+            response = get_date_time(entities, clock)
             return response
         
         if intent == "joke":
             logger.debug("get_joke module invoked")
-            response = get_joke()
+            response = get_joke(entities)
             return response
         
         if intent == "location":
@@ -71,27 +253,27 @@ class Router:
 
         if intent == "news":
             logger.debug("get_news module invoked")
-            response = get_news()
+            response = get_news(self.settings.current)
             return response
 
         if intent == "weather":
             logger.debug("get_weather module invoked")
-            response = get_weather(entities)
+            response = get_weather(entities, self.settings.current)
             return response
 
         if intent == "search":
             logger.debug("search_google module invoked")
-            response = search_google(entities)
+            response = self.run_unsafe_skill(intent, entities)
             return response
         
         if intent == "youtube":
             logger.debug("youtube_player module invoked")
-            response = youtube_player(entities)
+            response = self.run_unsafe_skill(intent, entities)
             return response
         
         if intent == "opening_app_or_url":
             logger.debug("open_app_or_url module invoked")
-            response = open_app_or_url(entities)
+            response = self.run_unsafe_skill(intent, entities)
             return response
         
         if intent == "system_info":
@@ -102,8 +284,8 @@ class Router:
         if intent == "timer":
             logger.debug("run_timer module invoked")
 
-            # Speaker is passed for real-time feedback during countdown
-            response = run_timer(entities, self.speaker)
+            # Scheduler announces completion on the event bus
+            response = run_timer(entities, self.scheduler)
             return response
         
         if intent == "courtesy":
@@ -113,7 +295,8 @@ class Router:
 
         if intent == "exit":
             logger.debug("Intent is exit, no module invoked and assistant stops")
-            response = "Goodbye"
+            self.exit_requested = True
+            response = get_renderer().render("router.goodbye")
             return response
         
         if intent == "unknown":
@@ -131,9 +314,9 @@ if __name__ == "__main__":
     from core.logger_config import setup_logging
 
     setup_logging()
-    route = Router()
+    route = Router(isolate_skills=False)
 
     raw_input = input("Enter intent result: ")
     intent_result = ast.literal_eval(raw_input)
 
-    route.define_route(intent_result)
+    route.define_routes([intent_result])
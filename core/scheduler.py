@@ -0,0 +1,415 @@
+import heapq
+import itertools
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Directory and file for the pending jobs journal
+DATA_DIR = os.path.join("data")
+JOURNAL_FILE = os.path.join(DATA_DIR, "scheduler_journal.jsonl")
+
+# Longest single sleep, bounds how long a suspend/resume goes unnoticed
+MAX_SLEEP_SECONDS = 30
+
+# Wall clock drift beyond this (relative to the monotonic clock) means the machine was suspended
+SUSPEND_TOLERANCE_SECONDS = 2
+
+# Jobs firing later than this are announced as missed
+MISSED_GRACE_SECONDS = 60
+
+# Rewrite the journal once dead records outnumber live ones by this much
+JOURNAL_COMPACT_SLACK = 32
+
+
+class Job:
+    # Slotted so thousands of pending jobs stay cheap
+    __slots__ = ("job_id", "due", "wall_due", "interval", "message", "cancelled")
+
+    def __init__(self, job_id, due, wall_due, interval, message):
+        """
+        Stores a scheduled notification.
+
+        Args:
+            job_id (int): Unique job identifier.
+            due (float): Monotonic time the job should fire.
+            wall_due (float): Epoch time the job should fire, used after suspend and restart.
+            interval (float | None): Repeat interval in seconds for recurring jobs.
+            message (str): Text announced when the job fires.
+
+        Returns:
+            None
+        """
+        self.job_id = job_id
+        self.due = due
+        self.wall_due = wall_due
+        self.interval = interval
+        self.message = message
+        self.cancelled = False
+
+
+class Journal:
+    def __init__(self, path=JOURNAL_FILE):
+        """
+        Initializes the append-only on-disk record of pending jobs.
+
+        Args:
+            path (str): Journal file path.
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.dead_records = 0
+        self.lock = threading.Lock()
+
+    def load(self):
+        """
+        Replays the journal into the set of still pending jobs.
+
+        Args:
+            None
+
+        Returns:
+            dict: Job id to {"w": wall_due, "i": interval, "m": message} records.
+        """
+        pending = {}
+
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final line after a crash is ignored
+                        continue
+
+                    if record.get("op") == "add":
+                        # A recurring job's later record supersedes the earlier one
+                        if record["id"] in pending:
+                            self.dead_records += 1
+                        pending[record["id"]] = record
+                    elif record.get("op") == "del":
+                        pending.pop(record["id"], None)
+                        self.dead_records += 2
+
+        except OSError:
+            pass
+
+        return pending
+
+    def _append(self, record):
+        """
+        Appends a single record to the journal.
+
+        Args:
+            record (dict): Journal record.
+
+        Returns:
+            None
+        """
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        except OSError:
+            logger.warning("Could not write scheduler journal %s", self.path)
+
+    def add(self, job):
+        """
+        Records a newly scheduled job.
+
+        Args:
+            job (Job): Job to persist.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self._append({"op": "add", "id": job.job_id, "w": round(job.wall_due, 3), "i": job.interval, "m": job.message})
+
+    def update(self, job, live_jobs):
+        """
+        Records the next due time of a rescheduled recurring job.
+
+        A newer "add" record with the same id supersedes the older one on load.
+
+        Args:
+            job (Job): Rescheduled job.
+            live_jobs (dict): Job id to pending Job, only walked on compaction.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self._append({"op": "add", "id": job.job_id, "w": round(job.wall_due, 3), "i": job.interval, "m": job.message})
+            self.dead_records += 1
+
+            if self.dead_records > len(live_jobs) + JOURNAL_COMPACT_SLACK:
+                self._compact(live_jobs)
+
+    def remove(self, job_id, live_jobs):
+        """
+        Records a finished or cancelled job, compacting the file when it grows stale.
+
+        Args:
+            job_id (int): Finished job identifier.
+            live_jobs (dict): Job id to pending Job, only walked on compaction.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self._append({"op": "del", "id": job_id})
+            self.dead_records += 2
+
+            if self.dead_records > len(live_jobs) + JOURNAL_COMPACT_SLACK:
+                self._compact(live_jobs)
+
+    def _compact(self, live_jobs):
+        """
+        Rewrites the journal with only the live jobs.
+
+        Args:
+            live_jobs (dict): Job id to pending Job.
+
+        Returns:
+            None
+        """
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                for job in live_jobs.values():
+                    record = {"op": "add", "id": job.job_id, "w": round(job.wall_due, 3), "i": job.interval, "m": job.message}
+                    file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            os.replace(temp_path, self.path)
+            self.dead_records = 0
+        except OSError:
+            logger.warning("Could not compact scheduler journal %s", self.path)
+
+
+class Scheduler:
+    def __init__(self, notify, journal=None):
+        """
+        Initializes a single-threaded monotonic-clock job scheduler.
+
+        Pending jobs are restored from the journal; jobs that came due while the
+        assistant was not running are handled as missed fires.
+
+        Args:
+            notify (callable): Called with the message text when a job fires.
+            journal (Journal | None): Persistence for pending jobs.
+
+        Returns:
+            None
+        """
+        self.notify = notify
+        self.journal = journal or Journal()
+        self.condition = threading.Condition()
+        self.heap = []
+        self.jobs = {}
+        self.sequence = itertools.count()
+
+        restored = self.journal.load()
+        self.ids = itertools.count(max(restored, default=0) + 1)
+
+        now, wall_now = time.monotonic(), time.time()
+        for job_id, record in restored.items():
+            job = Job(job_id, now + (record["w"] - wall_now), record["w"], record["i"], record["m"])
+            self._push(job)
+
+        self.clock_reference = (now, wall_now)
+        self.thread = threading.Thread(target=self._run, daemon=True, name="SchedulerThread")
+        self.thread.start()
+
+        logger.debug("Scheduler initialized | restored_jobs=%s", len(restored))
+
+    def _push(self, job):
+        """
+        Adds a job to the heap and the id index.
+
+        Args:
+            job (Job): Job to schedule.
+
+        Returns:
+            None
+        """
+        self.jobs[job.job_id] = job
+        heapq.heappush(self.heap, (job.due, next(self.sequence), job))
+
+    def schedule(self, message, delay=None, at=None, interval=None):
+        """
+        Schedules a relative timer, an absolute alarm, or a recurring job.
+
+        Args:
+            message (str): Text announced when the job fires.
+            delay (float | None): Seconds from now (sub-second precision).
+            at (float | None): Epoch time for absolute alarms.
+            interval (float | None): Repeat every this many seconds.
+
+        Returns:
+            int: Job identifier usable with cancel().
+        """
+        now, wall_now = time.monotonic(), time.time()
+
+        if at is not None:
+            delay = at - wall_now
+        elif delay is None:
+            delay = interval
+
+        if delay is None or delay < 0:
+            raise ValueError("A future delay, time or interval is required")
+
+        with self.condition:
+            job = Job(next(self.ids), now + delay, wall_now + delay, interval, message)
+            self._push(job)
+            self.journal.add(job)
+            self.condition.notify()
+
+        logger.debug("Job scheduled | id=%s delay=%.3f interval=%s", job.job_id, delay, interval)
+        return job.job_id
+
+    def cancel(self, job_id):
+        """
+        Cancels a pending job.
+
+        Args:
+            job_id (int): Identifier returned by schedule().
+
+        Returns:
+            bool: True if the job was pending.
+        """
+        with self.condition:
+            job = self.jobs.pop(job_id, None)
+            if job is None:
+                return False
+
+            # Lazy deletion keeps cancel O(1); the heap entry is skipped when popped
+            job.cancelled = True
+            self.journal.remove(job_id, self.jobs)
+            self.condition.notify()
+            return True
+
+    def pending(self):
+        """
+        Lists pending jobs ordered by due time.
+
+        Args:
+            None
+
+        Returns:
+            list: (job_id, seconds_until_due, interval, message) tuples.
+        """
+        now = time.monotonic()
+        with self.condition:
+            jobs = sorted(self.jobs.values(), key=lambda job: job.due)
+            return [(job.job_id, max(0.0, job.due - now), job.interval, job.message) for job in jobs]
+
+    def _resync_after_suspend(self, now, wall_now):
+        """
+        Re-derives monotonic deadlines from wall-clock deadlines after a clock jump.
+
+        Args:
+            now (float): Current monotonic time.
+            wall_now (float): Current epoch time.
+
+        Returns:
+            None
+        """
+        expected_wall = self.clock_reference[1] + (now - self.clock_reference[0])
+        if abs(wall_now - expected_wall) > SUSPEND_TOLERANCE_SECONDS:
+            logger.info("Clock jump detected (suspend or time change), rescheduling %s jobs", len(self.jobs))
+            for job in self.jobs.values():
+                job.due = now + (job.wall_due - wall_now)
+            self.heap = [(job.due, next(self.sequence), job) for job in self.jobs.values()]
+            heapq.heapify(self.heap)
+
+        self.clock_reference = (now, wall_now)
+
+    def _pop_due(self, now):
+        """
+        Removes every job that is due and reschedules recurring ones.
+
+        Args:
+            now (float): Current monotonic time.
+
+        Returns:
+            list: Messages to announce.
+        """
+        messages = []
+
+        while self.heap and self.heap[0][0] <= now:
+            due, sequence, job = heapq.heappop(self.heap)
+            if job.cancelled:
+                continue
+
+            late = now - due
+            missed = late > MISSED_GRACE_SECONDS
+
+            if job.interval:
+                # Coalesce every missed repetition into a single late fire
+                skipped = math.floor(late / job.interval) + 1
+                job.due += skipped * job.interval
+                job.wall_due += skipped * job.interval
+                heapq.heappush(self.heap, (job.due, next(self.sequence), job))
+
+                # Otherwise a restart would replay the original due time as a missed fire
+                self.journal.update(job, self.jobs)
+            else:
+                del self.jobs[job.job_id]
+                self.journal.remove(job.job_id, self.jobs)
+
+            if missed:
+                logger.info("Job fired late | id=%s late=%.1fs", job.job_id, late)
+                messages.append(f"Missed while I was away: {job.message}")
+            else:
+                messages.append(job.message)
+
+        return messages
+
+    def _run(self):
+        """
+        Scheduler thread loop: sleeps until the next deadline and fires due jobs.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        while True:
+            with self.condition:
+                now, wall_now = time.monotonic(), time.time()
+                self._resync_after_suspend(now, wall_now)
+                messages = self._pop_due(now)
+
+                if not messages:
+                    wait = self.heap[0][0] - now if self.heap else MAX_SLEEP_SECONDS
+                    self.condition.wait(min(wait, MAX_SLEEP_SECONDS))
+                    continue
+
+            # Announce outside the lock so scheduling is never blocked by speech
+            for message in messages:
+                try:
+                    self.notify(message)
+                except Exception:
+                    logger.exception("Scheduled job notification failed")
+
+
+if __name__ == "__main__":
+    from core.logger_config import setup_logging
+
+    setup_logging()
+    scheduler = Scheduler(notify=print, journal=Journal(os.path.join(DATA_DIR, "scheduler_demo.jsonl")))
+
+    delay = float(input("Enter delay in seconds: "))
+    started = time.monotonic()
+    scheduler.schedule("Timer finished.", delay=delay)
+    scheduler.schedule("Recurring tick.", interval=max(delay / 3, 0.1))
+
+    time.sleep(delay + 0.5)
+    print(f"Pending: {scheduler.pending()} | elapsed={time.monotonic() - started:.3f}s")
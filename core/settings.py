@@ -0,0 +1,375 @@
+import ipaddress
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from dotenv import dotenv_values
+
+logger = logging.getLogger(__name__)
+
+# Settings file, values from the process environment take precedence
+ENV_FILE = ".env"
+
+# How often the settings file is checked for changes
+POLL_SECONDS = 2
+
+# Declarative settings schema: attribute -> environment variable, type and rules
+SETTINGS_SCHEMA = {
+    "gemini_api_key": {"env": "GEMINI_API_KEY", "type": "str", "required": True,
+                       "help": "Gemini API key used for intent classification"},
+    "gemini_model": {"env": "GEMINI_MODEL", "type": "str", "default": "gemini-2.5-flash"},
+    "llm_timeout": {"env": "LLM_TIMEOUT", "type": "float", "default": 10.0, "min": 1.0},
+    "weather_api_key": {"env": "WEATHER_API_KEY", "type": "str",
+                        "help": "weatherapi.com key, the weather skill is disabled without it"},
+    "news_api_key": {"env": "NEWS_API_KEY", "type": "str",
+                     "help": "NewsAPI key, the news skill is disabled without it"},
+    "locale": {"env": "ASSISTLY_LOCALE", "type": "choice", "choices": ("en", "es"), "default": "en"},
+    "capture": {"env": "ASSISTLY_CAPTURE", "type": "bool", "default": False},
+    "endpointing": {"env": "ASSISTLY_ENDPOINTING", "type": "choice", "choices": ("adaptive", "fixed"), "default": "adaptive"},
+    "compact_upload": {"env": "ASSISTLY_COMPACT_UPLOAD", "type": "bool", "default": True},
+    "noise_suppression": {"env": "ASSISTLY_NOISE_SUPPRESSION", "type": "bool", "default": False},
+    "home_location": {"env": "HOME_LOCATION", "type": "str"},
+    "public_ip": {"env": "PUBLIC_IP", "type": "ip"},
+
+    # Upstream endpoints, pointed at local stand-ins for load and resilience testing
+    "gemini_base_url": {"env": "GEMINI_BASE_URL", "type": "url",
+                        "default": "https://generativelanguage.googleapis.com/v1beta"},
+    "weather_base_url": {"env": "WEATHER_BASE_URL", "type": "url", "default": "https://api.weatherapi.com/v1"},
+    "news_base_url": {"env": "NEWS_BASE_URL", "type": "url", "default": "https://newsapi.org/v2"},
+    "ipinfo_base_url": {"env": "IPINFO_BASE_URL", "type": "url", "default": "https://ipinfo.io"},
+    "stt_base_url": {"env": "STT_BASE_URL", "type": "url", "default": "http://www.google.com/speech-api/v2"}
+}
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+FALSE_VALUES = {"0", "false", "no", "off", ""}
+
+
+class SettingsError(ValueError):
+    def __init__(self, problems):
+        """
+        Collects every settings problem into one report.
+
+        Args:
+            problems (list): Human-readable problem descriptions.
+
+        Returns:
+            None
+        """
+        self.problems = problems
+        super().__init__("Invalid settings:\n" + "\n".join(f"  - {problem}" for problem in problems))
+
+
+class Settings:
+    __slots__ = tuple(SETTINGS_SCHEMA)
+
+    def __init__(self, values):
+        """
+        Stores validated settings; instances are read-only snapshots.
+
+        Args:
+            values (dict): Attribute name to parsed value.
+
+        Returns:
+            None
+        """
+        for name in SETTINGS_SCHEMA:
+            object.__setattr__(self, name, values.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Settings are read-only, edit the settings file instead")
+
+    def __repr__(self):
+        # Secrets are never written to logs
+        shown = {name: ("***" if name.endswith("_key") and getattr(self, name) else getattr(self, name)) for name in SETTINGS_SCHEMA}
+        return f"Settings({shown})"
+
+
+def _parse(name, spec, raw):
+    """
+    Converts one raw string to its typed value.
+
+    Args:
+        name (str): Setting attribute name.
+        spec (dict): Schema entry.
+        raw (str): Raw value.
+
+    Returns:
+        object: Parsed value.
+
+    Raises:
+        ValueError: With a message naming the variable when the value is invalid.
+    """
+    kind = spec["type"]
+    raw = raw.strip()
+
+    if kind == "str":
+        return raw
+    if kind == "bool":
+        if raw.lower() in TRUE_VALUES:
+            return True
+        if raw.lower() in FALSE_VALUES:
+            return False
+        raise ValueError(f"{spec['env']} must be true or false, got {raw!r}")
+    if kind in ("int", "float"):
+        try:
+            value = int(raw) if kind == "int" else float(raw)
+        except ValueError:
+            raise ValueError(f"{spec['env']} must be a number, got {raw!r}")
+        if "min" in spec and value < spec["min"]:
+            raise ValueError(f"{spec['env']} must be at least {spec['min']}, got {value}")
+        return value
+    if kind == "choice":
+        if raw not in spec["choices"]:
+            raise ValueError(f"{spec['env']} must be one of {', '.join(spec['choices'])}, got {raw!r}")
+        return raw
+    if kind == "url":
+        parsed = urlparse(raw)
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            raise ValueError(f"{spec['env']} must be an http(s) URL, got {raw!r}")
+        return raw.rstrip("/")
+    if kind == "ip":
+        try:
+            return str(ipaddress.ip_address(raw))
+        except ValueError:
+            raise ValueError(f"{spec['env']} must be an IP address, got {raw!r}")
+
+    raise ValueError(f"Unknown setting type {kind} for {name}")
+
+
+def parse_settings(sources, strict=True):
+    """
+    Builds validated settings from raw key/value sources.
+
+    Args:
+        sources (list): Mappings of environment variable to raw value, later ones winning.
+        strict (bool): Treat missing required values as errors rather than warnings.
+
+    Returns:
+        tuple: (Settings, warnings) where warnings lists optional features left disabled.
+
+    Raises:
+        SettingsError: Listing every invalid (or, when strict, missing required) value at once.
+    """
+    raw_values = {}
+    for source in sources:
+        raw_values.update({key: value for key, value in source.items() if value is not None})
+
+    values, problems, warnings = {}, [], []
+
+    for name, spec in SETTINGS_SCHEMA.items():
+        raw = raw_values.get(spec["env"])
+
+        if raw is None or not raw.strip():
+            values[name] = spec.get("default")
+            if spec.get("required") and strict:
+                problems.append(f"{spec['env']} is missing ({spec.get('help', name)})")
+            elif "help" in spec:
+                warnings.append(f"{spec['env']} is not set: {spec['help']}")
+            continue
+
+        try:
+            values[name] = _parse(name, spec, raw)
+        except ValueError as e:
+            problems.append(str(e))
+
+    if problems:
+        raise SettingsError(problems)
+
+    return Settings(values), warnings
+
+
+class SettingsStore:
+    def __init__(self, env_file=ENV_FILE, strict=False):
+        """
+        Loads the settings once and keeps the current snapshot.
+
+        Args:
+            env_file (str): Dotenv-style settings file.
+            strict (bool): Require every required value. Standalone module runs
+                           stay lenient; the assistant calls validate() at startup.
+
+        Returns:
+            None
+
+        Raises:
+            SettingsError: If the initial settings are invalid.
+        """
+        self.env_file = env_file
+        self.strict = strict
+        self.lock = threading.Lock()
+        self.listeners = []
+        self.watcher = None
+        self.mtime = self._mtime()
+        self.current, self.warnings = self._load()
+
+    def _mtime(self):
+        """
+        Returns the settings file modification time.
+
+        Args:
+            None
+
+        Returns:
+            float | None: mtime, or None if the file does not exist.
+        """
+        try:
+            return os.stat(self.env_file).st_mtime
+        except OSError:
+            return None
+
+    def _load(self):
+        """
+        Parses the settings file merged with the process environment.
+
+        Args:
+            None
+
+        Returns:
+            tuple: (Settings, warnings)
+        """
+        file_values = dotenv_values(self.env_file) if os.path.exists(self.env_file) else {}
+        return parse_settings([file_values, os.environ], self.strict)
+
+    def validate(self):
+        """
+        Switches to strict mode and re-checks the settings, for fail-fast startup.
+
+        Later reloads that break a required value are rejected.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            SettingsError: Listing every invalid or missing required value.
+        """
+        self.strict = True
+        self.current, self.warnings = self._load()
+
+    def subscribe(self, listener):
+        """
+        Registers a callback for settings changes.
+
+        Args:
+            listener (callable): Called with (old, new) Settings after a reload.
+
+        Returns:
+            None
+        """
+        self.listeners.append(listener)
+
+    def reload(self):
+        """
+        Re-reads the settings, keeping the previous snapshot when the new one is invalid.
+
+        Args:
+            None
+
+        Returns:
+            bool: True if new settings were applied.
+        """
+        try:
+            settings, warnings = self._load()
+        except SettingsError as e:
+            logger.error("Settings change rejected, keeping previous values\n%s", e)
+            return False
+
+        with self.lock:
+            old, self.current, self.warnings = self.current, settings, warnings
+
+        logger.info("Settings reloaded from %s", self.env_file)
+        for listener in list(self.listeners):
+            try:
+                listener(old, settings)
+            except Exception:
+                logger.exception("Settings listener failed")
+        return True
+
+    def watch(self, interval=POLL_SECONDS):
+        """
+        Starts a background thread that reloads the settings when the file changes.
+
+        Args:
+            interval (float): Seconds between file checks.
+
+        Returns:
+            None
+        """
+        if self.watcher is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                mtime = self._mtime()
+                if mtime != self.mtime:
+                    self.mtime = mtime
+                    self.reload()
+
+        self.watcher = threading.Thread(target=run, daemon=True, name="SettingsWatcher")
+        self.watcher.start()
+
+    def report(self):
+        """
+        Describes the active settings for the startup log.
+
+        Args:
+            None
+
+        Returns:
+            str: Multi-line report with disabled features.
+        """
+        lines = [f"Settings loaded from {self.env_file}: {self.current!r}"]
+        lines.extend(f"  - {warning}" for warning in self.warnings)
+        return "\n".join(lines)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_settings_store():
+    """
+    Returns the process-wide settings store, loading it on first use.
+
+    Args:
+        None
+
+    Returns:
+        SettingsStore: Shared store.
+
+    Raises:
+        SettingsError: If the settings are invalid.
+    """
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = SettingsStore()
+        return _store
+
+
+def get_settings():
+    """
+    Returns the current settings snapshot.
+
+    Args:
+        None
+
+    Returns:
+        Settings: Current settings, replaced atomically on reload.
+    """
+    return get_settings_store().current
+
+
+if __name__ == "__main__":
+    try:
+        store = get_settings_store()
+        store.validate()
+        print(store.report())
+    except SettingsError as e:
+        raise SystemExit(str(e))
@@ -0,0 +1,213 @@
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+class SingleFlight:
+    def __init__(self, name):
+        """
+        Initializes a group that coalesces concurrent identical calls.
+
+        While a call for a key is in flight, further calls for the same key wait
+        for it and receive the same result (or exception) instead of starting
+        their own upstream request. Results are shared, not copied.
+
+        Args:
+            name (str): Group name used in logs and metrics.
+
+        Returns:
+            None
+        """
+        self.name = name
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def _join(self, key):
+        """
+        Registers a caller for a key.
+
+        Args:
+            key (hashable): Identity of the upstream call.
+
+        Returns:
+            tuple: (future, leader) where leader is True if this caller must run the call.
+        """
+        with self.lock:
+            self.calls += 1
+            future = self.in_flight.get(key)
+
+            if future is not None:
+                self.coalesced += 1
+                logger.debug("Call coalesced | group=%s key=%s", self.name, key)
+                return future, False
+
+            future = Future()
+            self.in_flight[key] = future
+            self.executions += 1
+            return future, True
+
+    def _finish(self, key, future, result=None, error=None):
+        """
+        Publishes the leader's outcome to every waiting caller.
+
+        Args:
+            key (hashable): Identity of the upstream call.
+            future (Future): Shared future of the call.
+            result (object): Return value on success.
+            error (BaseException | None): Raised exception on failure.
+
+        Returns:
+            None
+        """
+        # Later callers start a fresh call instead of reading a finished one
+        with self.lock:
+            self.in_flight.pop(key, None)
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, function, *args, **kwargs):
+        """
+        Runs function once per key across concurrent threads.
+
+        Args:
+            key (hashable): Identity of the upstream call.
+            function (callable): Blocking function performing the call.
+            *args: Positional arguments for function.
+            **kwargs: Keyword arguments for function.
+
+        Returns:
+            object: The (possibly shared) result of function.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+
+        self._finish(key, future, result)
+        return result
+
+    async def do_async(self, key, function, *args, **kwargs):
+        """
+        Runs function once per key across concurrent coroutines and threads.
+
+        Coroutine functions are awaited on the running loop; blocking functions
+        run in the loop's default executor. Either way the call is shared with
+        thread callers of do() using the same key.
+
+        Args:
+            key (hashable): Identity of the upstream call.
+            function (callable): Coroutine function or blocking function.
+            *args: Positional arguments for function.
+            **kwargs: Keyword arguments for function.
+
+        Returns:
+            object: The (possibly shared) result of function.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            if inspect.iscoroutinefunction(function):
+                result = await function(*args, **kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(None, functools.partial(function, *args, **kwargs))
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+
+        self._finish(key, future, result)
+        return result
+
+    def stats(self):
+        """
+        Returns coalescing metrics for the group.
+
+        Args:
+            None
+
+        Returns:
+            dict: Total calls, upstream executions, coalesced calls and calls currently in flight.
+        """
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self.in_flight)
+            }
+
+
+def get_flight(name):
+    """
+    Returns the process-wide single-flight group with the given name.
+
+    Args:
+        name (str): Group name, e.g. "weather" or "gemini".
+
+    Returns:
+        SingleFlight: Shared group.
+    """
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+        return group
+
+
+def flight_stats():
+    """
+    Returns coalescing metrics for every group.
+
+    Args:
+        None
+
+    Returns:
+        dict: Group name to stats().
+    """
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
+
+
+if __name__ == "__main__":
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    def slow_upstream(city):
+        time.sleep(0.2)
+        return f"Sunny in {city}"
+
+    flight = get_flight("demo")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda index: flight.do(("weather", "paris"), slow_upstream, "Paris"), range(16)))
+    print(f"threads: {len(results)} results in {time.perf_counter() - started:.2f}s | {flight.stats()}")
+
+    async def main():
+        started = time.perf_counter()
+        results = await asyncio.gather(*(flight.do_async(("weather", "rome"), slow_upstream, "Rome") for _ in range(16)))
+        print(f"asyncio: {len(results)} results in {time.perf_counter() - started:.2f}s | {flight.stats()}")
+
+    asyncio.run(main())
@@ -0,0 +1,214 @@
+import importlib
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Number of pre-started worker processes
+POOL_SIZE = 2
+
+# Seconds a single skill call may take before its worker is killed
+CALL_TIMEOUT_SECONDS = 15
+
+# Workers are replaced after this many calls to bound leaks in native code
+MAX_CALLS_PER_WORKER = 50
+
+# Spawn gives the same (thread-safe) behavior on every platform
+_context = multiprocessing.get_context("spawn")
+
+
+class SkillTimeoutError(RuntimeError):
+    pass
+
+
+class SkillCrashError(RuntimeError):
+    pass
+
+
+def _worker_main(conn, preload):
+    """
+    Worker process loop: imports skills once, then serves calls over a pipe.
+
+    Args:
+        conn (Connection): Child end of the pipe to the parent.
+        preload (list): Module names imported at startup to warm the worker.
+
+    Returns:
+        None
+    """
+    for module_name in preload:
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            pass
+
+    while True:
+        try:
+            module_name, function_name, args = conn.recv()
+        except (EOFError, OSError):
+            return
+
+        try:
+            function = getattr(importlib.import_module(module_name), function_name)
+            conn.send(("ok", function(*args)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class Worker:
+    def __init__(self, preload):
+        """
+        Starts a single worker process connected by a duplex pipe.
+
+        Args:
+            preload (list): Module names to import in the worker at startup.
+
+        Returns:
+            None
+        """
+        self.conn, child_conn = _context.Pipe()
+        self.process = _context.Process(
+            target=_worker_main,
+            args=(child_conn, preload),
+            daemon=True,
+            name="SkillWorker"
+        )
+        self.process.start()
+        child_conn.close()
+        self.calls = 0
+
+    def kill(self):
+        """
+        Terminates the worker process and closes its pipe.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+
+
+class SkillPool:
+    def __init__(self, preload, size=POOL_SIZE, timeout=CALL_TIMEOUT_SECONDS, max_calls=MAX_CALLS_PER_WORKER):
+        """
+        Pre-starts a pool of isolated worker processes for blocking or crash-prone skills.
+
+        Args:
+            preload (list): Skill module names imported in every worker.
+            size (int): Number of worker processes.
+            timeout (float): Default per-call timeout in seconds.
+            max_calls (int): Calls served before a worker is recycled.
+
+        Returns:
+            None
+        """
+        self.preload = list(preload)
+        self.timeout = timeout
+        self.max_calls = max_calls
+        self.idle = queue.Queue()
+        self.closed = False
+
+        started = time.perf_counter()
+        for _ in range(size):
+            self.idle.put(Worker(self.preload))
+
+        logger.debug("SkillPool started | workers=%s startup_ms=%.0f", size, (time.perf_counter() - started) * 1000)
+
+    def _replace(self, worker):
+        """
+        Kills a worker and starts its replacement off the calling thread.
+
+        Args:
+            worker (Worker): Worker to retire.
+
+        Returns:
+            None
+        """
+        worker.kill()
+
+        def spawn():
+            if not self.closed:
+                self.idle.put(Worker(self.preload))
+
+        threading.Thread(target=spawn, daemon=True, name="SkillWorkerSpawner").start()
+
+    def call(self, module_name, function_name, *args, timeout=None):
+        """
+        Runs a skill function in a worker process.
+
+        Args:
+            module_name (str): Module containing the skill, e.g. "modules.search_google".
+            function_name (str): Function to call in that module.
+            *args: Picklable positional arguments.
+            timeout (float | None): Per-call timeout, defaults to the pool timeout.
+
+        Returns:
+            object: The skill's return value.
+
+        Raises:
+            SkillTimeoutError: If no worker was free or the call did not finish in time.
+            SkillCrashError: If the worker died or the skill raised.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        try:
+            worker = self.idle.get(timeout=timeout)
+        except queue.Empty:
+            raise SkillTimeoutError("no skill worker available")
+
+        try:
+            worker.conn.send((module_name, function_name, args))
+
+            # Pipe polling enforces the timeout without blocking the caller forever
+            if not worker.conn.poll(max(0.0, deadline - time.monotonic())):
+                logger.warning("Skill call timed out, recycling worker | %s.%s", module_name, function_name)
+                self._replace(worker)
+                raise SkillTimeoutError(f"{module_name}.{function_name} timed out")
+
+            status, result = worker.conn.recv()
+
+        except (EOFError, OSError, BrokenPipeError):
+            logger.warning("Skill worker crashed, recycling worker | %s.%s", module_name, function_name)
+            self._replace(worker)
+            raise SkillCrashError(f"{module_name}.{function_name} crashed its worker")
+
+        worker.calls += 1
+        if worker.calls >= self.max_calls:
+            self._replace(worker)
+        else:
+            self.idle.put(worker)
+
+        if status == "error":
+            raise SkillCrashError(result)
+
+        return result
+
+    def close(self):
+        """
+        Stops all idle workers.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().kill()
+            except queue.Empty:
+                break
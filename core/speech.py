@@ -1,6 +1,10 @@
 import logging
+import threading
+
 import pyttsx3
 
+from core.event_bus import TOPIC_ANNOUNCE
+
 logger = logging.getLogger(__name__)
 
 class Speech:
@@ -61,6 +65,52 @@ class Speech:
             logger.info("TTS fallback output: %s", text)
 
 
+class SpeechOutput:
+    def __init__(self, speaker, bus):
+        """
+        Serializes everything the assistant says: turn responses and bus announcements.
+
+        Announcements published on TOPIC_ANNOUNCE (timers, skill results) are
+        spoken by the bus delivery thread, but never over a response the main
+        loop is speaking; they wait for it to finish, in priority order.
+
+        Args:
+            speaker (Speech): Text-to-speech backend.
+            bus (EventBus): Bus carrying asynchronous announcements.
+
+        Returns:
+            None
+        """
+        self.speaker = speaker
+        self.lock = threading.Lock()
+        self.subscription = bus.subscribe(TOPIC_ANNOUNCE, self.announce, name="speech")
+
+    def speak(self, text):
+        """
+        Speaks text, waiting for any announcement in progress.
+
+        Args:
+            text (str): Text content to be spoken aloud.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.speaker.speak(text)
+
+    def announce(self, event):
+        """
+        Speaks an announcement delivered by the event bus.
+
+        Args:
+            event (Event): Event whose payload is the text.
+
+        Returns:
+            None
+        """
+        self.speak(str(event.payload))
+
+
 if __name__ == "__main__":
     from core.logger_config import setup_logging
 
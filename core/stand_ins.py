@@ -0,0 +1,553 @@
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from core.local_classifier import classify_locally
+
+logger = logging.getLogger(__name__)
+
+# Upstreams served by the stand-in, each under its own path prefix
+UPSTREAMS = ("gemini", "weather", "news", "ipinfo", "stt")
+
+# Base-URL setting that points each client at its stand-in prefix
+BASE_URL_SETTINGS = {
+    "gemini": "GEMINI_BASE_URL",
+    "weather": "WEATHER_BASE_URL",
+    "news": "NEWS_BASE_URL",
+    "ipinfo": "IPINFO_BASE_URL",
+    "stt": "STT_BASE_URL"
+}
+
+# Added latency shapes; latency_ms is the mean (median for lognormal), jitter_ms the spread
+DISTRIBUTIONS = ("constant", "normal", "uniform", "exponential", "lognormal")
+
+# Delay advertised in Retry-After when a request is throttled
+DEFAULT_RETRY_AFTER_SECONDS = 5
+
+# Locates the command inside the classification prompt
+PROMPT_COMMAND_PATTERN = re.compile(r'Now classify this input: "(.*)"')
+
+# Transcript returned by the STT stand-in unless configured otherwise
+DEFAULT_TRANSCRIPT = "what's the time"
+
+# Documentation address (RFC 5737) reported by the ipinfo stand-in
+STAND_IN_IP = "203.0.113.7"
+
+WEATHER_CONDITIONS = ("Sunny", "Partly cloudy", "Overcast", "Light rain", "Mist")
+
+HEADLINES = (
+    "Stand-in headline one",
+    "Stand-in headline two",
+    "Stand-in headline three",
+    "Stand-in headline four"
+)
+
+# Bodies served for the "malformed" fault: cut-off JSON and a proxy error page, both with HTTP 200
+MALFORMED_BODIES = (
+    (b'{"candidates": [{"content": {"parts": [{"text": "{\\"intent\\": ', "application/json"),
+    (b"<html><body><h1>502 Bad Gateway</h1></body></html>", "text/html")
+)
+
+
+class UpstreamProfile:
+    # Slotted, one per upstream, mutable while the server runs
+    __slots__ = ("latency_ms", "jitter_ms", "error_rate", "distribution", "throttle_rate", "malformed_rate", "retry_after",
+                 "upload_kbps")
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, distribution="normal",
+                 throttle_rate=0.0, malformed_rate=0.0, retry_after=DEFAULT_RETRY_AFTER_SECONDS, upload_kbps=0.0):
+        """
+        Describes the injected behavior of one upstream.
+
+        Args:
+            latency_ms (float): Mean added response latency (median for lognormal).
+            jitter_ms (float): Spread of the added latency: standard deviation for
+                               normal and lognormal, half-width for uniform.
+            error_rate (float): Fraction of requests answered with HTTP 500.
+            distribution (str): One of DISTRIBUTIONS.
+            throttle_rate (float): Fraction of requests answered with HTTP 429.
+            malformed_rate (float): Fraction of requests answered with a broken HTTP 200 body.
+            retry_after (float): Retry-After seconds sent with throttled responses.
+            upload_kbps (float): Simulated client uplink in kilobits per second,
+                                 request bodies are delayed accordingly (0 = unlimited).
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the distribution is unknown or the fault rates exceed 1.
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution {distribution!r}, expected one of {', '.join(DISTRIBUTIONS)}")
+        if error_rate + throttle_rate + malformed_rate > 1:
+            raise ValueError("error_rate, throttle_rate and malformed_rate must add up to at most 1")
+
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.distribution = distribution
+        self.throttle_rate = throttle_rate
+        self.malformed_rate = malformed_rate
+        self.retry_after = retry_after
+        self.upload_kbps = upload_kbps
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"UpstreamProfile({fields})"
+
+    @classmethod
+    def from_dict(cls, values):
+        """
+        Builds a profile from a scenario file entry.
+
+        Args:
+            values (dict): Constructor arguments by name.
+
+        Returns:
+            UpstreamProfile: Profile.
+        """
+        return cls(**values)
+
+    def sample_latency(self, rng):
+        """
+        Draws one added latency.
+
+        Args:
+            rng (random.Random): Sampler.
+
+        Returns:
+            float: Delay in milliseconds, never negative.
+        """
+        mean, spread = self.latency_ms, self.jitter_ms
+        if mean <= 0:
+            return 0.0
+
+        if self.distribution == "constant":
+            return mean
+        if self.distribution == "uniform":
+            return max(0.0, rng.uniform(mean - spread, mean + spread))
+        if self.distribution == "exponential":
+            return rng.expovariate(1 / mean)
+        if self.distribution == "lognormal":
+            # Heavy tail around the median: sigma from the spread relative to the median
+            return rng.lognormvariate(math.log(mean), spread / mean if spread else 0.0)
+        return max(0.0, rng.gauss(mean, spread))
+
+    def sample_fault(self, rng):
+        """
+        Decides which fault, if any, a request gets.
+
+        Args:
+            rng (random.Random): Sampler.
+
+        Returns:
+            str | None: "error", "throttle", "malformed", or None for a normal answer.
+        """
+        draw = rng.random()
+        for fault, rate in (("error", self.error_rate), ("throttle", self.throttle_rate), ("malformed", self.malformed_rate)):
+            if draw < rate:
+                return fault
+            draw -= rate
+        return None
+
+
+def load_profiles(path):
+    """
+    Reads per-upstream profiles from a JSON scenario file.
+
+    Args:
+        path (str): File mapping upstream name to UpstreamProfile arguments,
+                    e.g. {"gemini": {"latency_ms": 400, "distribution": "lognormal"}}.
+
+    Returns:
+        dict: Upstream name to UpstreamProfile.
+
+    Raises:
+        ValueError: If the file names an unknown upstream or invalid profile.
+    """
+    with open(path, encoding="utf-8") as file:
+        scenario = json.load(file)
+
+    unknown = set(scenario) - set(UPSTREAMS)
+    if unknown:
+        raise ValueError(f"Unknown upstreams in {path}: {', '.join(sorted(unknown))}")
+
+    return {upstream: UpstreamProfile.from_dict(values) for upstream, values in scenario.items()}
+
+
+def gemini_body(prompt):
+    """
+    Answers a classification prompt the way Gemini would, using the local rules.
+
+    Args:
+        prompt (str): Prompt text from the generateContent request.
+
+    Returns:
+        dict: generateContent response with candidates and usageMetadata.
+    """
+    matches = PROMPT_COMMAND_PATTERN.findall(prompt)
+    intent_result = classify_locally(matches[-1]) if matches else None
+    intent, entities, confidence = intent_result or ("unknown", {}, 0.2)
+
+    # Rule confidence sits just above the router threshold, the stand-in answers like a confident model
+    text = json.dumps({"intent": intent, "entities": entities, "confidence": max(confidence, 0.9)})
+
+    prompt_tokens = len(prompt) // 4
+    output_tokens = len(text) // 4
+    return {
+        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP"}],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens
+        }
+    }
+
+
+def weather_body(city):
+    """
+    Builds a weatherapi.com current.json response, stable per city.
+
+    Args:
+        city (str): Queried city.
+
+    Returns:
+        dict: Response with location and current conditions.
+    """
+    seed = zlib.crc32(city.lower().encode("utf-8"))
+    return {
+        "location": {"name": city, "region": "", "country": ""},
+        "current": {
+            "temp_c": round(-5 + seed % 400 / 10, 1),
+            "wind_kph": round(seed % 300 / 10, 1),
+            "condition": {"text": WEATHER_CONDITIONS[seed % len(WEATHER_CONDITIONS)]}
+        }
+    }
+
+
+def news_body():
+    """
+    Builds a NewsAPI top-headlines response.
+
+    Args:
+        None
+
+    Returns:
+        dict: Response with articles.
+    """
+    articles = [{"source": {"id": "bbc-news", "name": "BBC News"}, "title": title} for title in HEADLINES]
+    return {"status": "ok", "totalResults": len(articles), "articles": articles}
+
+
+def ipinfo_body():
+    """
+    Builds an ipinfo.io /json response.
+
+    Args:
+        None
+
+    Returns:
+        dict: Response with ip, city, region, country and loc.
+    """
+    return {
+        "ip": STAND_IN_IP,
+        "city": "London",
+        "region": "England",
+        "country": "GB",
+        "loc": "51.5085,-0.1257",
+        "timezone": "Europe/London"
+    }
+
+
+def stt_body(transcript):
+    """
+    Builds a legacy Google speech API response: an empty result line, then the hypotheses.
+
+    Args:
+        transcript (str): Recognized text.
+
+    Returns:
+        str: Newline-delimited JSON body.
+    """
+    result = {"result": [{"alternative": [{"transcript": transcript, "confidence": 0.92}], "final": True}], "result_index": 0}
+    return '{"result":[]}\n' + json.dumps(result) + "\n"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Request lines go to the debug log, not stderr
+        logger.debug("Stand-in request | " + format, *args)
+
+    def _send_bytes(self, status, data, content_type, headers=None):
+        """
+        Writes a response.
+
+        Args:
+            status (int): HTTP status code.
+            data (bytes): Body.
+            content_type (str): Content-Type header.
+            headers (dict | None): Extra headers.
+
+        Returns:
+            None
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send(self, status, body, headers=None):
+        """
+        Writes a JSON response.
+
+        Args:
+            status (int): HTTP status code.
+            body (dict): JSON body.
+            headers (dict | None): Extra headers.
+
+        Returns:
+            None
+        """
+        self._send_bytes(status, json.dumps(body).encode("utf-8"), "application/json", headers)
+
+    def _handle(self):
+        """
+        Dispatches a request to its upstream after the injected delay or fault.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        parsed = urlparse(self.path)
+        upstream, _, path = parsed.path.lstrip("/").partition("/")
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = self.rfile.read(length) if length else b""
+
+        if upstream not in UPSTREAMS:
+            self._send(404, {"error": {"code": 404, "message": f"Unknown upstream {upstream}"}})
+            return
+
+        server = self.server.stand_in
+        fault = server.inject(upstream, len(payload))
+
+        if fault == "error":
+            self._send(500, {"error": {"code": 500, "message": "Injected failure", "status": "INTERNAL"}})
+            return
+        if fault == "throttle":
+            retry_after = server.profiles[upstream].retry_after
+            self._send(
+                429,
+                {"error": {"code": 429, "message": "Injected throttling", "status": "RESOURCE_EXHAUSTED"}},
+                {"Retry-After": f"{retry_after:g}"}
+            )
+            return
+        if fault == "malformed":
+            data, content_type = server.random_choice(MALFORMED_BODIES)
+            self._send_bytes(200, data, content_type)
+            return
+
+        query = parse_qs(parsed.query)
+
+        if upstream == "gemini" and path.endswith(":generateContent"):
+            try:
+                prompt = json.loads(payload)["contents"][0]["parts"][0]["text"]
+            except (ValueError, KeyError, IndexError):
+                self._send(400, {"error": {"code": 400, "message": "Invalid request body", "status": "INVALID_ARGUMENT"}})
+                return
+            self._send(200, gemini_body(prompt))
+        elif upstream == "weather" and path == "current.json":
+            self._send(200, weather_body(query.get("q", ["London"])[0]))
+        elif upstream == "news" and path == "top-headlines":
+            self._send(200, news_body())
+        elif upstream == "ipinfo" and path == "json":
+            self._send(200, ipinfo_body())
+        elif upstream == "stt" and path == "recognize":
+            self._send_bytes(200, stt_body(server.transcript).encode("utf-8"), "application/json; charset=utf-8")
+        else:
+            self._send(404, {"error": {"code": 404, "message": f"Unknown path {parsed.path}"}})
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class StandInServer:
+    def __init__(self, profiles=None, host="127.0.0.1", port=0, seed=None, transcript=DEFAULT_TRANSCRIPT):
+        """
+        Initializes a local HTTP server that stands in for the upstream APIs.
+
+        Args:
+            profiles (dict | None): Upstream name to UpstreamProfile, missing ones answer immediately.
+            host (str): Interface to bind.
+            port (int): Port to bind, 0 picks a free one.
+            seed (int | None): Seed for latency and fault sampling, for repeatable runs.
+            transcript (str): Text the STT stand-in recognizes in every request.
+
+        Returns:
+            None
+        """
+        self.profiles = {name: UpstreamProfile() for name in UPSTREAMS}
+        self.profiles.update(profiles or {})
+        self.transcript = transcript
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = defaultdict(lambda: defaultdict(int))
+
+        self.httpd = ThreadingHTTPServer((host, port), _StandInHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stand_in = self
+        self.thread = None
+
+    @property
+    def url(self):
+        """
+        Returns the server root URL.
+
+        Args:
+            None
+
+        Returns:
+            str: URL such as "http://127.0.0.1:8123".
+        """
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_urls(self):
+        """
+        Returns the base-URL settings that point every client at this server.
+
+        Args:
+            None
+
+        Returns:
+            dict: Environment variable to URL.
+        """
+        return {setting: f"{self.url}/{upstream}" for upstream, setting in BASE_URL_SETTINGS.items()}
+
+    def random_choice(self, options):
+        """
+        Picks an option with the server's seeded sampler.
+
+        Args:
+            options (tuple): Options.
+
+        Returns:
+            object: Chosen option.
+        """
+        with self.lock:
+            return self.random.choice(options)
+
+    def inject(self, upstream, body_bytes=0):
+        """
+        Applies the configured latency and decides the request's fault.
+
+        Args:
+            upstream (str): Upstream name.
+            body_bytes (int): Request body size, charged against the simulated uplink.
+
+        Returns:
+            str | None: Fault name from UpstreamProfile.sample_fault, or None.
+        """
+        profile = self.profiles[upstream]
+
+        # Sampling is serialized so a seeded run draws the same sequence for the same request order
+        with self.lock:
+            delay = profile.sample_latency(self.random)
+            if profile.upload_kbps:
+                delay += body_bytes * 8 / profile.upload_kbps
+            fault = profile.sample_fault(self.random)
+            self.counts[upstream]["requests"] += 1
+            if fault is not None:
+                self.counts[upstream][fault] += 1
+
+        if delay:
+            time.sleep(delay / 1000)
+        return fault
+
+    def stats(self):
+        """
+        Returns request and injected fault counts per upstream.
+
+        Args:
+            None
+
+        Returns:
+            dict: Upstream name to counters.
+        """
+        with self.lock:
+            return {upstream: dict(counts) for upstream, counts in self.counts.items()}
+
+    def start(self):
+        """
+        Serves requests on a background thread.
+
+        Args:
+            None
+
+        Returns:
+            StandInServer: self, for chaining.
+        """
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True, name="StandInServer")
+        self.thread.start()
+        logger.info("Stand-in upstreams listening on %s", self.url)
+        return self
+
+    def stop(self):
+        """
+        Stops serving and closes the socket.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve latency and fault injecting stand-ins for every upstream API.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8750, help="Port to bind")
+    parser.add_argument("--profiles", help="JSON scenario file with per-upstream profiles")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for repeatable latency and faults")
+    parser.add_argument("--transcript", default=DEFAULT_TRANSCRIPT, help="Text returned by the STT stand-in")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    server = StandInServer(
+        load_profiles(args.profiles) if args.profiles else None,
+        host=args.host,
+        port=args.port,
+        seed=args.seed,
+        transcript=args.transcript
+    ).start()
+
+    print("Point the assistant at the stand-ins with:")
+    for setting, url in server.base_urls().items():
+        print(f"  {setting}={url}")
+
+    try:
+        while True:
+            time.sleep(10)
+            logger.info("Requests so far: %s", server.stats())
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,150 @@
+import logging
+import time
+
+import speech_recognition
+
+from core.audio_dsp import pcm_to_float, float_to_pcm16, speech_bounds, resample
+from core.audio_enhance import enhance as enhance_audio
+
+logger = logging.getLogger(__name__)
+
+# Google's speech models are trained on 16 kHz audio, higher rates only add upload bytes
+STT_SAMPLE_RATE = 16000
+
+# Audio kept around the first and last speech frame when trimming
+TRIM_PADDING_SECONDS = 0.15
+
+
+def prepare_audio(audio, energy_threshold, target_rate=STT_SAMPLE_RATE, trim=True, enhance=False):
+    """
+    Shrinks captured audio before it is FLAC-encoded and uploaded for STT.
+
+    Leading and trailing silence is trimmed and the audio is resampled to
+    16 kHz, 16-bit mono (microphone captures are already mono). With enhance,
+    the noise suppression and AGC stage of core.audio_enhance runs on the
+    whole capture first, so its noise estimate still sees the silence that
+    trimming removes.
+
+    Args:
+        audio (speech_recognition.AudioData): Captured utterance.
+        energy_threshold (float): Speech energy threshold used for trimming.
+        target_rate (int): Upload sample rate; higher rates are never upsampled.
+        trim (bool): Trim leading and trailing silence.
+        enhance (bool): Apply high-pass, noise suppression and AGC.
+
+    Returns:
+        tuple: (AudioData, stats) where stats holds raw and prepared PCM byte
+               counts, durations and the preparation time in ms.
+    """
+    started = time.perf_counter()
+
+    samples = pcm_to_float(audio.frame_data, audio.sample_width)
+    start, end = speech_bounds(samples, audio.sample_rate, energy_threshold, TRIM_PADDING_SECONDS) if trim else (0, len(samples))
+
+    rate = min(audio.sample_rate, target_rate)
+    if enhance:
+        # Bounds come from the raw capture, the AGC changes levels the threshold refers to
+        processed = enhance_audio(resample(samples, audio.sample_rate, rate), rate)
+        processed = processed[start * rate // audio.sample_rate:end * rate // audio.sample_rate]
+    else:
+        processed = resample(samples[start:end], audio.sample_rate, rate)
+    prepared = speech_recognition.AudioData(float_to_pcm16(processed), rate, 2)
+
+    stats = {
+        "raw_bytes": len(audio.frame_data),
+        "sent_bytes": len(prepared.frame_data),
+        "raw_seconds": round(len(samples) / audio.sample_rate, 2),
+        "sent_seconds": round((end - start) / audio.sample_rate, 2),
+        "prep_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+    return prepared, stats
+
+
+def flac_size(audio):
+    """
+    Returns the size of the FLAC body speech_recognition would upload for some audio.
+
+    Args:
+        audio (speech_recognition.AudioData): Audio.
+
+    Returns:
+        int: Encoded bytes.
+    """
+    return len(audio.get_flac_data(convert_rate=None if audio.sample_rate >= 8000 else 8000, convert_width=2))
+
+
+if __name__ == "__main__":
+    import argparse
+    import glob
+    import wave
+
+    import numpy as np
+
+    from core.recognizer import Recognizer
+
+    parser = argparse.ArgumentParser(description="Compare raw and trimmed/resampled STT uploads on recordings.")
+    parser.add_argument("wavs", nargs="*", help="Mono WAV recordings")
+    parser.add_argument("--captures", help="Also use turns from a capture directory (see core.turn_capture)")
+    parser.add_argument("--energy-threshold", type=float, default=300, help="Speech threshold used for trimming")
+    parser.add_argument("--stt", action="store_true", help="Also time both uploads against the STT endpoint (STT_BASE_URL)")
+    args = parser.parse_args()
+
+    clips = []
+    for pattern in args.wavs:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            with wave.open(path, "rb") as file:
+                if file.getnchannels() != 1:
+                    print(f"Skipping {path}: not mono")
+                    continue
+                clips.append((path, speech_recognition.AudioData(file.readframes(file.getnframes()), file.getframerate(), file.getsampwidth())))
+
+    if args.captures:
+        from core.turn_capture import iter_turns, load_audio
+
+        for record in iter_turns(args.captures):
+            audio = load_audio(record, args.captures)
+            if audio is not None:
+                clips.append((record["id"], audio))
+
+    recognizer = Recognizer() if args.stt else None
+
+    def timed_stt(audio):
+        # Straight to the backend, bypassing the recognizer's own preparation
+        endpoint = f"{recognizer.settings.current.stt_base_url}/recognize"
+        started = time.perf_counter()
+        try:
+            text = recognizer.recognizer.recognize_google(audio, endpoint=endpoint)
+        except (speech_recognition.UnknownValueError, speech_recognition.RequestError, ValueError):
+            text = None
+        return text, (time.perf_counter() - started) * 1000
+
+    rows = []
+    print(f"{'clip':32} {'raw KB':>8} {'sent KB':>8} {'saved':>6} {'prep ms':>8} {'raw stt':>8} {'sent stt':>9}  notes")
+    for name, audio in clips:
+        prepared, stats = prepare_audio(audio, args.energy_threshold)
+        raw_size, sent_size = flac_size(audio), flac_size(prepared)
+        row = {"raw": raw_size, "sent": sent_size, "prep": stats["prep_ms"]}
+        note = ""
+
+        if recognizer is not None:
+            raw_text, row["raw_ms"] = timed_stt(audio)
+            sent_text, row["sent_ms"] = timed_stt(prepared)
+            if raw_text != sent_text:
+                note = f"transcripts differ: {raw_text!r} vs {sent_text!r}"
+
+        rows.append(row)
+        print(
+            f"{name[-32:]:32} {raw_size / 1024:8.1f} {sent_size / 1024:8.1f} {1 - sent_size / raw_size:6.0%} {stats['prep_ms']:8.1f} "
+            f"{row.get('raw_ms', float('nan')):8.0f} {row.get('sent_ms', float('nan')):9.0f}  {note}"
+        )
+
+    if rows:
+        raw_total = sum(row["raw"] for row in rows)
+        sent_total = sum(row["sent"] for row in rows)
+        print(f"\n{len(rows)} clips: FLAC upload {raw_total / 1024:.0f} KB -> {sent_total / 1024:.0f} KB ({1 - sent_total / raw_total:.0%} saved), "
+              f"mean preparation {np.mean([row['prep'] for row in rows]):.1f} ms")
+        if recognizer is not None:
+            raw_ms = np.array([row["raw_ms"] for row in rows])
+            sent_ms = np.array([row["sent_ms"] for row in rows])
+            print(f"STT latency: raw mean {raw_ms.mean():.0f} ms, prepared mean {sent_ms.mean():.0f} ms, "
+                  f"change {sent_ms.mean() + np.mean([row['prep'] for row in rows]) - raw_ms.mean():+.0f} ms per turn including preparation")
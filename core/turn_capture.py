@@ -0,0 +1,381 @@
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import wave
+
+import speech_recognition
+
+logger = logging.getLogger(__name__)
+
+# Segmented store of captured turns: raw PCM plus a JSONL index per segment
+DATA_DIR = os.path.join("data")
+CAPTURE_DIR = os.path.join(DATA_DIR, "captures")
+
+# A new segment is started once the current one reaches this size
+SEGMENT_BYTES = 16 * 1024 * 1024
+
+# Oldest segments are deleted to keep the whole store under this size
+MAX_CAPTURE_BYTES = 128 * 1024 * 1024
+
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{6})\.jsonl$")
+
+
+def segment_paths(directory, number):
+    """
+    Returns the audio and index file paths of a segment.
+
+    Args:
+        directory (str): Capture directory.
+        number (int): Segment number.
+
+    Returns:
+        tuple: (pcm_path, jsonl_path)
+    """
+    base = os.path.join(directory, f"segment-{number:06d}")
+    return base + ".pcm", base + ".jsonl"
+
+
+def list_segments(directory):
+    """
+    Lists segment numbers present in the capture directory, oldest first.
+
+    Args:
+        directory (str): Capture directory.
+
+    Returns:
+        list: Segment numbers.
+    """
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+
+    return sorted(int(match.group(1)) for match in map(SEGMENT_PATTERN.match, names) if match)
+
+
+class TurnCapture:
+    def __init__(self, directory=CAPTURE_DIR, segment_bytes=SEGMENT_BYTES, max_bytes=MAX_CAPTURE_BYTES):
+        """
+        Initializes the opt-in, size-capped store of captured turns.
+
+        Args:
+            directory (str): Capture directory.
+            segment_bytes (int): Size at which the current segment is closed.
+            max_bytes (int): Total size cap, enforced by dropping whole old segments.
+
+        Returns:
+            None
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.sequence = itertools.count()
+
+        os.makedirs(directory, exist_ok=True)
+        segments = list_segments(directory)
+        self.segment = segments[-1] if segments else 1
+
+        logger.debug("TurnCapture initialized | directory=%s segment=%s", directory, self.segment)
+
+    def _segment_size(self, number):
+        """
+        Returns the on-disk size of a segment.
+
+        Args:
+            number (int): Segment number.
+
+        Returns:
+            int: Bytes used by the segment's audio and index files.
+        """
+        size = 0
+        for path in segment_paths(self.directory, number):
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    def _rotate(self):
+        """
+        Starts a new segment when the current one is full and enforces the size cap.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        if self._segment_size(self.segment) < self.segment_bytes:
+            return
+
+        self.segment += 1
+        segments = list_segments(self.directory)
+        total = sum(self._segment_size(number) for number in segments)
+
+        for number in segments:
+            if total <= self.max_bytes - self.segment_bytes:
+                break
+
+            total -= self._segment_size(number)
+            for path in segment_paths(self.directory, number):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            logger.debug("Capture segment dropped | segment=%s", number)
+
+    def record(self, audio, transcript, intent_results=None, response=None, timings=None):
+        """
+        Appends one turn to the store.
+
+        Args:
+            audio (speech_recognition.AudioData | None): Captured utterance.
+            transcript (str | None): STT result, None if recognition failed.
+            intent_results (list | None): (intent, entities, confidence) tuples.
+            response (str | None): Routed response text.
+            timings (dict | None): Stage name to milliseconds.
+
+        Returns:
+            str | None: Turn identifier, or None if the turn could not be written.
+        """
+        raw = audio.get_raw_data() if audio is not None else b""
+        turn_id = f"{int(time.time() * 1000)}-{next(self.sequence)}"
+
+        try:
+            with self.lock:
+                self._rotate()
+                pcm_path, index_path = segment_paths(self.directory, self.segment)
+
+                with open(pcm_path, "ab") as file:
+                    offset = file.tell()
+                    file.write(raw)
+
+                record = {
+                    "id": turn_id,
+                    "segment": self.segment,
+                    "offset": offset,
+                    "length": len(raw),
+                    "rate": audio.sample_rate if audio is not None else None,
+                    "width": audio.sample_width if audio is not None else None,
+                    "transcript": transcript,
+                    "intents": [list(result) for result in intent_results or []],
+                    "response": response,
+                    "timings": timings or {}
+                }
+
+                with open(index_path, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(record, default=str, separators=(",", ":")) + "\n")
+
+        except OSError:
+            logger.warning("Could not capture turn to %s", self.directory)
+            return None
+
+        logger.debug("Turn captured | id=%s bytes=%s", turn_id, len(raw))
+        return turn_id
+
+
+def iter_turns(directory=CAPTURE_DIR):
+    """
+    Yields captured turn records, oldest first.
+
+    Args:
+        directory (str): Capture directory.
+
+    Returns:
+        generator: Turn record dicts.
+    """
+    for number in list_segments(directory):
+        _, index_path = segment_paths(directory, number)
+        try:
+            with open(index_path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # A torn final line after a crash is ignored
+                        continue
+        except OSError:
+            continue
+
+
+def load_audio(record, directory=CAPTURE_DIR):
+    """
+    Reads a captured turn's audio back.
+
+    Args:
+        record (dict): Turn record from iter_turns().
+        directory (str): Capture directory.
+
+    Returns:
+        speech_recognition.AudioData | None: The audio, or None if none was captured.
+    """
+    if not record.get("length"):
+        return None
+
+    pcm_path, _ = segment_paths(directory, record["segment"])
+    with open(pcm_path, "rb") as file:
+        file.seek(record["offset"])
+        raw = file.read(record["length"])
+
+    return speech_recognition.AudioData(raw, record["rate"], record["width"])
+
+
+def export_wav(record, path, directory=CAPTURE_DIR):
+    """
+    Writes a captured turn's audio to a standalone WAV file.
+
+    Args:
+        record (dict): Turn record from iter_turns().
+        path (str): Output WAV path.
+        directory (str): Capture directory.
+
+    Returns:
+        bool: True if audio was written.
+    """
+    audio = load_audio(record, directory)
+    if audio is None:
+        return False
+
+    with wave.open(path, "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(audio.sample_width)
+        file.setframerate(audio.sample_rate)
+        file.writeframes(audio.get_raw_data())
+
+    return True
+
+
+def replay(records, directory=CAPTURE_DIR, rerun_stt=False, route=False):
+    """
+    Re-runs captured turns through the current pipeline and compares the results.
+
+    Turns are replayed in order with a fresh conversation context, so follow-ups
+    resolve the same way they did live.
+
+    Args:
+        records (list): Turn records from iter_turns().
+        directory (str): Capture directory.
+        rerun_stt (bool): Transcribe the captured audio again instead of reusing the transcript.
+        route (bool): Also execute the routed skills (has side effects).
+
+    Returns:
+        list: Per-turn dicts with the captured and replayed intents and timings.
+    """
+    from core.context import ConversationContext
+    from core.intent_classifier import IntentEngine
+    from core.recognizer import Recognizer
+    from core.router import Router
+
+    # Replayed transcripts must not feed old labels back into the dataset or the index
+    engine = IntentEngine(record=False)
+    context = ConversationContext()
+    recognizer = Recognizer() if rerun_stt else None
+    router = Router() if route else None
+    results = []
+
+    try:
+        for record in records:
+            timings = {}
+            transcript = record.get("transcript")
+
+            if recognizer is not None:
+                audio = load_audio(record, directory)
+                if audio is not None:
+                    recognizer.timings = {}
+                    transcript = recognizer.transcribe(audio)
+                    timings.update(recognizer.timings)
+
+            if not transcript:
+                results.append({"id": record["id"], "transcript": transcript, "skipped": True})
+                continue
+
+            started = time.perf_counter()
+            intent_results = engine.classify(transcript, context)
+            timings["classify_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+            response = None
+            if router is not None:
+                started = time.perf_counter()
+                response = router.define_routes(intent_results)
+                timings["route_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+            captured_intents = [intent for intent, _, _ in record.get("intents", [])]
+            replayed_intents = [intent for intent, _, _ in intent_results]
+
+            results.append({
+                "id": record["id"],
+                "transcript": transcript,
+                "captured_transcript": record.get("transcript"),
+                "captured_intents": record.get("intents", []),
+                "replayed_intents": [list(result) for result in intent_results],
+                "intent_changed": captured_intents != replayed_intents,
+                "response": response,
+                "captured_timings": record.get("timings", {}),
+                "timings": timings
+            })
+
+    finally:
+        if router is not None:
+            router.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from core.logger_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="Inspect, export and replay captured turns.")
+    parser.add_argument("--directory", default=CAPTURE_DIR, help="Capture directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="List captured turns")
+    list_parser.add_argument("--limit", type=int, default=20, help="Show only the newest N turns")
+
+    export_parser = subparsers.add_parser("export", help="Write a turn's audio to a WAV file")
+    export_parser.add_argument("id", help="Turn identifier")
+    export_parser.add_argument("output", help="WAV file to write")
+
+    replay_parser = subparsers.add_parser("replay", help="Re-run turns through the current pipeline")
+    replay_parser.add_argument("ids", nargs="*", help="Turn identifiers (default: all)")
+    replay_parser.add_argument("--stt", action="store_true", help="Transcribe the captured audio again")
+    replay_parser.add_argument("--route", action="store_true", help="Also execute the routed skills")
+
+    args = parser.parse_args()
+    setup_logging()
+
+    turns = list(iter_turns(args.directory))
+
+    if args.command == "list":
+        for turn in turns[-args.limit:]:
+            intents = ", ".join(intent for intent, _, _ in turn.get("intents", [])) or "-"
+            print(f"{turn['id']}  {turn.get('transcript')!r:40}  {intents:30}  {turn.get('timings')}")
+
+    elif args.command == "export":
+        matches = [turn for turn in turns if turn["id"] == args.id]
+        if not matches or not export_wav(matches[0], args.output, args.directory):
+            raise SystemExit(f"No captured audio for turn {args.id}")
+        print(f"Wrote {args.output}")
+
+    else:
+        selected = [turn for turn in turns if not args.ids or turn["id"] in args.ids]
+        results = replay(selected, args.directory, rerun_stt=args.stt, route=args.route)
+
+        for result in results:
+            if result.get("skipped"):
+                print(f"{result['id']}  skipped (no transcript)")
+                continue
+
+            marker = "CHANGED" if result["intent_changed"] else "same"
+            print(f"{result['id']}  {marker:7}  {result['transcript']!r}")
+            print(f"    captured: {result['captured_intents']}  {result['captured_timings']}")
+            print(f"    replayed: {result['replayed_intents']}  {result['timings']}")
+
+        changed = sum(1 for result in results if result.get("intent_changed"))
+        print(f"Replayed {len(results)} turns, {changed} with different intents")
@@ -0,0 +1,415 @@
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from core.local_classifier import extract_entities
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    # Optional dependency, hashed character n-grams are used when it is missing
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+# Persisted matrix (memory-mapped on load) and row labels
+DATA_DIR = os.path.join("data")
+MATRIX_FILE = os.path.join(DATA_DIR, "intent_index.npy")
+LABELS_FILE = os.path.join(DATA_DIR, "intent_index.json")
+
+# Small CPU sentence-embedding model used when sentence-transformers is installed
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Dimensions of the fallback hashed n-gram embedding
+HASH_DIMENSIONS = 1024
+
+# A neighbor this similar decides the intent without calling the LLM
+INTENT_SIMILARITY = 0.9
+
+# Only high-confidence LLM classifications grow the index
+GROW_CONFIDENCE = 0.9
+
+# Rows added before the index is written back to disk
+SAVE_EVERY = 10
+
+# Smallest row capacity allocated once the index grows in memory
+MIN_CAPACITY = 64
+
+# Intents whose skills take no entities, so intent alone is enough
+ENTITY_FREE_INTENTS = {"joke", "news", "location", "courtesy", "exit"}
+
+# Compound commands must go to the LLM so no part is lost
+COMPOUND_PATTERN = re.compile(r"\b(?:and|then|also|plus)\b")
+
+FEW_SHOT_PATTERN = re.compile(r'Input: "(.*)"\s*\n\s*Output: (\{.*\})')
+
+
+class HashingEmbedder:
+    def __init__(self, dimensions=HASH_DIMENSIONS):
+        """
+        Initializes a dependency-free embedding from hashed character trigrams.
+
+        Args:
+            dimensions (int): Output vector size.
+
+        Returns:
+            None
+        """
+        self.dimensions = dimensions
+
+    def encode(self, texts):
+        """
+        Embeds texts as L2-normalized hashed trigram count vectors.
+
+        Args:
+            texts (list): Strings to embed.
+
+        Returns:
+            numpy.ndarray: float32 matrix of shape (len(texts), dimensions).
+        """
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            text = f"  {text.lower().strip()}  "
+            buckets = [zlib.crc32(text[i:i + 3].encode("utf-8")) % self.dimensions for i in range(len(text) - 2)]
+            matrix[row] = np.bincount(buckets, minlength=self.dimensions)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-9)
+
+
+class SentenceEmbedder:
+    def __init__(self, model_name=EMBEDDING_MODEL):
+        """
+        Initializes a small sentence-transformers model on CPU.
+
+        Args:
+            model_name (str): Hugging Face model identifier.
+
+        Returns:
+            None
+        """
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+    def encode(self, texts):
+        """
+        Embeds texts as L2-normalized sentence vectors.
+
+        Args:
+            texts (list): Strings to embed.
+
+        Returns:
+            numpy.ndarray: float32 matrix of shape (len(texts), dimensions).
+        """
+        return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+def default_embedder():
+    """
+    Returns the sentence-transformers embedder if installed, else the hashing one.
+
+    Args:
+        None
+
+    Returns:
+        object: Embedder with an encode(texts) method.
+    """
+    if SentenceTransformer is not None:
+        try:
+            return SentenceEmbedder()
+        except Exception:
+            logger.exception("Sentence embedding model unavailable, using hashed n-grams")
+
+    return HashingEmbedder()
+
+
+def parse_few_shot_examples(prompt):
+    """
+    Extracts labeled Input/Output examples from the classification prompt.
+
+    Args:
+        prompt (str): Rendered classification prompt.
+
+    Returns:
+        list: (utterance, intent, entities) tuples for single-intent examples.
+    """
+    examples = []
+
+    for utterance, output in FEW_SHOT_PATTERN.findall(prompt):
+        try:
+            data = json.loads(output)
+        except ValueError:
+            continue
+
+        # Unknown examples describe what to reject, not commands worth matching
+        if utterance and isinstance(data, dict) and data.get("intent") not in (None, "unknown"):
+            examples.append((utterance.lower(), data["intent"], data.get("entities", {})))
+
+    return examples
+
+
+class IntentVectorIndex:
+    def __init__(self, embedder=None, matrix_file=MATRIX_FILE, labels_file=LABELS_FILE):
+        """
+        Loads (memory-mapped) or creates the nearest-neighbor intent index.
+
+        Args:
+            embedder (object | None): Object with encode(texts), defaults to default_embedder().
+            matrix_file (str): .npy file holding the embedding matrix.
+            labels_file (str): JSON file holding utterance, intent and entities per row.
+
+        Returns:
+            None
+        """
+        self.embedder = embedder or default_embedder()
+        self.matrix_file = matrix_file
+        self.labels_file = labels_file
+        self.lock = threading.Lock()
+        self.unsaved = 0
+
+        # Rows live in the first `rows` rows of `buffer`, which has spare capacity to grow into
+        self.buffer = None
+        self.rows = 0
+        self.labels = []
+
+        try:
+            with open(labels_file, encoding="utf-8") as file:
+                self.labels = json.load(file)
+            self.buffer = np.load(matrix_file, mmap_mode="r")
+        except (OSError, ValueError):
+            self.labels = []
+            self.buffer = None
+
+        # Discard an index produced by a different embedder or a torn write
+        probe_dimensions = self.embedder.encode(["probe"]).shape[1]
+        if self.buffer is not None and (self.buffer.shape[0] != len(self.labels) or self.buffer.shape[1] != probe_dimensions):
+            logger.warning("Intent index does not match the current embedder, rebuilding")
+            self.labels = []
+            self.buffer = None
+
+        self.rows = len(self.labels) if self.buffer is not None else 0
+
+        logger.debug("IntentVectorIndex initialized | rows=%s", len(self.labels))
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def matrix(self):
+        """
+        Returns the filled rows of the embedding buffer.
+
+        Args:
+            None
+
+        Returns:
+            numpy.ndarray | None: View of shape (rows, dimensions), or None if the index is empty.
+        """
+        return self.buffer[:self.rows] if self.buffer is not None else None
+
+    def seed(self, examples, save=True):
+        """
+        Adds labeled examples, typically the prompt's few-shot examples.
+
+        Args:
+            examples (list): (utterance, intent, entities) tuples.
+            save (bool): Persist the grown index to disk.
+
+        Returns:
+            None
+        """
+        known = {label["utterance"] for label in self.labels}
+        examples = [example for example in examples if example[0] not in known]
+        if not examples:
+            return
+
+        vectors = self.embedder.encode([utterance for utterance, _, _ in examples])
+        with self.lock:
+            self._append(vectors, examples)
+        if save:
+            self.save()
+
+    def _append(self, vectors, examples):
+        """
+        Appends embedded rows and their labels (caller holds the lock).
+
+        Rows are written into spare buffer capacity; when it runs out the
+        buffer doubles, so adding one row at a time stays amortized O(1)
+        instead of copying the whole matrix on every add. The memory-mapped
+        file loaded at startup is copied once, on the first growth.
+
+        Args:
+            vectors (numpy.ndarray): Embeddings of the examples.
+            examples (list): (utterance, intent, entities) tuples.
+
+        Returns:
+            None
+        """
+        needed = self.rows + len(vectors)
+        if self.buffer is None or needed > self.buffer.shape[0]:
+            capacity = max(needed, MIN_CAPACITY, 2 * self.rows)
+            buffer = np.empty((capacity, vectors.shape[1]), dtype=np.float32)
+            if self.rows:
+                buffer[:self.rows] = self.buffer[:self.rows]
+            self.buffer = buffer
+
+        self.buffer[self.rows:needed] = vectors
+        self.rows = needed
+        for utterance, intent, entities in examples:
+            self.labels.append({"utterance": utterance, "intent": intent, "entities": entities})
+
+    def search(self, text):
+        """
+        Finds the most similar indexed utterance by brute-force cosine similarity.
+
+        Args:
+            text (str): Query utterance.
+
+        Returns:
+            tuple | None: (label dict, similarity), or None if the index is empty.
+        """
+        query = self.embedder.encode([text.lower().strip()])[0]
+
+        with self.lock:
+            if not self.rows:
+                return None
+
+            # Rows are normalized, so the dot product is the cosine similarity
+            scores = self.matrix @ query
+            best = int(np.argmax(scores))
+            return self.labels[best], float(scores[best])
+
+    def lookup(self, text):
+        """
+        Classifies a command from its nearest neighbor when it is similar enough.
+
+        The neighbor decides the intent only. Its entities are reused for the
+        same utterance alone; otherwise they are extracted from the command by
+        the intent's local rule, since "timer for 5 minutes" and "timer for 15
+        minutes" are near neighbors with different entities.
+
+        Args:
+            text (str): Raw user command.
+
+        Returns:
+            tuple | None: (intent, entities, confidence), or None to defer to the LLM.
+        """
+        if COMPOUND_PATTERN.search(text.lower()):
+            return None
+
+        hit = self.search(text)
+        if hit is None:
+            return None
+
+        label, similarity = hit
+        intent = label["intent"]
+        if similarity < INTENT_SIMILARITY:
+            return None
+
+        if intent in ENTITY_FREE_INTENTS:
+            entities = {}
+        elif " ".join(text.lower().split()) == " ".join(label["utterance"].split()):
+            entities = dict(label["entities"])
+        else:
+            entities = extract_entities(intent, text)
+            if entities is None:
+                return None
+
+        logger.debug("Vector index hit | intent=%s similarity=%.3f neighbor=%s", intent, similarity, label["utterance"])
+        return intent, entities, round(similarity, 3)
+
+    def add(self, text, intent, entities):
+        """
+        Grows the index with a confirmed live classification.
+
+        Args:
+            text (str): Raw user command.
+            intent (str): Classified intent.
+            entities (dict): Extracted entities.
+
+        Returns:
+            None
+        """
+        text = text.lower().strip()
+        vector = self.embedder.encode([text])
+
+        with self.lock:
+            if any(label["utterance"] == text for label in self.labels):
+                return
+            self._append(vector, [(text, intent, entities)])
+            self.unsaved += 1
+            should_save = self.unsaved >= SAVE_EVERY
+
+        if should_save:
+            self.save()
+
+    def save(self):
+        """
+        Writes the matrix and labels to disk.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if not self.rows:
+                return
+            # Copied under the lock, later adds write into the shared buffer
+            matrix = np.array(self.matrix)
+            labels = list(self.labels)
+            self.unsaved = 0
+
+        try:
+            os.makedirs(os.path.dirname(self.matrix_file) or ".", exist_ok=True)
+
+            # np.save appends .npy, so the temporary name must already end with it
+            temp_matrix = self.matrix_file[:-4] + ".tmp.npy"
+            np.save(temp_matrix, matrix)
+            os.replace(temp_matrix, self.matrix_file)
+
+            with open(self.labels_file + ".tmp", "w", encoding="utf-8") as file:
+                json.dump(labels, file)
+            os.replace(self.labels_file + ".tmp", self.labels_file)
+
+        except OSError:
+            logger.warning("Could not persist intent index to %s", self.matrix_file)
+
+
+if __name__ == "__main__":
+    import time
+    import random
+
+    from core.intent_classifier import IntentEngine
+
+    examples = parse_few_shot_examples(IntentEngine.build_prompt(None, ""))
+    embedder = default_embedder()
+    print(f"Embedder: {type(embedder).__name__} | few-shot examples: {len(examples)}")
+
+    # Synthetic growth to see how cost scales with the number of stored utterances
+    for size in (len(examples), 1000, 10000):
+        rows = list(examples)
+        while len(rows) < size:
+            utterance, intent, entities = random.choice(examples)
+            rows.append((f"{utterance} {random.randint(0, 10 ** 6)}", intent, entities))
+
+        index = IntentVectorIndex(embedder, matrix_file=os.devnull + ".npy", labels_file=os.devnull)
+        index.labels, index.buffer, index.rows = [], None, 0
+
+        started = time.perf_counter()
+        index._append(embedder.encode([row[0] for row in rows]), rows)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        queries = [random.choice(rows)[0] for _ in range(200)]
+        started = time.perf_counter()
+        for query in queries:
+            index.lookup(query)
+        query_us = (time.perf_counter() - started) / len(queries) * 1e6
+
+        print(f"rows={size} build_ms={build_ms:.1f} query_us={query_us:.0f} matrix_kb={index.matrix.nbytes / 1024:.0f}")
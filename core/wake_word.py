@@ -0,0 +1,454 @@
+import importlib.util
+import logging
+import math
+import re
+import time
+import wave
+from array import array
+from collections import deque
+
+import speech_recognition
+
+try:
+    import webrtcvad
+except ImportError:
+    # Optional dependency, the energy detector is used when it is missing
+    webrtcvad = None
+
+logger = logging.getLogger(__name__)
+
+# Phrase that wakes the assistant (must exist in the PocketSphinx dictionary)
+WAKE_WORD = "computer"
+
+# 0 = fewer false accepts, 1 = fewer false rejects
+WAKE_WORD_SENSITIVITY = 0.8
+
+# Audio format consumed by the gate (16-bit mono PCM)
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+# Frame size accepted by both the energy detector and WebRTC VAD
+FRAME_MS = 30
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+
+# Voiced frames required to open a segment and silent frames required to close it
+START_FRAMES = 3
+HANGOVER_FRAMES = 10
+
+# Silence kept before a segment so the wake word onset is not clipped
+PRE_ROLL_FRAMES = 8
+
+# Wake words are short, anything longer is cut off at this length
+MAX_SEGMENT_FRAMES = 2000 // FRAME_MS
+
+# Energy detector tuning
+MIN_ENERGY = 200
+ENERGY_RATIO = 2.5
+NOISE_FLOOR_DECAY = 0.95
+
+
+class EnergyVAD:
+    def __init__(self, min_energy=MIN_ENERGY, ratio=ENERGY_RATIO, aggressiveness=2):
+        """
+        Initializes a frame-level voice activity detector.
+
+        Uses WebRTC VAD when installed, otherwise an adaptive RMS energy threshold.
+
+        Args:
+            min_energy (int): Absolute RMS floor below which frames are never voiced.
+            ratio (float): How far above the running noise floor a frame must be.
+            aggressiveness (int): WebRTC VAD mode from 0 (lenient) to 3 (strict).
+
+        Returns:
+            None
+        """
+        self.min_energy = min_energy
+        self.ratio = ratio
+        self.noise_floor = float(min_energy)
+        self.webrtc = webrtcvad.Vad(aggressiveness) if webrtcvad is not None else None
+
+        logger.debug("EnergyVAD initialized | backend=%s", "webrtc" if self.webrtc else "energy")
+
+    def is_speech(self, frame):
+        """
+        Decides whether a single PCM frame contains speech.
+
+        Args:
+            frame (bytes): FRAME_MS of 16-bit mono PCM audio.
+
+        Returns:
+            bool: True if the frame is voiced.
+        """
+        if self.webrtc is not None:
+            return self.webrtc.is_speech(frame, SAMPLE_RATE)
+
+        samples = array("h", frame)
+        if not samples:
+            return False
+
+        rms = math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+        voiced = rms > max(self.min_energy, self.noise_floor * self.ratio)
+
+        # Track background noise only on unvoiced frames so speech does not raise the floor
+        if not voiced:
+            self.noise_floor = NOISE_FLOOR_DECAY * self.noise_floor + (1 - NOISE_FLOOR_DECAY) * rms
+
+        return voiced
+
+
+class WakeWordDetector:
+    def __init__(self, wake_word=WAKE_WORD, sensitivity=WAKE_WORD_SENSITIVITY):
+        """
+        Initializes the offline keyword spotter used to confirm the wake word.
+
+        Args:
+            wake_word (str): Phrase to listen for.
+            sensitivity (float): PocketSphinx keyword sensitivity between 0 and 1.
+
+        Returns:
+            None
+        """
+        self.wake_word = wake_word
+        self.sensitivity = sensitivity
+        self.recognizer = speech_recognition.Recognizer()
+
+        # Probed up front, so a missing PocketSphinx never swallows the first utterance
+        self.available = importlib.util.find_spec("pocketsphinx") is not None
+        if not self.available:
+            logger.warning("Offline wake word detection unavailable: pocketsphinx is not installed")
+
+    def detect(self, pcm):
+        """
+        Checks whether a voiced segment contains the wake word.
+
+        Args:
+            pcm (bytes): 16-bit mono PCM audio of a single voiced segment.
+
+        Returns:
+            bool: True if the wake word was spotted.
+        """
+        audio = speech_recognition.AudioData(pcm, SAMPLE_RATE, SAMPLE_WIDTH)
+
+        try:
+            # Keyword spotting runs fully offline through PocketSphinx
+            hypothesis = self.recognizer.recognize_sphinx(
+                audio,
+                keyword_entries=[(self.wake_word, self.sensitivity)]
+            )
+
+        except speech_recognition.UnknownValueError:
+            return False
+
+        except speech_recognition.RequestError as e:
+            # PocketSphinx is not installed or its model is missing
+            logger.warning("Offline wake word detection unavailable: %s", e)
+            self.available = False
+            return False
+
+        return self.wake_word in hypothesis.lower()
+
+
+class WakeWordGate:
+    def __init__(self, vad=None, detector=None):
+        """
+        Initializes the always-on listening front end.
+
+        Args:
+            vad (EnergyVAD | None): Frame-level voice activity detector.
+            detector (WakeWordDetector | None): Offline wake word spotter.
+
+        Returns:
+            None
+        """
+        self.vad = vad or EnergyVAD()
+        self.detector = detector or WakeWordDetector()
+
+        # Segment that contained the wake word, often followed by the command in the same breath
+        self.wake_audio = b""
+        self.reset_stats()
+        logger.debug("WakeWordGate initialized | wake_word=%s", self.detector.wake_word)
+
+    @property
+    def enabled(self):
+        """
+        Reports whether gating is active.
+
+        Args:
+            None
+
+        Returns:
+            bool: False once the offline detector turned out to be unavailable.
+        """
+        return self.detector.available
+
+    def reset_stats(self):
+        """
+        Clears the CPU and acceptance counters.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.stats = {
+            "frames": 0,
+            "voiced_frames": 0,
+            "segments": 0,
+            "accepts": 0,
+            "cpu_seconds": 0.0
+        }
+
+    def segments(self, frames):
+        """
+        Groups a stream of PCM frames into voiced segments.
+
+        Args:
+            frames (iterable): FRAME_MS sized chunks of 16-bit mono PCM audio.
+
+        Returns:
+            generator: Bytes of each voiced segment, including a short pre-roll.
+        """
+        pre_roll = deque(maxlen=PRE_ROLL_FRAMES)
+        segment = []
+        voiced_run = 0
+        silent_run = 0
+
+        for frame in frames:
+            started = time.process_time()
+            self.stats["frames"] += 1
+            voiced = self.vad.is_speech(frame)
+            self.stats["cpu_seconds"] += time.process_time() - started
+
+            if voiced:
+                self.stats["voiced_frames"] += 1
+
+            if not segment:
+                pre_roll.append(frame)
+                voiced_run = voiced_run + 1 if voiced else 0
+
+                # Require a short run of voiced frames to ignore clicks and pops
+                if voiced_run >= START_FRAMES:
+                    segment = list(pre_roll)
+                    pre_roll.clear()
+                    silent_run = 0
+                continue
+
+            segment.append(frame)
+            silent_run = 0 if voiced else silent_run + 1
+
+            if silent_run >= HANGOVER_FRAMES or len(segment) >= MAX_SEGMENT_FRAMES:
+                self.stats["segments"] += 1
+                yield b"".join(segment)
+                segment = []
+                voiced_run = 0
+
+        if segment:
+            self.stats["segments"] += 1
+            yield b"".join(segment)
+
+    def listen(self, frames):
+        """
+        Consumes frames until the wake word is heard or the stream ends.
+
+        If the detector fails on a segment, the segment is kept in wake_audio
+        anyway: gating is off from then on and it may hold the command.
+
+        Args:
+            frames (iterable): FRAME_MS sized chunks of 16-bit mono PCM audio.
+
+        Returns:
+            bool: True if the wake word was heard.
+        """
+        for segment in self.segments(frames):
+            started = time.process_time()
+            accepted = self.detector.detect(segment)
+            self.stats["cpu_seconds"] += time.process_time() - started
+
+            if not self.enabled:
+                self.wake_audio = segment
+                return False
+
+            if accepted:
+                self.stats["accepts"] += 1
+                self.wake_audio = segment
+                logger.info("Wake word detected")
+                return True
+
+        return False
+
+    def wait_for_wake_word(self, source=None):
+        """
+        Blocks on the microphone until the wake word is spoken.
+
+        Args:
+            source (speech_recognition.Microphone | None): Open microphone from
+                open_microphone(), left open so the caller keeps listening for
+                the command without a gap; a private one is opened when None.
+
+        Returns:
+            bool: True if the wake word was heard, False if gating is unavailable.
+        """
+        self.wake_audio = b""
+        if not self.enabled:
+            return False
+
+        if source is not None:
+            logger.debug("Waiting for wake word...")
+            heard = self.listen(microphone_frames(source))
+        else:
+            with open_microphone() as source:
+                logger.debug("Waiting for wake word...")
+                heard = self.listen(microphone_frames(source))
+
+        logger.debug("Wake gate stats | %s", self.report())
+        return heard
+
+    def report(self):
+        """
+        Summarizes CPU cost and activity of the gate.
+
+        Args:
+            None
+
+        Returns:
+            dict: Counters plus audio seconds processed and CPU usage percentage.
+        """
+        audio_seconds = self.stats["frames"] * FRAME_MS / 1000
+        report = dict(self.stats)
+        report["audio_seconds"] = round(audio_seconds, 2)
+        report["cpu_percent"] = round(100 * self.stats["cpu_seconds"] / audio_seconds, 3) if audio_seconds else 0.0
+        return report
+
+
+def open_microphone():
+    """
+    Opens a microphone in the gate's audio format.
+
+    Args:
+        None
+
+    Returns:
+        speech_recognition.Microphone: Microphone to use as a context manager.
+    """
+    return speech_recognition.Microphone(sample_rate=SAMPLE_RATE, chunk_size=FRAME_SAMPLES)
+
+
+def split_frames(pcm):
+    """
+    Splits PCM audio into the gate's fixed-size frames.
+
+    Args:
+        pcm (bytes): 16-bit mono PCM audio.
+
+    Returns:
+        list: FRAME_MS chunks; a trailing partial frame is dropped.
+    """
+    size = FRAME_SAMPLES * SAMPLE_WIDTH
+    return [pcm[offset:offset + size] for offset in range(0, len(pcm) - size + 1, size)]
+
+
+def strip_wake_word(text, wake_word=WAKE_WORD):
+    """
+    Removes the wake word from the start of a transcript.
+
+    Only the whole word is removed, so "computerized" is left untouched.
+
+    Args:
+        text (str): Lowercase transcript that may start with the wake word.
+        wake_word (str): Wake phrase.
+
+    Returns:
+        str: Remaining command, possibly empty.
+    """
+    match = re.match(rf"{re.escape(wake_word)}\b[\s,.!?]*", text)
+    return text[match.end():] if match else text
+
+
+def microphone_frames(source):
+    """
+    Yields fixed-size frames from an open speech_recognition microphone.
+
+    Args:
+        source (speech_recognition.Microphone): Microphone opened at SAMPLE_RATE.
+
+    Returns:
+        generator: FRAME_MS chunks of 16-bit mono PCM audio.
+    """
+    while True:
+        yield source.stream.read(FRAME_SAMPLES)
+
+
+def wav_frames(path):
+    """
+    Yields fixed-size frames from a recorded 16 kHz 16-bit mono WAV file.
+
+    Args:
+        path (str): Path to the WAV file.
+
+    Returns:
+        generator: FRAME_MS chunks of 16-bit mono PCM audio.
+    """
+    with wave.open(path, "rb") as wav:
+        if (wav.getframerate(), wav.getsampwidth(), wav.getnchannels()) != (SAMPLE_RATE, SAMPLE_WIDTH, 1):
+            raise ValueError(f"{path} must be 16 kHz, 16-bit, mono")
+
+        while True:
+            frame = wav.readframes(FRAME_SAMPLES)
+            if len(frame) < FRAME_SAMPLES * SAMPLE_WIDTH:
+                break
+            yield frame
+
+
+def evaluate(positive_paths, negative_paths, gate=None):
+    """
+    Measures accept rates and CPU cost of the gate on recorded WAV streams.
+
+    Args:
+        positive_paths (list): WAV files that contain the wake word.
+        negative_paths (list): WAV files of background speech and noise only.
+        gate (WakeWordGate | None): Gate to evaluate, a default one if None.
+
+    Returns:
+        dict: Detection rate, false accepts per hour and CPU usage.
+    """
+    gate = gate or WakeWordGate()
+    gate.reset_stats()
+
+    detected = sum(1 for path in positive_paths if gate.listen(wav_frames(path)))
+
+    # Every segment accepted in background audio counts as a false accept
+    false_accepts = 0
+    negative_seconds = 0.0
+    for path in negative_paths:
+        frames = list(wav_frames(path))
+        negative_seconds += len(frames) * FRAME_MS / 1000
+        stream = iter(frames)
+        while gate.listen(stream):
+            false_accepts += 1
+
+    report = gate.report()
+    report["detection_rate"] = round(detected / len(positive_paths), 3) if positive_paths else None
+    report["false_accepts"] = false_accepts
+    report["false_accepts_per_hour"] = round(false_accepts * 3600 / negative_seconds, 2) if negative_seconds else None
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from core.logger_config import setup_logging
+
+    setup_logging()
+
+    parser = argparse.ArgumentParser(description="Evaluate the wake word gate on recorded WAV files.")
+    parser.add_argument("--positive", nargs="*", default=[], help="WAV files containing the wake word")
+    parser.add_argument("--negative", nargs="*", default=[], help="WAV files without the wake word")
+    args = parser.parse_args()
+
+    if args.positive or args.negative:
+        print(evaluate(args.positive, args.negative))
+    else:
+        gate = WakeWordGate()
+        while gate.wait_for_wake_word():
+            print(f"Wake word heard | {gate.report()}")
@@ -1,9 +1,17 @@
 import logging
+import time
 
 from core.recognizer import Recognizer
-from core.speech import Speech
+from core.speech import Speech, SpeechOutput
+from core.event_bus import EventBus
 from core.intent_classifier import IntentEngine
 from core.router import Router
+from core.context import ConversationContext
+from core.wake_word import WakeWordGate
+from core.turn_capture import TurnCapture
+from core.settings import get_settings_store, SettingsError
+from core.profiler import SamplingProfiler, install_signal_handler, parse_profile_command
+from core.responses import get_renderer
 from core.logger_config import setup_logging
 
 from modules.greet import greet
@@ -11,32 +19,79 @@ from modules.greet import greet
 logger = logging.getLogger(__name__)
 
 def main():
+    # Validate every setting before any component starts, reporting all problems at once
+    try:
+        settings = get_settings_store()
+        settings.validate()
+    except SettingsError as e:
+        logger.error("%s", e)
+        raise SystemExit(1)
+
+    logger.info(settings.report())
+    settings.watch()
+
     logger.info("Assistly started")
     greeting = greet()
 
-    recognizer = Recognizer()
-    speaker = Speech()
-    intent = IntentEngine()
-    route = Router(speaker)
+    recognizer = Recognizer(wake_gate=WakeWordGate(), settings=settings)
+    # Turn responses and asynchronous announcements share one serialized speech output
+    bus = EventBus()
+    speaker = SpeechOutput(Speech(), bus)
+    intent = IntentEngine(settings=settings)
+    route = Router(speaker, settings=settings, bus=bus)
+    context = ConversationContext()
+    capture = None
+
+    # On-demand profiling of the live process: SIGUSR1 or the "debug profile" command
+    profiler = SamplingProfiler()
+    install_signal_handler(profiler)
 
     speaker.speak(greeting)
 
     while True:
         command = recognizer.recognize_command()
 
+        # Opt-in capture of audio, transcript, results and timings for the replay tool
+        if settings.current.capture and capture is None:
+            capture = TurnCapture()
+        elif not settings.current.capture:
+            capture = None
+
         # Skip processing if speech recognition failed
         if not command:
+            if capture is not None and recognizer.last_audio is not None:
+                capture.record(recognizer.last_audio, None, timings=recognizer.timings)
+            continue
+
+        # Diagnostics command, handled before classification so it never reaches the LLM
+        profile_seconds = parse_profile_command(command)
+        if profile_seconds is not None:
+            profiling = profiler.start(profile_seconds)
+            renderer = get_renderer()
+            speaker.speak(renderer.render("profile.started", seconds=profile_seconds) if profiling else renderer.render("profile.running"))
             continue
 
-        intent_result = intent.classify(command)
-        response = route.define_route(intent_result)
+        timings = dict(recognizer.timings)
+
+        started = time.perf_counter()
+        intent_results = intent.classify(command, context)
+        timings["classify_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        started = time.perf_counter()
+        response = route.define_routes(intent_results)
+        timings["route_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        if capture is not None:
+            capture.record(recognizer.last_audio, command, intent_results, response, timings)
 
         speaker.speak(response)
 
         # Exit loop when explicit termination intent is returned
-        if response == "Goodbye":
+        if route.exit_requested:
             break
-    
+
+    route.close()
+    bus.close()
     logger.info("Assistly stopped")
 
 
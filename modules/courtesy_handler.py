@@ -1,11 +1,13 @@
 import random
 
-# Predefined short acknowledgements for courtesy-style responses
+from core.responses import get_renderer
+
+# Template keys of the short acknowledgements for courtesy-style responses
 RESPONSES = [
-    "You're welcome.",
-    "No problem.",
-    "Anytime.",
-    "All good."
+    "courtesy.welcome",
+    "courtesy.no_problem",
+    "courtesy.anytime",
+    "courtesy.all_good"
 ]
 
 def handle_courtesy():
@@ -18,7 +20,7 @@ def handle_courtesy():
     Returns:
         str: A randomly selected courtesy response.
     """
-    return random.choice(RESPONSES)
+    return get_renderer().render(random.choice(RESPONSES))
 
 
 if __name__ == "__main__":
@@ -1,12 +1,14 @@
-from datetime import datetime
+from core.responses import ClockSnapshot, get_renderer
 
-def get_date_time(payload):
+def get_date_time(payload, clock=None, renderer=None):
     """
     Generates a human-readable response for requested date/time information.
 
     Args:
         payload (dict): Contains an "info_type" key with a list of requested items
                         such as ["time", "date", "day"].
+        clock (ClockSnapshot | None): Clock reading shared by the current turn.
+        renderer (Renderer | None): Locale renderer, defaults to the configured locale.
 
     Returns:
         str: A formatted sentence describing the requested date/time details.
@@ -15,12 +17,13 @@ def get_date_time(payload):
     # Default to all supported values if nothing specific is requested
     requested_info = payload.get("info_type", ["time", "date", "day"])
 
-    now = datetime.now()
+    clock = clock or ClockSnapshot()
+    renderer = renderer or get_renderer()
 
     info_map = {
-        "time": now.strftime("%I:%M %p"), # "10:30 PM"
-        "date": now.strftime("%B %d, %Y"), # "November 6, 2025"
-        "day": now.strftime("%A") # "Thursday"
+        "time": renderer.time, # "10:30 PM"
+        "date": renderer.date, # "November 06, 2025"
+        "day": renderer.day # "Thursday"
     }
 
     response = []
@@ -28,30 +31,14 @@ def get_date_time(payload):
     # Build response fragments in the order requested by the user
     for info in requested_info:
         if info in info_map:
-            value = info_map[info]
-
-            if info == "time":
-                response.append(f"The current time is {value}")
-            
-            elif info == "date":
-                response.append(f"Today's date is {value}")
-
-            elif info == "day":
-                response.append(f"The day is {value}")
+            response.append(renderer.render(f"date_time.{info}", **{info: info_map[info](clock)}))
 
     # Handle cases where no valid request types were provided
     if len(response) == 0:
-        return "I couldn't determine what date/time information you need."
-    
+        return renderer.render("date_time.unknown")
+
     # Join fragments into a grammatically correct sentence
-    elif len(response) == 1:
-        return response[0] + "."
-    
-    elif len(response) == 2:
-        return response[0] + " and " + response[1] + "."
-    
-    else:
-        return response[0] + ", " + response[1] + " and " + response[2] + "."
+    return renderer.join(response) + "."
 
 
 if __name__ == "__main__":
@@ -1,25 +1,26 @@
-from datetime import datetime
+from core.responses import ClockSnapshot, get_renderer
 
-def greet():
+def greet(clock=None, renderer=None):
     """
     Generates a greeting based on the current time of day.
 
     Args:
-        None
+        clock (ClockSnapshot | None): Clock reading, defaults to now.
+        renderer (Renderer | None): Locale renderer, defaults to the configured locale.
 
     Returns:
         str: Greeting message appropriate for the current time.
     """
-    current_time = datetime.now().strftime("%I:%M %p")
-    hour = datetime.strptime(current_time, "%I:%M %p").hour
+    hour = (clock or ClockSnapshot()).hour
+    renderer = renderer or get_renderer()
 
     # Time-of-day based greeting selection
     if hour >= 5 and hour < 12:
-        greeting = "Good Morning"
+        greeting = renderer.render("greet.morning")
     elif  hour >= 12 and hour < 18:
-        greeting = "Good Afternoon"
+        greeting = renderer.render("greet.afternoon")
     else:
-        greeting = "Good Evening"
+        greeting = renderer.render("greet.evening")
 
     return greeting
 
@@ -1,20 +1,262 @@
+import json
+import logging
+import mmap
+import os
+import random
+import struct
+import threading
+from array import array
+
 import pyjokes
 
-def get_joke():
+logger = logging.getLogger(__name__)
+
+# Directory holding the packed joke stores and the sampling cursors
+DATA_DIR = os.path.join("data")
+STATE_FILE = os.path.join(DATA_DIR, "joke_state.json")
+
+# Categories shipped by pyjokes, "all" is the union of the others
+CATEGORIES = ("neutral", "chuck", "all")
+DEFAULT_CATEGORY = "neutral"
+
+# Packed store layout: magic, joke count, count + 1 byte offsets, UTF-8 blob
+STORE_MAGIC = b"AJK1"
+HEADER = struct.Struct("<4sI")
+
+
+def build_store(path, jokes):
     """
-    Retrieves a random programming-related joke.
+    Packs a list of jokes into a compact offset-indexed binary file.
 
     Args:
+        path (str): Destination file.
+        jokes (list): Joke strings.
+
+    Returns:
         None
+    """
+    encoded = [joke.encode("utf-8") for joke in jokes]
+
+    offsets = array("I", [0])
+    for joke in encoded:
+        offsets.append(offsets[-1] + len(joke))
+
+    if offsets.itemsize != 4:
+        raise RuntimeError("unsigned int must be 4 bytes for the joke store format")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = path + ".tmp"
+
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(STORE_MAGIC, len(encoded)))
+        file.write(offsets.tobytes())
+        file.write(b"".join(encoded))
+
+    # Atomic swap so a crash never leaves a half-written store behind
+    os.replace(temp_path, path)
+
+
+class JokeStore:
+    def __init__(self, category, data_dir=DATA_DIR):
+        """
+        Opens (building on first use) the memory-mapped store for a category.
+
+        Args:
+            category (str): One of CATEGORIES.
+            data_dir (str): Directory holding the packed stores.
+
+        Returns:
+            None
+        """
+        self.category = category
+        self.path = os.path.join(data_dir, f"jokes_en_{category}.bin")
+
+        if not os.path.exists(self.path):
+            jokes = pyjokes.get_jokes(language="en", category=category)
+            build_store(self.path, jokes)
+            logger.debug("Joke store built | category=%s jokes=%s", category, len(jokes))
+
+        with open(self.path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count = HEADER.unpack_from(self.buffer, 0)
+        if magic != STORE_MAGIC:
+            raise ValueError(f"Invalid joke store: {self.path}")
+
+        self.offsets_start = HEADER.size
+        self.blob_start = self.offsets_start + 4 * (self.count + 1)
+
+    def __len__(self):
+        return self.count
+
+    def get(self, index):
+        """
+        Decodes a single joke straight from the mapped file.
+
+        Args:
+            index (int): Joke position in the store.
+
+        Returns:
+            str: The joke text.
+        """
+        start, end = struct.unpack_from("<II", self.buffer, self.offsets_start + 4 * index)
+        return self.buffer[self.blob_start + start:self.blob_start + end].decode("utf-8")
+
+
+class JokeSampler:
+    def __init__(self, data_dir=DATA_DIR, state_file=STATE_FILE):
+        """
+        Initializes no-repeat joke sampling across all categories.
+
+        Each category walks a seeded shuffled permutation; only the seed and
+        cursor are persisted, so nothing repeats across restarts until the
+        category is exhausted.
+
+        Args:
+            data_dir (str): Directory holding the packed stores.
+            state_file (str): JSON file holding per-category seed and cursor.
+
+        Returns:
+            None
+        """
+        self.data_dir = data_dir
+        self.state_file = state_file
+        self.lock = threading.Lock()
+        self.stores = {}
+        self.permutations = {}
+
+        try:
+            with open(state_file, encoding="utf-8") as file:
+                self.state = json.load(file)
+        except (OSError, ValueError):
+            self.state = {}
+
+        # Valid JSON of the wrong shape is rebuilt like a missing file
+        if not isinstance(self.state, dict):
+            self.state = {}
+
+    def _save_state(self):
+        """
+        Persists the sampling cursors.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        # Written aside and swapped in, so a crash mid-write never leaves a torn file
+        temp_path = self.state_file + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self.state, file)
+            os.replace(temp_path, self.state_file)
+        except OSError:
+            logger.warning("Could not persist joke cursor to %s", self.state_file)
+
+    def _permutation(self, category, store):
+        """
+        Returns the shuffled order for a category, regenerating it from its seed.
+
+        Args:
+            category (str): Joke category.
+            store (JokeStore): Store the permutation indexes into.
+
+        Returns:
+            array: Shuffled joke indices.
+        """
+        state = self.state.get(category)
+
+        # A new seed starts a fresh cycle once the corpus is exhausted or changed, or the entry is malformed
+        try:
+            cursor = state["cursor"]
+            fresh = (
+                not isinstance(cursor, int)
+                or isinstance(cursor, bool)
+                or not 0 <= cursor < len(store)
+                or state["size"] != len(store)
+                or not isinstance(state["seed"], int)
+            )
+        except (KeyError, TypeError):
+            fresh = True
+
+        if fresh:
+            state = {"seed": random.getrandbits(32), "cursor": 0, "size": len(store)}
+            self.state[category] = state
+            self.permutations.pop(category, None)
+
+        permutation = self.permutations.get(category)
+        if permutation is None:
+            order = list(range(len(store)))
+            random.Random(state["seed"]).shuffle(order)
+            permutation = array("I", order)
+            self.permutations[category] = permutation
+
+        return permutation
+
+    def next_joke(self, category=DEFAULT_CATEGORY):
+        """
+        Returns the next unseen joke of a category in O(1).
+
+        Args:
+            category (str): Joke category.
+
+        Returns:
+            str: Joke text.
+        """
+        with self.lock:
+            store = self.stores.get(category)
+            if store is None:
+                store = JokeStore(category, self.data_dir)
+                self.stores[category] = store
+
+            permutation = self._permutation(category, store)
+            state = self.state[category]
+            index = permutation[state["cursor"]]
+            state["cursor"] += 1
+            self._save_state()
+
+        return store.get(index)
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_joke(payload=None):
+    """
+    Retrieves a programming-related joke that has not been told recently.
+
+    Args:
+        payload (dict | None): Intent entities that may contain a "category"
+                               ("neutral", "chuck" or "all").
 
     Returns:
-        str: A randomly selected programming joke.
+        str: A joke from the requested category.
     """
-    joke = pyjokes.get_joke(language="en")
-    
+    global _sampler
+
+    category = (payload or {}).get("category", DEFAULT_CATEGORY)
+    if category not in CATEGORIES:
+        category = DEFAULT_CATEGORY
+
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = JokeSampler()
+
+    try:
+        joke = _sampler.next_joke(category)
+    except (OSError, ValueError):
+        # Fall back to pyjokes directly if the packed store is unusable
+        logger.exception("Joke store unavailable, falling back to pyjokes")
+        joke = pyjokes.get_joke(language="en", category=category)
+
     return joke
 
 
 if __name__ == "__main__":
-    joke = get_joke()
+    category = input("Enter category (neutral, chuck or all): ") or DEFAULT_CATEGORY
+    joke = get_joke({"category": category})
     print(joke)
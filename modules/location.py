@@ -1,8 +1,10 @@
-import requests
+from core.location_provider import get_location_provider
+from core.responses import get_renderer
 
 def get_location():
     """
-    Determines the current city based on public IP address.
+    Determines the current city from the configured home location, the offline
+    GeoIP database, or the public IP address, in that order.
 
     Args:
         None
@@ -10,16 +12,12 @@ def get_location():
     Returns:
         str: City name if available, otherwise an error message.
     """
-    try:
-        response = requests.get("https://ipinfo.io/json", timeout=10)
-        data = response.json()
+    location = get_location_provider().resolve()
 
-        city = data.get("city")
+    if location is None:
+        return get_renderer().render("location.failed")
 
-        return city
-    
-    except Exception as e:
-        return f"Could not fetch location data."
+    return location.city
 
 
 if __name__ == "__main__":
@@ -1,29 +1,35 @@
-import os
-from newsapi import NewsApiClient
-from dotenv import load_dotenv
+import requests
 
-# Load environment variables from .env file
-load_dotenv()
+from core.responses import get_renderer
+from core.settings import get_settings
 
-def get_news():
+def get_news(settings=None):
     """
     Fetches a small set of recent news headlines.
 
     Args:
-        None
+        settings (Settings | None): Settings snapshot, defaults to the current one.
 
     Returns:
         list | str: List of headline strings, or error message on failure.
     """
-    news_api_key = os.getenv("NEWS_API_KEY")
+    settings = settings or get_settings()
+    news_api_key = settings.news_api_key
 
+    # Missing keys are reported once at startup, requests fail fast here
     if not news_api_key:
-        print("NEWS_API_KEY not found in environment variables.")
+        return get_renderer().render("news.not_configured")
 
     try:
-        new_api = NewsApiClient(api_key=news_api_key)
-        top_headlines = new_api.get_top_headlines(sources="bbc-news", language="en")
-        articles = top_headlines["articles"]
+        # Plain HTTP against NEWS_BASE_URL, so the endpoint can point at a local stand-in
+        response = requests.get(
+            f"{settings.news_base_url}/top-headlines",
+            params={"sources": "bbc-news", "language": "en"},
+            headers={"X-Api-Key": news_api_key},
+            timeout=10
+        )
+        response.raise_for_status()
+        articles = response.json()["articles"]
 
         headlines_list = []
 
@@ -34,7 +40,7 @@ def get_news():
         return headlines_list
     
     except Exception:
-        return f"Could not fetch news."
+        return get_renderer().render("news.failed")
     
     
 if __name__ == "__main__":
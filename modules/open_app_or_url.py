@@ -1,63 +1,75 @@
-import os
+import shutil
 import sys
-import webbrowser
+
+from core.app_index import get_app_index, launch, open_url
+from core.responses import get_renderer
 
 def open_app_or_url(payload):
     """
     Opens a desktop application or navigates to a URL based on intent payload.
 
+    Names are resolved first against the local index of user aliases/bookmarks
+    and, for app requests, installed applications; the LLM-provided executable
+    or URL is only a fallback.
+
     Args:
         payload (dict): Intent entities containing type and target details.
 
     Returns:
         str: Status message indicating the result of the operation.
     """
+    renderer = get_renderer()
     request_type = payload.get("type")
+    name = payload.get("name")
+
+    if request_type not in ("app", "url"):
+        return renderer.render("open_app.invalid")
+
+    # A locally known name wins over whatever the LLM guessed; sites only match aliases and bookmarks
+    entry = get_app_index().resolve(name, request_type) if name else None
+    if entry is not None:
+        request_type = entry["type"]
  
     if request_type == "app":
-        exe = payload.get("executable")
+        exe = entry.get("target") if entry is not None else payload.get("executable")
 
         # Executable name is required to launch an application
         if not exe:
-            return "No executable provided."
+            return renderer.render("open_app.no_executable")
 
-        # App launching is supported only on Windows systems
-        if not sys.platform.startswith("win"):
-            return "App launching is only supported on Windows."
+        # Unindexed executables must at least be on PATH outside Windows
+        if entry is None and not sys.platform.startswith("win") and shutil.which(exe) is None:
+            return renderer.render("open_app.not_found", executable=exe)
             
         try:
-            os.startfile(exe)
-            return f"Opening {payload.get('name')}."
+            launch(exe)
+            return renderer.render("open_app.opening", name=name or exe)
 
         except FileNotFoundError:
-            return f"Application '{exe}' is not installed or not found."
+            return renderer.render("open_app.not_found", executable=exe)
         
         except OSError:
-            return f"Failed to open application."
+            return renderer.render("open_app.failed")
 
-    elif request_type == "url":
-        target_url = payload.get("url")
+    target_url = entry.get("url") if entry is not None else payload.get("url")
 
-        # URL must be present for navigation requests
-        if not target_url:
-            return "No URL provided."
-        
-        webbrowser.open(target_url)
-        return f"Navigating to {payload.get('name')}."
+    # URL must be present for navigation requests
+    if not target_url:
+        return renderer.render("open_app.no_url")
     
-    else:
-        return "Invalid Request."
+    open_url(target_url)
+    return renderer.render("open_app.navigating", name=name or target_url)
 
 
 if __name__ == "__main__":
     request_type = input("Enter request type (app or url): ")
-    request_resource = input("Enter resource (app executable or url): ")
+    request_resource = input("Enter resource (app name, executable or url): ")
 
     if request_type == "app":
-        payload = {"type": request_type, "name": "app_name", "executable": request_resource}
+        payload = {"type": request_type, "name": request_resource, "executable": request_resource}
 
     elif request_type == "url":
-        payload = {"type": request_type, "name": "url_name", "url": request_resource}
+        payload = {"type": request_type, "name": request_resource, "url": request_resource}
 
     response = open_app_or_url(payload)
     print(response)
@@ -1,5 +1,7 @@
 import pywhatkit
 
+from core.responses import get_renderer
+
 def search_google(payload):
     """
     Performs a Google search using the provided query.
@@ -14,10 +16,10 @@ def search_google(payload):
 
     # Query is required to perform a search
     if not search_query:
-        return "No search query provided."
+        return get_renderer().render("search.no_query")
     
     pywhatkit.search(search_query)
-    return f"Searching \"{search_query}\" on Google"
+    return get_renderer().render("search.searching", query=search_query)
 
 if __name__ == "__main__":
     search_query = input("Search Google: ")
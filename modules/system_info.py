@@ -2,6 +2,8 @@ import time
 import sys
 import psutil
 
+from core.responses import get_renderer
+
 def get_battery_status():
     """
     Retrieves current battery percentage and charging status.
@@ -15,19 +17,19 @@ def get_battery_status():
     try:
         battery = psutil.sensors_battery()
     except Exception:
-        return "I could not access battery information."
+        return get_renderer().render("system_info.battery_failed")
     
     # Some systems do not expose battery data
     if battery is None:
-        return "Battery information is unavailable."
+        return get_renderer().render("system_info.battery_unavailable")
     
     percent = battery.percent
     plugged = battery.power_plugged
 
     if plugged:
-        return f"Battery is {percent}% and currently charging."
+        return get_renderer().render("system_info.battery_charging", percent=percent)
     else:
-        return f"Battery is {percent}%."
+        return get_renderer().render("system_info.battery", percent=percent)
     
 def get_cpu_usage():
     """
@@ -42,9 +44,9 @@ def get_cpu_usage():
     try:
         usage = psutil.cpu_percent(interval=1)
     except Exception:
-        return "I could not retrieve CPU usage."
+        return get_renderer().render("system_info.cpu_failed")
 
-    return f"Current CPU usage is {usage}%."
+    return get_renderer().render("system_info.cpu", usage=usage)
 
 def get_ram_status():
     """
@@ -59,12 +61,13 @@ def get_ram_status():
     try:
         mem = psutil.virtual_memory()
     except Exception:
-        return "I could not retrieve memory information."
+        return get_renderer().render("system_info.memory_failed")
     
     total = mem.total / (1024 ** 3)
     available = mem.available / (1024 ** 3)
 
-    return f"Out of {total:.1f} gigabytes, {available:.1f} gigabytes of RAM is currently free."
+    renderer = get_renderer()
+    return renderer.render("system_info.memory", total=renderer.number(total), available=renderer.number(available))
 
 def get_disk_status():
     """
@@ -79,19 +82,20 @@ def get_disk_status():
 
     # Disk statistics are currently limited to Windows
     if not sys.platform.startswith("win"):
-            return "Disk statistics is only supported on Windows."
+            return get_renderer().render("system_info.storage_unsupported")
 
     drive="C:\\"
 
     try:
         usage = psutil.disk_usage(drive)
     except Exception:
-        return "I could not access disk information."
+        return get_renderer().render("system_info.storage_failed")
     
     total = usage.total / (1024 ** 3)
     available = usage.free / (1024 ** 3)
 
-    return f"Drive C has {available:.1f} GB of free space out of a total {total:.1f} GB."
+    renderer = get_renderer()
+    return renderer.render("system_info.storage", total=renderer.number(total), available=renderer.number(available))
 
 def get_uptime():
     """
@@ -106,16 +110,16 @@ def get_uptime():
     try:
         boot_time = psutil.boot_time()
     except Exception:
-        return "I could not retrieve system uptime."
+        return get_renderer().render("system_info.uptime_failed")
     
     uptime_seconds = int(time.time() - boot_time)
     hours = uptime_seconds // 3600
     minutes = (uptime_seconds % 3600) // 60
 
     if hours == 0:
-        return f"The system has been running for {minutes} minutes."
+        return get_renderer().render("system_info.uptime_minutes", minutes=minutes)
 
-    return f"The system has been running for {hours} hours and {minutes} minutes."
+    return get_renderer().render("system_info.uptime", hours=hours, minutes=minutes)
 
 SYSTEM_INFO_HANDLERS = {
     "battery": get_battery_status,
@@ -139,14 +143,14 @@ def handle_system_info(payload):
 
     # Resource key is required to determine handler
     if not target_resource:
-        return "No resource was queried."
+        return get_renderer().render("system_info.no_resource")
     
     target_resource = target_resource.strip().lower()
     handler = SYSTEM_INFO_HANDLERS.get(target_resource)
 
     # Unsupported resources are rejected explicitly
     if not handler:
-        return "This system information is not supported yet."
+        return get_renderer().render("system_info.unsupported")
     
     return handler()
 
@@ -1,71 +1,109 @@
 import time
-import threading
+from datetime import datetime, timedelta
 
-# Hard limit of 1 hour to prevent very long timers
-MAX_TIMER_SECONDS = 3600
+from core.responses import get_renderer
 
-def worker(seconds, speaker):
+# Hard limit of 24 hours for a single countdown or repeat interval
+MAX_TIMER_SECONDS = 86400
+
+def format_duration(seconds):
+    """
+    Renders a duration in seconds as short spoken text.
+
+    Args:
+        seconds (float): Duration in seconds.
+
+    Returns:
+        str: Text such as "1 hour 30 minutes" or "2.5 seconds".
+    """
+    return get_renderer().duration(seconds)
+
+def next_occurrence(clock_time):
     """
-    Waits for the specified duration and announces timer completion.
+    Converts an "HH:MM" time of day into the next matching epoch time.
 
     Args:
-        seconds (int): Number of seconds to wait before completion.
-        speaker (object): Text-to-speech handler for announcing completion.
+        clock_time (str): 24-hour time of day such as "07:30".
 
     Returns:
-        None
+        float: Epoch seconds of today's or tomorrow's occurrence.
     """
-    time.sleep(seconds)
-    speaker.speak("Timer finished.")
+    hour, minute = (int(part) for part in clock_time.split(":"))
+    now = datetime.now()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    # A time that already passed today refers to tomorrow
+    if target <= now:
+        target += timedelta(days=1)
+
+    return target.timestamp()
 
-def run_timer(payload, speaker=None):
+def run_timer(payload, scheduler=None):
     """
-    Validates timer input and starts a non-blocking countdown.
+    Validates timer input and schedules a countdown, alarm or recurring reminder.
 
     Args:
-        payload (dict): Intent entities containing timer duration.
-        speaker (object | None): Text-to-speech handler for timer completion.
+        payload (dict): Intent entities with any of "duration" (seconds, may be
+                        fractional), "at" ("HH:MM"), "every" (seconds) and "label".
+        scheduler (Scheduler | None): Job scheduler that announces completion.
 
     Returns:
         str: Status message indicating timer state or validation error.
     """
-    if speaker is None:
-        return "Speaker must be provided when running timer."
-    
+    renderer = get_renderer()
+    if scheduler is None:
+        return renderer.render("timer.no_scheduler")
+
+    label = payload.get("label")
+    message = renderer.render("timer.finished_label", label=label) if label else renderer.render("timer.finished")
+    interval = payload.get("every")
+    clock_time = payload.get("at")
+
     try:
-        timer_duration = int(payload.get("duration"))
+        duration = float(payload["duration"]) if payload.get("duration") is not None else None
+        interval = float(interval) if interval is not None else None
     except (TypeError, ValueError):
-        return "Invalid timer duration."
-    
-    if timer_duration <= 0:
-        return "Invalid timer duration."
-    
-    if timer_duration > MAX_TIMER_SECONDS:
-        return "Sorry, I can only set timers up to one hour."
-    
-    # Create a daemon thread so the timer does not block program exit
-    timer_thread = threading.Thread(
-        target=worker, 
-        args=(timer_duration, speaker), 
-        daemon=True, 
-        name="TimerThread"
-    )
-
-    # Start the timer asynchronously
-    timer_thread.start()
-
-    return f"Timer started for {timer_duration} seconds"
+        return renderer.render("timer.invalid_duration")
+
+    for value in (duration, interval):
+        if value is not None and value <= 0:
+            return renderer.render("timer.invalid_duration")
+        if value is not None and value > MAX_TIMER_SECONDS:
+            return renderer.render("timer.too_long")
+
+    if clock_time:
+        try:
+            at = next_occurrence(clock_time)
+        except ValueError:
+            return renderer.render("timer.invalid_alarm")
+
+        scheduler.schedule(label or renderer.render("timer.alarm"), at=at, interval=interval)
+        if interval:
+            return renderer.render("timer.alarm_set_repeating", time=clock_time, interval=format_duration(interval))
+        return renderer.render("timer.alarm_set", time=clock_time)
+
+    if interval:
+        reminder = renderer.render("timer.reminder_label", label=label) if label else renderer.render("timer.reminder")
+        scheduler.schedule(reminder, delay=duration, interval=interval)
+        return renderer.render("timer.reminder_set", interval=format_duration(interval))
+
+    if duration is None:
+        return renderer.render("timer.invalid_duration")
+
+    scheduler.schedule(message, delay=duration)
+
+    return renderer.render("timer.started", duration=format_duration(duration))
 
 
 if __name__ == "__main__":
-    from core.speech import Speech
+    from core.scheduler import Scheduler
 
-    speaker = Speech()
-    seconds = int(input("Enter the number of seconds for the timer: "))
+    scheduler = Scheduler(notify=print)
+    seconds = float(input("Enter the number of seconds for the timer: "))
     payload = {"duration": seconds}
 
-    response = run_timer(payload, speaker)
+    response = run_timer(payload, scheduler)
     print(response)
-    
+
     # Keep process alive long enough for timer completion in standalone mode
     time.sleep(seconds+2)
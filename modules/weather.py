@@ -1,43 +1,33 @@
-import os
 import requests
-from dotenv import load_dotenv
 
-from modules.location import get_location
+from core.single_flight import get_flight
+from core.location_provider import get_location_provider
+from core.responses import get_renderer
+from core.settings import get_settings
 
-# Load environment variables from .env file
-load_dotenv()
+# Concurrent requests for the same city share one upstream call
+_flight = get_flight("weather")
 
-def get_weather(payload):
+def fetch_weather(city, weather_api_key, base_url):
     """
-    Retrieves current weather information for a given city or inferred location.
+    Requests current weather for a city from weatherapi.com.
 
     Args:
-        payload (dict): Intent entities that may contain a location value.
+        city (str): City name.
+        weather_api_key (str | None): weatherapi.com API key.
+        base_url (str): API root, e.g. "https://api.weatherapi.com/v1".
 
     Returns:
         str: Human-readable weather report or error message.
     """
-
-    weather_api_key  = os.getenv("WEATHER_API_KEY")
-
-    if not weather_api_key:
-        print("WEATHER_API_KEY not found in environment variables.")
-
-    if "location" in payload:
-        city = payload.get("location")
-        print(payload)
-    else:
-        city = get_location()
-
-    # Abort if location cannot be resolved
-    if not city:
-        return "Could not determine your location for weather report."
+    renderer = get_renderer()
 
     try:
     
+        # The condition text comes back in the response language
         response = requests.get(
-            "https://api.weatherapi.com/v1/current.json",
-            params={"key": weather_api_key, "q": city},
+            f"{base_url}/current.json",
+            params={"key": weather_api_key, "q": city, "lang": renderer.locale},
             timeout=10
             )
         weather_data = response.json()
@@ -46,15 +36,50 @@ def get_weather(payload):
         temperature = weather_data["current"]["temp_c"]
         wind_speed = weather_data["current"]["wind_kph"]
 
-        weather_report = (
-            f"Currently in {city}, it's {condition} with a temperature of "
-            f"{temperature} degrees Celsius and wind speed of {wind_speed} kilometers per hour."
+        return renderer.render(
+            "weather.report",
+            city=city,
+            condition=condition,
+            temperature=renderer.number(temperature),
+            wind_speed=renderer.number(wind_speed)
         )
-
-        return weather_report
     
     except Exception:
-        return f"Could not fetch weather data."
+        return renderer.render("weather.failed")
+
+def get_weather(payload, settings=None):
+    """
+    Retrieves current weather information for a given city or inferred location.
+
+    Args:
+        payload (dict): Intent entities that may contain a location value.
+        settings (Settings | None): Settings snapshot, defaults to the current one.
+
+    Returns:
+        str: Human-readable weather report or error message.
+    """
+
+    settings = settings or get_settings()
+    weather_api_key = settings.weather_api_key
+
+    # Missing keys are reported once at startup, requests fail fast here
+    if not weather_api_key:
+        return get_renderer().render("weather.not_configured")
+
+    if "location" in payload:
+        city = payload.get("location")
+        print(payload)
+    else:
+        location = get_location_provider().resolve()
+        city = location.city if location is not None else None
+
+    # Abort if location cannot be resolved
+    if not city:
+        return get_renderer().render("weather.no_location")
+
+    # Requests only share an answer when it is rendered in the same language
+    key = f"{get_renderer().locale}:{city.strip().lower()}"
+    return _flight.do(key, fetch_weather, city, weather_api_key, settings.weather_base_url)
 
 
 if __name__ == "__main__":
@@ -1,11 +1,13 @@
 import pywhatkit
 
+from core.responses import get_renderer
+
 def youtube_player(content):
     """
     Opens a browser and plays the requested content on YouTube.
 
     Args:
-        payload (dict): Intent entities containing the YouTube search query.
+        content (dict): Intent entities containing the YouTube search query.
 
     Returns:
         str: Status message indicating the playback action.
@@ -14,10 +16,10 @@ def youtube_player(content):
     
     # Query is required to play content on YouTube
     if not content_query:
-        return "No content specified for YouTube playback."
+        return get_renderer().render("youtube.no_query")
     
-    pywhatkit.playonyt(content)
-    return f"Playing \"{content_query}\" on YouTube"
+    pywhatkit.playonyt(content_query)
+    return get_renderer().render("youtube.playing", query=content_query)
 
 if __name__ == "__main__":
     content = input("What do you want to play on YouTube: ")